@@ -0,0 +1,30 @@
+"""import job progress
+
+Revision ID: 3f2c9a7d1e40
+Revises: b15f6ade5ba2
+Create Date: 2026-10-17 09:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2c9a7d1e40'
+down_revision: Union[str, Sequence[str], None] = 'b15f6ade5ba2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('imports', sa.Column('created_count', sa.Integer(), nullable=False, server_default='0'))
+    op.create_index(op.f('ix_imports_status'), 'imports', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_imports_status'), table_name='imports')
+    op.drop_column('imports', 'created_count')
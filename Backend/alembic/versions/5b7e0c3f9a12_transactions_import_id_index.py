@@ -0,0 +1,28 @@
+"""transactions import_id index
+
+Revision ID: 5b7e0c3f9a12
+Revises: 8d41b6e2c7a9
+Create Date: 2026-10-17 10:41:07.552310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e0c3f9a12'
+down_revision: Union[str, Sequence[str], None] = '8d41b6e2c7a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_transactions_import_id'), 'transactions', ['import_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_transactions_import_id'), table_name='transactions')
@@ -0,0 +1,28 @@
+"""transaction batch token
+
+Revision ID: 5b7e2c9d4a18
+Revises: d81e6b2f7a95
+Create Date: 2026-10-18 11:03:47.662810
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2c9d4a18'
+down_revision: Union[str, Sequence[str], None] = 'd81e6b2f7a95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('transactions', sa.Column('batch_token', sa.String(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('transactions', 'batch_token')
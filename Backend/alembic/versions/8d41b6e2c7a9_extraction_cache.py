@@ -0,0 +1,49 @@
+"""extraction cache
+
+Revision ID: 8d41b6e2c7a9
+Revises: 3f2c9a7d1e40
+Create Date: 2026-10-17 10:02:15.406921
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41b6e2c7a9'
+down_revision: Union[str, Sequence[str], None] = '3f2c9a7d1e40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('extraction_cache',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('content_sha256', sa.String(length=64), nullable=False),
+    sa.Column('model', sa.String(length=120), nullable=False),
+    sa.Column('prompt_version', sa.String(length=32), nullable=False),
+    sa.Column('result_json', sa.Text().with_variant(mysql.LONGTEXT(), 'mysql'), nullable=False),
+    sa.Column('result_size', sa.Integer(), nullable=False),
+    sa.Column('hit_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('last_used_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('content_sha256', 'model', 'prompt_version', name='uq_extraction_cache_key')
+    )
+    op.create_index(op.f('ix_extraction_cache_created_at'), 'extraction_cache', ['created_at'], unique=False)
+    op.create_index(op.f('ix_extraction_cache_last_used_at'), 'extraction_cache', ['last_used_at'], unique=False)
+    op.add_column('imports', sa.Column('content_sha256', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_imports_content_sha256'), 'imports', ['content_sha256'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_imports_content_sha256'), table_name='imports')
+    op.drop_column('imports', 'content_sha256')
+    op.drop_index(op.f('ix_extraction_cache_last_used_at'), table_name='extraction_cache')
+    op.drop_index(op.f('ix_extraction_cache_created_at'), table_name='extraction_cache')
+    op.drop_table('extraction_cache')
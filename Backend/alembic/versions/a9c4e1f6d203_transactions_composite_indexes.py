@@ -0,0 +1,33 @@
+"""transactions composite indexes
+
+Revision ID: a9c4e1f6d203
+Revises: 5b7e0c3f9a12
+Create Date: 2026-10-17 11:20:48.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c4e1f6d203'
+down_revision: Union[str, Sequence[str], None] = '5b7e0c3f9a12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_transactions_user_date_id', 'transactions', ['user_id', 'date', 'id'], unique=False)
+    op.create_index('ix_transactions_user_type_category_tag', 'transactions', ['user_id', 'type', 'category', 'tag', 'amount'], unique=False)
+    # user_id is the leading column of both indexes above (which also serve the FK).
+    op.drop_index(op.f('ix_transactions_user_id'), table_name='transactions')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_transactions_user_id'), 'transactions', ['user_id'], unique=False)
+    op.drop_index('ix_transactions_user_type_category_tag', table_name='transactions')
+    op.drop_index('ix_transactions_user_date_id', table_name='transactions')
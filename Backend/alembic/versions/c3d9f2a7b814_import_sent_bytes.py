@@ -0,0 +1,28 @@
+"""import sent bytes
+
+Revision ID: c3d9f2a7b814
+Revises: e27d8b4c5f61
+Create Date: 2026-10-17 15:42:08.519377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d9f2a7b814'
+down_revision: Union[str, Sequence[str], None] = 'e27d8b4c5f61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('imports', sa.Column('sent_bytes', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('imports', 'sent_bytes')
@@ -0,0 +1,30 @@
+"""import job lease
+
+Revision ID: d81e6b2f7a95
+Revises: f4a8c1d9e372
+Create Date: 2026-10-18 10:12:31.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81e6b2f7a95'
+down_revision: Union[str, Sequence[str], None] = 'f4a8c1d9e372'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('imports', sa.Column('claimed_by', sa.String(length=120), nullable=True))
+    op.add_column('imports', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('imports', 'heartbeat_at')
+    op.drop_column('imports', 'claimed_by')
@@ -0,0 +1,69 @@
+"""monthly rollups
+
+Revision ID: e27d8b4c5f61
+Revises: a9c4e1f6d203
+Create Date: 2026-10-17 12:05:33.271846
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e27d8b4c5f61'
+down_revision: Union[str, Sequence[str], None] = 'a9c4e1f6d203'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    rollups = op.create_table('monthly_rollups',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('type', sa.String(length=10), nullable=False),
+    sa.Column('category', sa.String(length=80), nullable=False),
+    sa.Column('tag', sa.String(length=80), nullable=False),
+    sa.Column('total', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('tx_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'year', 'month', 'type', 'category', 'tag', name='uq_monthly_rollups_bucket')
+    )
+    op.create_index('ix_monthly_rollups_user_type_category', 'monthly_rollups', ['user_id', 'type', 'category', 'tag'], unique=False)
+
+    # Backfill from existing transactions (same grouping as services.rollups.rebuild_rollups).
+    tx = sa.table(
+        'transactions',
+        sa.column('user_id', sa.Integer()),
+        sa.column('date', sa.Date()),
+        sa.column('type', sa.String()),
+        sa.column('category', sa.String()),
+        sa.column('tag', sa.String()),
+        sa.column('amount', sa.Numeric(12, 2)),
+    )
+    year = sa.extract('year', tx.c.date)
+    month = sa.extract('month', tx.c.date)
+    tag = sa.func.coalesce(tx.c.tag, '')
+    grouped = sa.select(
+        tx.c.user_id, year, month, tx.c.type, tx.c.category, tag, sa.func.sum(tx.c.amount), sa.func.count()
+    ).group_by(tx.c.user_id, year, month, tx.c.type, tx.c.category, tag)
+    op.execute(
+        rollups.insert().from_select(
+            ['user_id', 'year', 'month', 'type', 'category', 'tag', 'total', 'tx_count'], grouped
+        )
+    )
+
+    # Category stats read the rollups now; nothing queries this one, but every insert maintains it.
+    op.drop_index('ix_transactions_user_type_category_tag', table_name='transactions')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_transactions_user_type_category_tag', 'transactions', ['user_id', 'type', 'category', 'tag', 'amount'], unique=False)
+    op.drop_index('ix_monthly_rollups_user_type_category', table_name='monthly_rollups')
+    op.drop_table('monthly_rollups')
@@ -0,0 +1,44 @@
+"""import accounting
+
+Revision ID: f4a8c1d9e372
+Revises: c3d9f2a7b814
+Create Date: 2026-10-17 16:20:31.774012
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a8c1d9e372'
+down_revision: Union[str, Sequence[str], None] = 'c3d9f2a7b814'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('imports', sa.Column('upload_ms', sa.Float(), nullable=True))
+    op.add_column('imports', sa.Column('convert_ms', sa.Float(), nullable=True))
+    op.add_column('imports', sa.Column('model_ms', sa.Float(), nullable=True))
+    op.add_column('imports', sa.Column('parse_ms', sa.Float(), nullable=True))
+    op.add_column('imports', sa.Column('insert_ms', sa.Float(), nullable=True))
+    op.add_column('imports', sa.Column('model', sa.String(length=120), nullable=True))
+    op.add_column('imports', sa.Column('model_attempts', sa.Integer(), nullable=True))
+    op.add_column('imports', sa.Column('prompt_tokens', sa.Integer(), nullable=True))
+    op.add_column('imports', sa.Column('completion_tokens', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('imports', 'completion_tokens')
+    op.drop_column('imports', 'prompt_tokens')
+    op.drop_column('imports', 'model_attempts')
+    op.drop_column('imports', 'model')
+    op.drop_column('imports', 'insert_ms')
+    op.drop_column('imports', 'parse_ms')
+    op.drop_column('imports', 'model_ms')
+    op.drop_column('imports', 'convert_ms')
+    op.drop_column('imports', 'upload_ms')
@@ -3,19 +3,17 @@ from __future__ import annotations
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError
-from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.core.db import get_db
+from app.core.db import AsyncSessionLocal, SessionLocal
 from app.core.security import decode_token
 from app.models.user import User
+from app.services.user_cache import CurrentUser, user_cache
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    creds: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
-) -> User:
+def _token_user_id(creds: HTTPAuthorizationCredentials | None) -> int:
     if not creds:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
@@ -29,14 +27,45 @@ def get_current_user(
     if not sub:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    user = db.get(User, int(sub))
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    return int(sub)
+
+
+def _load_user(user_id: int) -> CurrentUser | None:
+    with SessionLocal() as db:
+        user = db.get(User, user_id)
+        return CurrentUser.from_model(user) if user else None
+
+
+async def _load_user_async(user_id: int) -> CurrentUser | None:
+    async with AsyncSessionLocal() as db:
+        user = await db.get(User, user_id)
+        return CurrentUser.from_model(user) if user else None
+
+
+async def get_current_user(
+    creds: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+) -> CurrentUser:
+    """Resolve the bearer token to a principal.
+
+    Served from user_cache when possible; only a miss opens a short session of its own,
+    so routes that don't otherwise touch the database never get one.
+    """
+
+    user_id = _token_user_id(creds)
+    user = user_cache.get(user_id)
+    if user is None:
+        if AsyncSessionLocal is not None:
+            user = await _load_user_async(user_id)
+        else:
+            user = await run_in_threadpool(_load_user, user_id)
+        if not user:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        user_cache.put(user)
 
     return user
 
 
-def require_admin(user: User = Depends(get_current_user)) -> User:
+async def require_admin(user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
     if user.role != "ADMIN":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
     return user
@@ -1,51 +1,67 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.api.deps import require_admin
-from app.core.db import get_db
-from app.core.security import get_password_hash
+from app.core.db import async_engine, engine, get_db
+from app.core.db_pool import pool_status
+from app.core.query_budget import query_budget
+from app.core.security import password_hasher
 from app.models.user import User
 from app.schemas.admin import AdminUserCreate, UserOut
+from app.services.extraction_cache import purge_extraction_cache
+from app.services.import_stats import import_stats
+from app.services.stats_cache import stats_cache
+from app.services.user_cache import CurrentUser
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
 
 @router.get("/users", response_model=list[UserOut])
-def list_users(_: User = Depends(require_admin), db: Session = Depends(get_db)) -> list[UserOut]:
+@query_budget(2)
+def list_users(_: CurrentUser = Depends(require_admin), db: Session = Depends(get_db)) -> list[UserOut]:
     users = list(db.scalars(select(User).order_by(User.created_at.asc())).all())
     return [UserOut.model_validate({"id": str(u.id), "name": u.name, "email": u.email, "role": u.role}) for u in users]
 
 
-@router.post("/users", response_model=UserOut)
-def create_user(
-    payload: AdminUserCreate,
-    _: User = Depends(require_admin),
-    db: Session = Depends(get_db),
-) -> UserOut:
-    exists = db.scalar(select(User).where(User.email == payload.email))
-    if exists:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already exists")
-
-    password = payload.password or "123456"
+def _create_member(db: Session, payload: AdminUserCreate, password_hash: str) -> User:
     user = User(
         name=payload.name,
         email=str(payload.email),
         role="MEMBER",
-        password_hash=get_password_hash(password),
+        password_hash=password_hash,
     )
     db.add(user)
     db.commit()
     db.refresh(user)
+    return user
+
+
+# Same as register: bcrypt on password_hasher's bounded pool (503 when saturated), DB steps in the threadpool.
+@router.post("/users", response_model=UserOut)
+@query_budget(4)
+async def create_user(
+    payload: AdminUserCreate,
+    _: CurrentUser = Depends(require_admin),
+    db: Session = Depends(get_db),
+) -> UserOut:
+    exists = await run_in_threadpool(db.scalar, select(User).where(User.email == payload.email))
+    if exists:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already exists")
+
+    password_hash = await password_hasher.hash(payload.password or "123456")
+    user = await run_in_threadpool(_create_member, db, payload, password_hash)
     return UserOut.model_validate({"id": str(user.id), "name": user.name, "email": user.email, "role": user.role})
 
 
 @router.delete("/users/{user_id}")
+@query_budget(3)
 def delete_user(
     user_id: int,
-    admin: User = Depends(require_admin),
+    admin: CurrentUser = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     if admin.id == user_id:
@@ -61,3 +77,38 @@ def delete_user(
     db.delete(user)
     db.commit()
     return {"ok": True}
+
+
+@router.delete("/import-cache")
+@query_budget(2)
+def purge_import_cache(_: CurrentUser = Depends(require_admin), db: Session = Depends(get_db)):
+    return {"deleted": purge_extraction_cache(db)}
+
+
+@router.get("/stats-cache")
+@query_budget(1)
+def stats_cache_metrics(_: CurrentUser = Depends(require_admin)):
+    return stats_cache.stats()
+
+
+@router.get("/db-pool")
+@query_budget(1)
+def db_pool_metrics(_: CurrentUser = Depends(require_admin)):
+    """Pool usage for this process; compare checkedOut/overflow against the worker count."""
+
+    out = {"sync": pool_status(engine)}
+    if async_engine is not None:
+        out["async"] = pool_status(async_engine.sync_engine)
+    return out
+
+
+@router.get("/import-stats")
+@query_budget(2)
+def import_stats_report(
+    days: int = Query(default=30, ge=1, le=365),
+    _: CurrentUser = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """Stage timings, sizes and tokens of recent imports, as percentiles per file type and per model."""
+
+    return import_stats(db, days)
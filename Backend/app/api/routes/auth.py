@@ -3,53 +3,82 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core.db import get_db
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.query_budget import query_budget
+from app.core.security import create_access_token, password_hasher
 from app.models.user import User
 from app.schemas.auth import LoginRequest, RegisterRequest, UserOut
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 
-@router.post("/login", response_model=UserOut)
-def login(payload: LoginRequest, db: Session = Depends(get_db)) -> UserOut:
-    user = db.scalar(select(User).where(User.email == payload.email))
-    if not user or not verify_password(payload.password, user.password_hash):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-
-    token = create_access_token(subject=str(user.id))
-
+def _out(user: User, token: str) -> UserOut:
     # To match the existing frontend types, we return a User object.
     # We'll include token as an extra field.
     # FastAPI will allow extra fields in response if we return dict.
     return UserOut.model_validate({"id": str(user.id), "name": user.name, "email": user.email, "role": user.role, "token": token})  # type: ignore
 
 
-@router.post("/register", response_model=UserOut)
-def register(payload: RegisterRequest, db: Session = Depends(get_db)) -> UserOut:
-    existing = db.scalar(select(User).where(User.email == payload.email))
-    if existing:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already exists")
+def _save_rehash(db: Session, user: User, new_hash: str) -> None:
+    user.password_hash = new_hash
+    db.commit()
+    db.refresh(user)
 
+
+def _create_user(db: Session, payload: RegisterRequest, password_hash: str) -> User:
     user = User(
         name=payload.name,
         email=str(payload.email),
         role="MEMBER",
-        password_hash=get_password_hash(payload.password),
+        password_hash=password_hash,
     )
     db.add(user)
     db.commit()
     db.refresh(user)
+    return user
+
+
+# bcrypt runs on password_hasher's own pool; the short DB steps go through the threadpool.
+@router.post("/login", response_model=UserOut)
+@query_budget(3)  # 1, plus the rehash write when the bcrypt cost went up
+async def login(payload: LoginRequest, db: Session = Depends(get_db)) -> UserOut:
+    user = await run_in_threadpool(db.scalar, select(User).where(User.email == payload.email))
+    valid, new_hash = False, None
+    if user:
+        valid, new_hash = await password_hasher.verify_and_update(payload.password, user.password_hash)
+    if not valid:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+
+    if new_hash:
+        # Stored cost is below the configured one: upgrade it while we hold the password.
+        await run_in_threadpool(_save_rehash, db, user, new_hash)
 
     token = create_access_token(subject=str(user.id))
-    return UserOut.model_validate({"id": str(user.id), "name": user.name, "email": user.email, "role": user.role, "token": token})  # type: ignore
+    return _out(user, token)
+
+
+@router.post("/register", response_model=UserOut)
+@query_budget(3)
+async def register(payload: RegisterRequest, db: Session = Depends(get_db)) -> UserOut:
+    existing = await run_in_threadpool(db.scalar, select(User).where(User.email == payload.email))
+    if existing:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Email already exists")
+
+    password_hash = await password_hasher.hash(payload.password)
+    user = await run_in_threadpool(_create_user, db, payload, password_hash)
+
+    token = create_access_token(subject=str(user.id))
+    return _out(user, token)
 
 
 from app.api.deps import get_current_user
+from app.services.user_cache import CurrentUser
 
 
 @router.get("/me", response_model=UserOut)
-def me(user: User = Depends(get_current_user)) -> UserOut:
+@query_budget(1)
+def me(user: CurrentUser = Depends(get_current_user)) -> UserOut:
     # Cast id to string to match frontend types
     return UserOut.model_validate({"id": str(user.id), "name": user.name, "email": user.email, "role": user.role})
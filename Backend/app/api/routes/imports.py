@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_user
+from app.core.db import get_db
+from app.core.query_budget import query_budget
+from app.models.import_job import ImportJob
+from app.models.transaction import Transaction
+from app.schemas.imports import ImportJobOut
+from app.services.rollups import apply_import_deltas
+from app.services.stats_cache import stats_cache
+from app.services.user_cache import CurrentUser
+
+router = APIRouter(prefix="/api/imports", tags=["imports"])
+
+
+def _job_out(job: ImportJob) -> ImportJobOut:
+    return ImportJobOut(
+        id=str(job.id),
+        userId=str(job.user_id),
+        filename=job.filename,
+        status=job.status,
+        createdCount=job.created_count,
+        fileSize=job.file_size,
+        sentBytes=job.sent_bytes,
+        errorMessage=job.error_message,
+        createdAt=job.created_at,
+        updatedAt=job.updated_at,
+    )
+
+
+@router.get("/{import_id}", response_model=ImportJobOut)
+@query_budget(2)
+def get_import(
+    import_id: int,
+    user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> ImportJobOut:
+    job = db.get(ImportJob, import_id)
+    if not job or (job.user_id != user.id and user.role != "ADMIN"):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    return _job_out(job)
+
+
+@router.delete("/{import_id}")
+@query_budget(5)
+def delete_import(
+    import_id: int,
+    user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    job = db.get(ImportJob, import_id)
+    if not job or (job.user_id != user.id and user.role != "ADMIN"):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    if job.status in ("PENDING", "PROCESSING"):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Import still running")
+
+    # Both statements use ix_transactions_import_id; no rows are loaded.
+    apply_import_deltas(db, job.id, -1)
+    deleted = db.execute(delete(Transaction).where(Transaction.import_id == job.id)).rowcount
+    file_path, owner_id = job.file_path, job.user_id
+    db.delete(job)
+    db.commit()
+    stats_cache.bump(owner_id)
+
+    if os.path.exists(file_path):
+        os.remove(file_path)
+
+    return {"ok": True, "deleted": deleted}
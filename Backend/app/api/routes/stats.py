@@ -4,16 +4,21 @@ from calendar import month_abbr
 from datetime import date
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func, select
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
-from app.core.db import get_db
-from app.models.transaction import Transaction
-from app.models.user import User
+from app.core.db import get_async_db, get_db
+from app.core.query_budget import query_budget
+from app.models.monthly_rollup import MonthlyRollup
 from app.schemas.stats import DashboardStatsOut
+from app.services.stats_cache import stats_cache
+from app.services.user_cache import CurrentUser
 
-router = APIRouter(prefix="/api/stats", tags=["stats"])
+# Same endpoints on both engines; main.py mounts one of the two (settings.db_async).
+sync_router = APIRouter(prefix="/api/stats", tags=["stats"])
+async_router = APIRouter(prefix="/api/stats", tags=["stats"])
 
 COLORS = [
     "#10B981",
@@ -26,71 +31,70 @@ COLORS = [
 ]
 
 
-@router.get("/dashboard", response_model=DashboardStatsOut)
-def dashboard(
-    userId: int | None = None,
-    month: int | None = None,
-    year: int | None = None,
-    _: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> DashboardStatsOut:
-    if not userId:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="userId is required")
-
-    q = select(Transaction).where(Transaction.user_id == userId)
-    if month and year:
-        start = date(year, month, 1)
-        if month == 12:
-            end = date(year + 1, 1, 1)
-        else:
-            end = date(year, month + 1, 1)
-        q = q.where(Transaction.date >= start, Transaction.date < end)
+# The routes check stats_cache themselves: the async ones must do it outside db.run_sync,
+# which runs on the event loop.
+def _dashboard_params(month: int | None, year: int | None, today: date) -> dict:
+    # The trend window moves with today's date, so it is part of the key.
+    return {"month": month, "year": year, "today": today.isoformat()}
 
-    rows = list(db.scalars(q).all())
 
-    income = sum(float(t.amount) for t in rows if t.type == "INCOME")
-    expenses = sum(float(t.amount) for t in rows if t.type == "EXPENSE")
+def _dashboard(db: Session, userId: int, month: int | None, year: int | None, today: date) -> DashboardStatsOut:
+    # Round trip 1: totals per (type, category) for the selected period, from the monthly rollups.
+    q = select(
+        MonthlyRollup.type,
+        MonthlyRollup.category,
+        func.sum(MonthlyRollup.total).label("total"),
+    ).where(MonthlyRollup.user_id == userId)
+    if month and year:
+        q = q.where(MonthlyRollup.year == year, MonthlyRollup.month == month)
+    q = q.group_by(MonthlyRollup.type, MonthlyRollup.category)
 
+    income = 0.0
+    expenses = 0.0
     category_map: dict[str, float] = {}
-    for t in rows:
-        if t.type != "EXPENSE":
-            continue
-        category_map[t.category] = category_map.get(t.category, 0.0) + float(t.amount)
+    for row in db.execute(q).all():
+        total = float(row.total or 0)
+        if row.type == "INCOME":
+            income += total
+        elif row.type == "EXPENSE":
+            expenses += total
+            category_map[row.category] = category_map.get(row.category, 0.0) + total
 
     category_data = [
         {"name": name, "value": value, "color": COLORS[i % len(COLORS)]}
         for i, (name, value) in enumerate(sorted(category_map.items(), key=lambda x: x[1], reverse=True))
     ]
 
-    # Monthly trend: last 4 months (simple)
-    today = date.today()
-    trend = []
+    # Round trip 2: monthly trend, last 4 months (simple)
+    months = []
     for i in range(3, -1, -1):
         m = today.month - i
         y = today.year
         while m <= 0:
             m += 12
             y -= 1
-        start = date(y, m, 1)
-        end = date(y + 1, 1, 1) if m == 12 else date(y, m + 1, 1)
-
-        subq = select(
-            Transaction.type,
-            func.sum(Transaction.amount).label("total"),
-        ).where(
-            Transaction.user_id == userId,
-            Transaction.date >= start,
-            Transaction.date < end,
-        ).group_by(Transaction.type)
-
-        totals = {row.type: float(row.total or 0) for row in db.execute(subq).all()}
-        trend.append(
-            {
-                "name": month_abbr[m].title(),
-                "income": totals.get("INCOME", 0.0),
-                "expenses": totals.get("EXPENSE", 0.0),
-            }
+        months.append((y, m))
+
+    trend_q = (
+        select(MonthlyRollup.year, MonthlyRollup.month, MonthlyRollup.type, func.sum(MonthlyRollup.total).label("total"))
+        .where(
+            MonthlyRollup.user_id == userId,
+            or_(*(and_(MonthlyRollup.year == y, MonthlyRollup.month == m) for y, m in months)),
         )
+        .group_by(MonthlyRollup.year, MonthlyRollup.month, MonthlyRollup.type)
+    )
+
+    totals: dict[tuple[int, int, str], float] = {
+        (row.year, row.month, row.type): float(row.total or 0) for row in db.execute(trend_q).all()
+    }
+    trend = [
+        {
+            "name": month_abbr[m].title(),
+            "income": totals.get((y, m, "INCOME"), 0.0),
+            "expenses": totals.get((y, m, "EXPENSE"), 0.0),
+        }
+        for y, m in months
+    ]
 
     return DashboardStatsOut(
         balance=income - expenses,
@@ -101,17 +105,11 @@ def dashboard(
     )
 
 
-@router.get("/category-breakdown")
-def category_breakdown(
-    category: str,
-    userId: int,
-    _: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
+def _category_breakdown(db: Session, userId: int, category: str) -> list[dict]:
     q = (
-        select(Transaction.tag, func.sum(Transaction.amount).label("total"))
-        .where(Transaction.user_id == userId, Transaction.category == category, Transaction.type == "EXPENSE")
-        .group_by(Transaction.tag)
+        select(MonthlyRollup.tag, func.sum(MonthlyRollup.total).label("total"))
+        .where(MonthlyRollup.user_id == userId, MonthlyRollup.category == category, MonthlyRollup.type == "EXPENSE")
+        .group_by(MonthlyRollup.tag)
     )
 
     rows = db.execute(q).all()
@@ -121,3 +119,76 @@ def category_breakdown(
 
     result.sort(key=lambda x: x["value"], reverse=True)
     return result
+
+
+@sync_router.get("/dashboard", response_model=DashboardStatsOut)
+@query_budget(3)
+def dashboard(
+    userId: int | None = None,
+    month: int | None = None,
+    year: int | None = None,
+    _: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> DashboardStatsOut:
+    if not userId:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="userId is required")
+    today = date.today()
+    cached, cache_key = stats_cache.get("dashboard", userId, **_dashboard_params(month, year, today))
+    if cached is not None:
+        return DashboardStatsOut.model_validate(cached)
+    out = _dashboard(db, userId, month, year, today)
+    stats_cache.set(cache_key, out.model_dump())
+    return out
+
+
+@sync_router.get("/category-breakdown")
+@query_budget(2)
+def category_breakdown(
+    category: str,
+    userId: int,
+    _: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    cached, cache_key = stats_cache.get("category-breakdown", userId, category=category)
+    if cached is not None:
+        return cached
+    result = _category_breakdown(db, userId, category)
+    stats_cache.set(cache_key, result)
+    return result
+
+
+@async_router.get("/dashboard", response_model=DashboardStatsOut)
+@query_budget(3)
+async def dashboard_async(
+    userId: int | None = None,
+    month: int | None = None,
+    year: int | None = None,
+    _: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+) -> DashboardStatsOut:
+    if not userId:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="userId is required")
+    today = date.today()
+    cached, cache_key = await stats_cache.get_async("dashboard", userId, **_dashboard_params(month, year, today))
+    if cached is not None:
+        return DashboardStatsOut.model_validate(cached)
+    # run_sync drives the same Session code over the async driver: no thread is held while MySQL answers.
+    out = await db.run_sync(_dashboard, userId, month, year, today)
+    await stats_cache.set_async(cache_key, out.model_dump())
+    return out
+
+
+@async_router.get("/category-breakdown")
+@query_budget(2)
+async def category_breakdown_async(
+    category: str,
+    userId: int,
+    _: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    cached, cache_key = await stats_cache.get_async("category-breakdown", userId, category=category)
+    if cached is not None:
+        return cached
+    result = await db.run_sync(_category_breakdown, userId, category)
+    await stats_cache.set_async(cache_key, result)
+    return result
@@ -1,41 +1,96 @@
 from __future__ import annotations
 
-import os
+import base64
+import json
+import time
 from datetime import date
+from typing import Literal
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.api.deps import get_current_user
 from app.core.config import settings
-from app.core.db import get_db
+from app.core.db import get_async_db, get_db
+from app.core.query_budget import query_budget
 from app.models.import_job import ImportJob
 from app.models.transaction import Transaction
-from app.models.user import User
-from app.schemas.transactions import TransactionCreate, TransactionOut, TransactionUpdate
-from app.services.import_service import process_import_file_to_transactions
+from app.schemas.transactions import (
+    TransactionBatchIn,
+    TransactionBatchOut,
+    TransactionCreate,
+    TransactionOut,
+    TransactionUpdate,
+)
+from app.services.export import MEDIA_TYPES, export_transactions
+from app.services.import_worker import import_worker_pool
+from app.services.rollups import add_transaction_delta, apply_deltas
+from app.services.stats_cache import stats_cache
+from app.services.transaction_batch import apply_batch
+from app.services.uploads import UPLOAD_OPENAPI, save_multipart_upload
+from app.services.user_cache import CurrentUser
 
 router = APIRouter(prefix="/api/transactions", tags=["transactions"])
+# list/create/update/delete exist on both engines; main.py mounts one of the two (settings.db_async).
+sync_router = APIRouter(prefix="/api/transactions", tags=["transactions"])
+async_router = APIRouter(prefix="/api/transactions", tags=["transactions"])
 
 
-@router.get("", response_model=list[TransactionOut])
-def list_transactions(
-    userId: int | None = None,
-    month: int | None = None,
-    year: int | None = None,
-    user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> list[TransactionOut]:
+# Only what TransactionOut needs; rows come back as tuples, never as ORM objects.
+LIST_COLUMNS = (
+    Transaction.id,
+    Transaction.user_id,
+    Transaction.description,
+    Transaction.amount,
+    Transaction.type,
+    Transaction.category,
+    Transaction.date,
+    Transaction.is_recurring,
+    Transaction.tag,
+)
+
+
+def _encode_cursor(tx_date: date, tx_id: int) -> str:
+    raw = json.dumps({"d": tx_date.isoformat(), "i": tx_id}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[date, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return date.fromisoformat(data["d"]), int(data["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _effective_user_id(user: CurrentUser, userId: int | None) -> int:
     # For security: if userId is omitted, default to current user.
     # If provided, it must match the current user (simple family mode).
-    effective_user_id = user.id
     if userId is not None and userId != user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-    if userId is not None:
-        effective_user_id = userId
+    return user.id
+
 
-    q = select(Transaction).where(Transaction.user_id == effective_user_id)
+def _list(
+    db: Session,
+    effective_user_id: int,
+    *,
+    month: int | None,
+    year: int | None,
+    category: str | None,
+    type: str | None,
+    tag: str | None,
+    minAmount: float | None,
+    maxAmount: float | None,
+    cursor: str | None,
+    limit: int,
+) -> tuple[list[TransactionOut], str | None]:
+    q = select(*LIST_COLUMNS).where(Transaction.user_id == effective_user_id)
     if month and year:
         start = date(year, month, 1)
         if month == 12:
@@ -44,8 +99,30 @@ def list_transactions(
             end = date(year, month + 1, 1)
         q = q.where(Transaction.date >= start, Transaction.date < end)
 
-    q = q.order_by(Transaction.date.desc(), Transaction.id.desc())
-    rows = list(db.scalars(q).all())
+    if category is not None:
+        q = q.where(Transaction.category == category)
+    if type is not None:
+        q = q.where(Transaction.type == type)
+    if tag is not None:
+        q = q.where(Transaction.tag == tag)
+    if minAmount is not None:
+        q = q.where(Transaction.amount >= minAmount)
+    if maxAmount is not None:
+        q = q.where(Transaction.amount <= maxAmount)
+
+    if cursor:
+        # Keyset on (date desc, id desc), written out so both SQLite and MySQL range-scan the index.
+        after_date, after_id = _decode_cursor(cursor)
+        q = q.where(or_(Transaction.date < after_date, and_(Transaction.date == after_date, Transaction.id < after_id)))
+
+    q = q.order_by(Transaction.date.desc(), Transaction.id.desc()).limit(limit + 1)
+    rows = db.execute(q).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = _encode_cursor(last.date, last.id)
 
     return [
         TransactionOut(
@@ -60,15 +137,106 @@ def list_transactions(
             tag=t.tag,
         )
         for t in rows
-    ]
+    ], next_cursor
 
 
-@router.post("", response_model=TransactionOut)
-def create_transaction(
-    payload: TransactionCreate,
-    _: User = Depends(get_current_user),
+@sync_router.get("", response_model=list[TransactionOut])
+@query_budget(2)
+def list_transactions(
+    response: Response,
+    userId: int | None = None,
+    month: int | None = None,
+    year: int | None = None,
+    category: str | None = None,
+    type: str | None = None,
+    tag: str | None = None,
+    minAmount: float | None = None,
+    maxAmount: float | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=settings.transactions_page_size, ge=1, le=settings.transactions_max_page_size),
+    user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> TransactionOut:
+) -> list[TransactionOut]:
+    """Newest first, one page at a time. When more rows exist the opaque cursor for the next
+    page is returned in the X-Next-Cursor header."""
+
+    items, next_cursor = _list(
+        db,
+        _effective_user_id(user, userId),
+        month=month,
+        year=year,
+        category=category,
+        type=type,
+        tag=tag,
+        minAmount=minAmount,
+        maxAmount=maxAmount,
+        cursor=cursor,
+        limit=limit,
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
+
+@async_router.get("", response_model=list[TransactionOut])
+@query_budget(2)
+async def list_transactions_async(
+    response: Response,
+    userId: int | None = None,
+    month: int | None = None,
+    year: int | None = None,
+    category: str | None = None,
+    type: str | None = None,
+    tag: str | None = None,
+    minAmount: float | None = None,
+    maxAmount: float | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=settings.transactions_page_size, ge=1, le=settings.transactions_max_page_size),
+    user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+) -> list[TransactionOut]:
+    # run_sync drives the same Session code over the async driver: no thread is held while MySQL answers.
+    items, next_cursor = await db.run_sync(
+        _list,
+        _effective_user_id(user, userId),
+        month=month,
+        year=year,
+        category=category,
+        type=type,
+        tag=tag,
+        minAmount=minAmount,
+        maxAmount=maxAmount,
+        cursor=cursor,
+        limit=limit,
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
+
+@router.get("/export")
+@query_budget(2)
+def export_transactions_file(
+    format: Literal["csv", "ndjson", "xlsx"] = "csv",
+    date_from: date | None = Query(default=None, alias="from"),
+    date_to: date | None = Query(default=None, alias="to"),
+    userId: int | None = None,
+    user: CurrentUser = Depends(get_current_user),
+):
+    if userId is not None and userId != user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+    # No get_db here: the stream opens its own session and keeps it only while rows flow.
+    body = export_transactions(format, user_id=user.id, date_from=date_from, date_to=date_to)
+    filename = f"transacoes-{date.today().isoformat()}.{format}"
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def _create(db: Session, payload: TransactionCreate) -> TransactionOut:
     tx = Transaction(
         user_id=int(payload.userId),
         description=payload.description,
@@ -81,6 +249,9 @@ def create_transaction(
         source="manual",
     )
     db.add(tx)
+    deltas: dict = {}
+    add_transaction_delta(deltas, tx, +1)
+    apply_deltas(db, deltas)
     db.commit()
     db.refresh(tx)
     return TransactionOut(
@@ -96,17 +267,15 @@ def create_transaction(
     )
 
 
-@router.put("/{tx_id}", response_model=TransactionOut)
-def update_transaction(
-    tx_id: int,
-    payload: TransactionUpdate,
-    _: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> TransactionOut:
-    tx = db.get(Transaction, tx_id)
+def _update(db: Session, tx_id: int, payload: TransactionUpdate) -> TransactionOut:
+    tx = db.get(Transaction, tx_id, with_for_update=True)
     if not tx:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
 
+    # Move the amount out of its old bucket and into the new one (often the same).
+    deltas: dict = {}
+    add_transaction_delta(deltas, tx, -1)
+
     if payload.description is not None:
         tx.description = payload.description
     if payload.amount is not None:
@@ -122,6 +291,8 @@ def update_transaction(
     if payload.isRecurring is not None:
         tx.is_recurring = payload.isRecurring
 
+    add_transaction_delta(deltas, tx, +1)
+    apply_deltas(db, deltas)
     db.commit()
     db.refresh(tx)
 
@@ -138,59 +309,176 @@ def update_transaction(
     )
 
 
-@router.delete("/{tx_id}")
-def delete_transaction(
-    tx_id: int,
-    _: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    tx = db.get(Transaction, tx_id)
+def _delete(db: Session, tx_id: int) -> int:
+    """Delete the transaction and return its owner's id."""
+
+    tx = db.get(Transaction, tx_id, with_for_update=True)
     if not tx:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
 
+    deltas: dict = {}
+    add_transaction_delta(deltas, tx, -1)
+    apply_deltas(db, deltas)
+    owner_id = tx.user_id
     db.delete(tx)
     db.commit()
-    return {"ok": True}
+    return owner_id
 
 
-@router.post("/import")
-async def import_file(
-    userId: int,
-    file: UploadFile = File(...),
-    _: User = Depends(get_current_user),
+def _batch(db: Session, user_id: int, payload: TransactionBatchIn) -> TransactionBatchOut:
+    result = apply_batch(db, user_id, payload.operations)
+    if payload.atomic and result.failed:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=result.model_dump(mode="json"))
+    db.commit()
+    return result
+
+
+# The write helpers leave stats_cache.bump to the routes: on the asyncio engine they run inside
+# db.run_sync, on the event loop, where a blocking cache backend must not be called.
+def _changed(result: TransactionBatchOut) -> bool:
+    return bool(result.created or result.updated or result.deleted)
+
+
+@sync_router.post("", response_model=TransactionOut)
+@query_budget(5)
+def create_transaction(
+    payload: TransactionCreate,
+    _: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> TransactionOut:
+    out = _create(db, payload)
+    stats_cache.bump(int(out.userId))
+    return out
+
+
+@sync_router.put("/{tx_id}", response_model=TransactionOut)
+@query_budget(7)
+def update_transaction(
+    tx_id: int,
+    payload: TransactionUpdate,
+    _: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> TransactionOut:
+    out = _update(db, tx_id, payload)
+    stats_cache.bump(int(out.userId))
+    return out
+
+
+@sync_router.delete("/{tx_id}")
+@query_budget(5)
+def delete_transaction(
+    tx_id: int,
+    _: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    max_size = settings.max_upload_mb * 1024 * 1024
-    data = await file.read()
-    if len(data) > max_size:
-        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File too large")
+    stats_cache.bump(_delete(db, tx_id))
+    return {"ok": True}
 
-    os.makedirs(settings.upload_dir, exist_ok=True)
 
-    safe_name = file.filename or "upload"
-    disk_path = os.path.join(settings.upload_dir, f"{userId}-{safe_name}")
-    with open(disk_path, "wb") as f:
-        f.write(data)
+# Statements grow per 1000 operations (transaction_batch.CHUNK_SIZE); the budget covers one chunk.
+@sync_router.post("/batch", response_model=TransactionBatchOut)
+@query_budget(12)
+def batch_transactions(
+    payload: TransactionBatchIn,
+    user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> TransactionBatchOut:
+    """Create, update and delete many of the caller's transactions in one database transaction."""
 
-    job = ImportJob(
-        user_id=userId,
-        filename=safe_name,
-        content_type=file.content_type or "application/octet-stream",
-        file_path=disk_path,
-        file_size=len(data),
-        status="PROCESSING",
-    )
+    result = _batch(db, user.id, payload)
+    if _changed(result):
+        stats_cache.bump(user.id)
+    return result
+
+
+@async_router.post("", response_model=TransactionOut)
+@query_budget(5)
+async def create_transaction_async(
+    payload: TransactionCreate,
+    _: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+) -> TransactionOut:
+    out = await db.run_sync(_create, payload)
+    await stats_cache.bump_async(int(out.userId))
+    return out
+
+
+@async_router.put("/{tx_id}", response_model=TransactionOut)
+@query_budget(7)
+async def update_transaction_async(
+    tx_id: int,
+    payload: TransactionUpdate,
+    _: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+) -> TransactionOut:
+    out = await db.run_sync(_update, tx_id, payload)
+    await stats_cache.bump_async(int(out.userId))
+    return out
+
+
+@async_router.delete("/{tx_id}")
+@query_budget(5)
+async def delete_transaction_async(
+    tx_id: int,
+    _: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    await stats_cache.bump_async(await db.run_sync(_delete, tx_id))
+    return {"ok": True}
+
+
+def _save_import_job(db: Session, job: ImportJob) -> ImportJob:
     db.add(job)
     db.commit()
     db.refresh(job)
+    return job
 
-    try:
-        created = await process_import_file_to_transactions(db=db, user_id=userId, file_path=disk_path, filename=safe_name)
-        job.status = "DONE"
-        db.commit()
-        return {"created": created}
-    except Exception as e:
-        job.status = "FAILED"
-        job.error_message = str(e)
-        db.commit()
-        raise
+
+@router.post("/import", status_code=status.HTTP_202_ACCEPTED, openapi_extra=UPLOAD_OPENAPI)
+@query_budget(3)
+async def import_file(
+    userId: int,
+    request: Request,
+    user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    # Checked before the upload is read, so a forbidden request never writes a file.
+    owner_id = _effective_user_id(user, userId)
+    started = time.perf_counter()
+    upload = await save_multipart_upload(
+        request,
+        field_name="file",
+        dest_dir=settings.upload_dir,
+        name_prefix=f"{owner_id}-",
+        max_bytes=settings.max_upload_mb * 1024 * 1024,
+    )
+
+    job = ImportJob(
+        user_id=owner_id,
+        filename=upload.filename,
+        content_type=upload.content_type,
+        file_path=upload.path,
+        file_size=upload.size,
+        content_sha256=upload.sha256,
+        upload_ms=1000 * (time.perf_counter() - started),
+        status="PENDING",
+    )
+    # The session is sync; keep its round trips off the event loop.
+    job = await run_in_threadpool(_save_import_job, db, job)
+
+    import_worker_pool.submit(job.id)
+    return {"id": str(job.id), "status": job.status}
+
+
+@async_router.post("/batch", response_model=TransactionBatchOut)
+@query_budget(12)
+async def batch_transactions_async(
+    payload: TransactionBatchIn,
+    user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+) -> TransactionBatchOut:
+    result = await db.run_sync(_batch, user.id, payload)
+    if _changed(result):
+        await stats_cache.bump_async(user.id)
+    return result
@@ -7,20 +7,84 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
     database_url: str
+    # Serve the transaction and stats routes from an asyncio engine instead of the threadpool.
+    db_async: bool = False
+    async_database_url: str = ""  # default: database_url with its asyncio driver
+
+    # Per engine and per process: size for the worker count (threadpool or concurrent requests).
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800  # below MySQL's wait_timeout and any proxy idle cutoff
+    db_ping_idle_seconds: float = 60.0  # ping on checkout only after this long idle
 
     jwt_secret: str
     jwt_algorithm: str = "HS256"
     jwt_expires_minutes: int = 60 * 24 * 30
+    user_cache_ttl_seconds: float = 30.0  # authenticated principal; 0 disables
+
+    # bcrypt runs on its own pool; past max_pending, login/register answer 503 right away.
+    bcrypt_workers: int = 2
+    bcrypt_max_pending: int = 16
+    # 0 calibrates at startup for the target time (never below 12). Logins only rehash upward,
+    # but pin it when several processes share the users table so they all hash at one cost.
+    bcrypt_rounds: int = 0
+    bcrypt_target_ms: float = 250.0
 
     cors_origins: str = ""
 
+    # Prometheus text at /metrics; keep it off the public internet (no auth on purpose, scrapers can't log in).
+    metrics_enabled: bool = True
+    # Per-route SQL statement budgets (app.core.query_budget): off | log | raise. Meant for dev/CI.
+    query_budget_mode: str = "off"
+
     openrouter_api_key: str | None = None
     openrouter_model: str = ""
     openrouter_pdf_engine: str = ""
+    openrouter_base_url: str = "https://openrouter.ai/api/v1"  # point at a stub server for tests
+    openrouter_max_connections: int = 10
+    openrouter_connect_timeout: float = 10.0
+    openrouter_read_timeout: float = 180.0
+    openrouter_max_retries: int = 3  # on 429, 5xx, timeouts and dropped connections
+    openrouter_backoff_seconds: float = 1.0
+    openrouter_backoff_max_seconds: float = 30.0
 
     upload_dir: str = "./uploads"
     max_upload_mb: int = 25
 
+    transactions_page_size: int = 200
+    transactions_max_page_size: int = 1000
+    transactions_batch_max_ops: int = 5000
+
+    import_workers: int = 2
+    import_poll_seconds: float = 5.0
+    # A PROCESSING job whose owner hasn't renewed its lease for this long is requeued.
+    import_lease_seconds: float = 120.0
+    import_shutdown_seconds: float = 30.0  # running jobs get this long to finish on shutdown
+
+    docling_workers: int = 2
+    docling_timeout_seconds: float = 180.0
+
+    # Native uploads are shrunk before going to the model (see model_payload).
+    model_image_max_side: int = 2048
+    model_image_quality: int = 80
+
+    # Long converted documents are extracted in overlapping chunks, several model calls at a time.
+    extraction_chunk_chars: int = 16000
+    extraction_chunk_overlap_lines: int = 3
+    extraction_parallelism: int = 8  # per process, across all imports
+
+    extraction_cache_max_entries: int = 2000
+    extraction_cache_max_age_days: int = 90
+
+    # sqlite | memory. sqlite is shared by every worker on the host, so a write on one
+    # invalidates the others. memory keeps entries and user versions per process: only for a
+    # single worker, or several would serve stale stats until the TTL runs out.
+    stats_cache_backend: str = "sqlite"
+    stats_cache_path: str = "./stats_cache.sqlite3"
+    stats_cache_ttl_seconds: float = 300.0  # 0 disables the cache
+    stats_cache_max_entries: int = 5000
+
     @property
     def cors_origins_list(self) -> list[str]:
         return [o.strip() for o in self.cors_origins.split(",") if o.strip()]
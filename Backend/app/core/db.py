@@ -1,21 +1,36 @@
 from __future__ import annotations
 
-from collections.abc import Generator
+import asyncio
+from collections.abc import AsyncGenerator, Callable, Generator
+from typing import Any
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
+from app.core.db_pool import MeteredAsyncQueuePool, MeteredQueuePool, ping_stale_connections
+from app.core.metrics import count_queries
+
+ASYNC_DRIVERS = {"mysql": "aiomysql", "sqlite": "aiosqlite"}
+
+POOL_OPTIONS = {
+    "pool_size": settings.db_pool_size,
+    "max_overflow": settings.db_max_overflow,
+    "pool_timeout": settings.db_pool_timeout,
+    "pool_recycle": settings.db_pool_recycle,
+}
 
 
 class Base(DeclarativeBase):
     pass
 
 
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-)
+engine = create_engine(settings.database_url, poolclass=MeteredQueuePool, **POOL_OPTIONS)
+ping_stale_connections(engine, settings.db_ping_idle_seconds)
+count_queries(engine)
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
@@ -26,3 +41,59 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+async def run_session_call(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """run_in_threadpool for work on a sync Session that outlives a cancelled caller.
+
+    Cancelling an await on run_in_threadpool returns at once while the thread keeps going,
+    so the caller's cleanup (rollback, close) would run on a Session still in use. Here a
+    cancellation waits for the thread to finish before it propagates.
+    """
+
+    future = asyncio.ensure_future(run_in_threadpool(fn, *args, **kwargs))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        while not future.done():
+            try:
+                await asyncio.wait({future})
+            except asyncio.CancelledError:
+                continue
+        if not future.cancelled():
+            future.exception()  # consumed; the cancellation is what the caller sees
+        raise
+
+
+def _async_url(url: str) -> str:
+    """Same database, reached through its asyncio driver."""
+
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"No asyncio driver configured for '{backend}'; set ASYNC_DATABASE_URL")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+# Only built when enabled, so the asyncio drivers stay optional for sync deploys.
+async_engine = (
+    create_async_engine(
+        settings.async_database_url or _async_url(settings.database_url),
+        poolclass=MeteredAsyncQueuePool,
+        **POOL_OPTIONS,
+    )
+    if settings.db_async
+    else None
+)
+if async_engine is not None:
+    ping_stale_connections(async_engine.sync_engine, settings.db_ping_idle_seconds)
+    count_queries(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False) if async_engine is not None else None
+
+
+async def get_async_db() -> AsyncGenerator:
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async engine disabled; set DB_ASYNC=true")
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Counters for one pool, read by the admin endpoint."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.stale_pings = 0
+        self.ping_failures = 0
+        self._lock = threading.Lock()
+
+    def record_checkout(self, waited: float, overflow: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.overflow_checkouts += overflow
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_ping(self, ok: bool) -> None:
+        with self._lock:
+            self.stale_pings += 1
+            self.ping_failures += not ok
+
+
+class _MeteredPool:
+    """Times every checkout, including the wait for a free slot once the pool is exhausted."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_checkout(time.perf_counter() - started, overflow=self.checkedout() > self.size())
+        return conn
+
+
+class MeteredQueuePool(_MeteredPool, QueuePool):
+    pass
+
+
+class MeteredAsyncQueuePool(_MeteredPool, AsyncAdaptedQueuePool):
+    pass
+
+
+def ping_stale_connections(engine: Engine, idle_seconds: float) -> None:
+    """Pre-ping only connections that sat idle longer than `idle_seconds`.
+
+    pool_pre_ping costs a round trip on every checkout; a connection handed back a few
+    milliseconds ago is almost certainly alive. A failed ping raises DisconnectionError,
+    which makes the pool discard the connection and check out a fresh one.
+    """
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, record):
+        record.info["idle_since"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, record, proxy):
+        idle_since = record.info.pop("idle_since", None)
+        if idle_since is None or time.monotonic() - idle_since < idle_seconds:
+            return
+
+        metrics = getattr(engine.pool, "metrics", None)
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception as e:
+            if metrics is not None:
+                metrics.record_ping(ok=False)
+            raise exc.DisconnectionError() from e
+        finally:
+            cursor.close()
+        if metrics is not None:
+            metrics.record_ping(ok=True)
+
+
+def pool_status(engine: Engine) -> dict:
+    pool = engine.pool
+    status = {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checkedOut": pool.checkedout(),
+        "checkedIn": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "maxOverflow": pool._max_overflow,
+        "timeoutSeconds": pool.timeout(),
+    }
+    metrics: PoolMetrics | None = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(
+            checkouts=metrics.checkouts,
+            overflowCheckouts=metrics.overflow_checkouts,
+            timeouts=metrics.timeouts,
+            avgWaitMs=round(1000 * metrics.wait_seconds_total / metrics.checkouts, 3) if metrics.checkouts else 0.0,
+            maxWaitMs=round(1000 * metrics.wait_seconds_max, 3),
+            stalePings=metrics.stale_pings,
+            pingFailures=metrics.ping_failures,
+        )
+    return status
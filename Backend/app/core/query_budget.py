@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import RequestStats, current_request
+
+logger = logging.getLogger(__name__)
+
+BUDGET_ATTR = "__query_budget__"
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+def query_budget(max_queries: int) -> Callable:
+    """Declare how many SQL statements one call of the route may issue, at most.
+
+    Goes under the router decorator; the endpoint itself is returned unchanged:
+
+        @router.get("/dashboard")
+        @query_budget(5)
+        def dashboard(...): ...
+
+    Budgets are for the cold path (user and stats caches missing), so warm requests stay
+    well under them. Only enforced when QUERY_BUDGET_MODE is "log" or "raise".
+    """
+
+    def mark(endpoint: Callable) -> Callable:
+        setattr(endpoint, BUDGET_ATTR, max_queries)
+        return endpoint
+
+    return mark
+
+
+def route_budget(route) -> int | None:
+    return getattr(getattr(route, "endpoint", None), BUDGET_ATTR, None)
+
+
+class QueryBudgetMiddleware:
+    """Compares the statements a request issued against its route's budget.
+
+    The check runs when the response starts, i.e. after the handler has done its queries. In
+    "raise" mode the response is replaced by the exception (a 500, or a failure under
+    TestClient); in "log" mode a warning is logged and the response goes out as usual.
+    Queries made while streaming a body (exports) are not covered.
+    """
+
+    def __init__(self, app: ASGIApp, mode: str) -> None:
+        self.app = app
+        self.raise_on_excess = mode == "raise"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Shares the metrics middleware's counter when that one is installed.
+        stats = current_request.get()
+        token = None
+        if stats is None:
+            stats = RequestStats()
+            token = current_request.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                self._check(scope, stats)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if token is not None:
+                current_request.reset(token)
+
+    def _check(self, scope: Scope, stats: RequestStats) -> None:
+        route = scope.get("route")
+        budget = route_budget(route)
+        if budget is None or stats.queries <= budget:
+            return
+        message = f"{scope['method']} {route.path} ran {stats.queries} queries, budget is {budget}"
+        if self.raise_on_excess:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 from jose import jwt
@@ -7,9 +11,36 @@ from passlib.context import CryptContext
 
 from app.core.config import settings
 
+# Never calibrate below this cost, however slow the host: it is passlib's default, the cost
+# every hash had before calibration existed.
+MIN_BCRYPT_ROUNDS = 12
+MAX_BCRYPT_ROUNDS = 16
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+def configure_bcrypt_rounds(rounds: int) -> None:
+    """Hash at `rounds` and flag cheaper hashes for rehash on next login.
+
+    Stronger hashes are left alone, so processes that calibrated to different costs never
+    downgrade each other's hashes; at worst the slower host upgrades a few once.
+    """
+
+    pwd_context.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+
+
+def calibrate_bcrypt_rounds(target_ms: float) -> int:
+    """Highest cost whose hash stays within `target_ms` on this machine."""
+
+    bcrypt = pwd_context.handler("bcrypt").using(rounds=MIN_BCRYPT_ROUNDS)
+    started = time.perf_counter()
+    bcrypt.hash("calibration")
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    # Each extra round doubles the work.
+    rounds = MIN_BCRYPT_ROUNDS + math.floor(math.log2(max(target_ms / elapsed_ms, 1.0)))
+    return min(rounds, MAX_BCRYPT_ROUNDS)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -18,6 +49,55 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHasherBusy(RuntimeError):
+    """More than `max_pending` hashes running or queued; answered with 503 and Retry-After."""
+
+
+class PasswordHasher:
+    """bcrypt on a dedicated, bounded thread pool.
+
+    A burst of logins queues here instead of in Starlette's shared threadpool, so cheap
+    endpoints keep their threads. Past `max_pending` (running + queued) calls fail fast
+    with PasswordHasherBusy rather than waiting behind seconds of hashing.
+    """
+
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="bcrypt")
+
+    async def _run(self, fn, *args):
+        # Only touched from the event loop, so the counter needs no lock.
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusy("Too many logins in progress, try again")
+        self.pending += 1
+        try:
+            return await asyncio.wrap_future(self._executor.submit(fn, *args))
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed: str) -> tuple[bool, str | None]:
+        """(valid, new_hash); new_hash is set when the stored cost is below the current one."""
+
+        return await self._run(pwd_context.verify_and_update, password, hashed)
+
+    async def calibrate(self, target_ms: float) -> int:
+        rounds = await asyncio.wrap_future(self._executor.submit(calibrate_bcrypt_rounds, target_ms))
+        configure_bcrypt_rounds(rounds)
+        return rounds
+
+
+password_hasher = PasswordHasher(settings.bcrypt_workers, settings.bcrypt_max_pending)
+
+if settings.bcrypt_rounds:
+    configure_bcrypt_rounds(settings.bcrypt_rounds)
+
+
 def create_access_token(*, subject: str, expires_minutes: int | None = None) -> str:
     now = datetime.now(timezone.utc)
     expire = now + timedelta(minutes=expires_minutes or settings.jwt_expires_minutes)
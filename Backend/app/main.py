@@ -1,19 +1,57 @@
 from __future__ import annotations
 
+import logging
 import os
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
+from app.core.db import async_engine
+from app.core.metrics import MetricsMiddleware, registry
+from app.core.query_budget import QueryBudgetMiddleware
+from app.core.security import PasswordHasherBusy, password_hasher
 from app.api.routes.auth import router as auth_router
 from app.api.routes.admin import router as admin_router
 from app.api.routes.transactions import router as transactions_router
-from app.api.routes.stats import router as stats_router
+from app.api.routes.transactions import async_router as transactions_async_router
+from app.api.routes.transactions import sync_router as transactions_sync_router
+from app.api.routes.stats import async_router as stats_async_router
+from app.api.routes.stats import sync_router as stats_sync_router
+from app.api.routes.imports import router as imports_router
+from app.services.docling_pool import docling_pool
+from app.services.import_worker import import_worker_pool
+from app.services.openrouter_client import close_client as close_openrouter_client
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if not settings.bcrypt_rounds:
+        rounds = await password_hasher.calibrate(settings.bcrypt_target_ms)
+        logger.info(
+            "bcrypt cost calibrated to %s for %.0f ms; set BCRYPT_ROUNDS=%s to pin it across workers",
+            rounds,
+            settings.bcrypt_target_ms,
+            rounds,
+        )
+    docling_pool.start()
+    await import_worker_pool.start()
+    try:
+        yield
+    finally:
+        await import_worker_pool.stop()
+        docling_pool.stop()
+        await close_openrouter_client()
+        if async_engine is not None:
+            await async_engine.dispose()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="MeuBolso API")
+    app = FastAPI(title="MeuBolso API", lifespan=lifespan)
 
     os.makedirs(settings.upload_dir, exist_ok=True)
 
@@ -24,17 +62,46 @@ def create_app() -> FastAPI:
             allow_credentials=True,
             allow_methods=["*"] ,
             allow_headers=["*"],
+            expose_headers=["X-Next-Cursor"],
+        )
+
+    if settings.query_budget_mode != "off":
+        app.add_middleware(QueryBudgetMiddleware, mode=settings.query_budget_mode)
+
+    if settings.metrics_enabled:
+        # Added last so it wraps everything else, CORS preflights included.
+        app.add_middleware(MetricsMiddleware)
+
+    @app.exception_handler(PasswordHasherBusy)
+    async def password_hasher_busy(request: Request, exc: PasswordHasherBusy):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": str(exc)},
+            headers={"Retry-After": "1"},
         )
 
     app.include_router(auth_router)
     app.include_router(admin_router)
     app.include_router(transactions_router)
-    app.include_router(stats_router)
+    # Read/write endpoints run on the asyncio engine or the threadpool, never both.
+    if settings.db_async:
+        app.include_router(transactions_async_router)
+        app.include_router(stats_async_router)
+    else:
+        app.include_router(transactions_sync_router)
+        app.include_router(stats_sync_router)
+    app.include_router(imports_router)
 
     @app.get("/health")
     def health():
         return {"ok": True}
 
+    if settings.metrics_enabled:
+
+        @app.get("/metrics", include_in_schema=False)
+        def metrics():
+            return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
     return app
 
 
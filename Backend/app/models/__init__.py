@@ -1,5 +1,7 @@
 from app.models.user import User
 from app.models.import_job import ImportJob
 from app.models.transaction import Transaction
+from app.models.extraction_cache import ExtractionCache
+from app.models.monthly_rollup import MonthlyRollup
 
-__all__ = ["User", "ImportJob", "Transaction"]
+__all__ = ["User", "ImportJob", "Transaction", "ExtractionCache", "MonthlyRollup"]
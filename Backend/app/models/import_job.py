@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import String, DateTime, Integer, Text, ForeignKey
+from sqlalchemy import String, DateTime, Float, Integer, Text, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.db import Base
@@ -18,9 +18,27 @@ class ImportJob(Base):
     content_type: Mapped[str] = mapped_column(String(120), nullable=False)
     file_path: Mapped[str] = mapped_column(String(512), nullable=False)
     file_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    content_sha256: Mapped[str | None] = mapped_column(String(64), index=True, nullable=True)
+    # Bytes actually sent to the model after shrinking (file_size is the original upload).
+    sent_bytes: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
-    status: Mapped[str] = mapped_column(String(30), nullable=False, default="PENDING")  # PENDING|PROCESSING|DONE|FAILED
+    status: Mapped[str] = mapped_column(String(30), index=True, nullable=False, default="PENDING")  # PENDING|PROCESSING|DONE|FAILED
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Lease on a PROCESSING job: the owning process renews heartbeat_at while it runs.
+    claimed_by: Mapped[str | None] = mapped_column(String(120), nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    # Per-stage wall time in ms; see import_service.ImportMetrics. None = stage didn't run.
+    upload_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    convert_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    model_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    parse_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    insert_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    model: Mapped[str | None] = mapped_column(String(120), nullable=True)
+    model_attempts: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    prompt_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    completion_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
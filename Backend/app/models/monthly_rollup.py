@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from sqlalchemy import String, Integer, Numeric, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+class MonthlyRollup(Base):
+    """Per-month totals of `transactions`, kept in step by every write path (see services.rollups)."""
+
+    __tablename__ = "monthly_rollups"
+    __table_args__ = (
+        UniqueConstraint("user_id", "year", "month", "type", "category", "tag", name="uq_monthly_rollups_bucket"),
+        # category breakdown spans all months of one category
+        Index("ix_monthly_rollups_user_type_category", "user_id", "type", "category", "tag"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+
+    year: Mapped[int] = mapped_column(Integer, nullable=False)
+    month: Mapped[int] = mapped_column(Integer, nullable=False)
+    type: Mapped[str] = mapped_column(String(10), nullable=False)
+    category: Mapped[str] = mapped_column(String(80), nullable=False)
+    tag: Mapped[str] = mapped_column(String(80), nullable=False, default="")  # "" = no tag, so the key stays unique
+
+    total: Mapped[float] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    tx_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
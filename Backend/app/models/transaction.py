@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime, date
 
-from sqlalchemy import String, Date, DateTime, Numeric, Boolean, ForeignKey
+from sqlalchemy import String, Date, DateTime, Numeric, Boolean, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.db import Base
@@ -10,9 +10,13 @@ from app.core.db import Base
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        # list: user_id + date range, ordered by (date, id). Stats read monthly_rollups instead.
+        Index("ix_transactions_user_date_id", "user_id", "date", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
     description: Mapped[str] = mapped_column(String(255), nullable=False)
     amount: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False)
@@ -23,7 +27,10 @@ class Transaction(Base):
     is_recurring: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
     source: Mapped[str | None] = mapped_column(String(30), nullable=True)  # manual | import
-    import_id: Mapped[int | None] = mapped_column(ForeignKey("imports.id", ondelete="SET NULL"), nullable=True)
+    import_id: Mapped[int | None] = mapped_column(ForeignKey("imports.id", ondelete="SET NULL"), index=True, nullable=True)
+    # Set on rows created by POST /api/transactions/batch where the dialect has no RETURNING,
+    # so the new ids can be read back (see transaction_batch._insert_rows).
+    batch_token: Mapped[str | None] = mapped_column(String(32), nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
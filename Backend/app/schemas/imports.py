@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class ImportJobOut(BaseModel):
+    id: str
+    userId: str
+    filename: str
+    status: str  # PENDING|PROCESSING|DONE|FAILED
+    createdCount: int
+    fileSize: int
+    sentBytes: int | None = None
+    errorMessage: str | None = None
+    createdAt: datetime
+    updatedAt: datetime
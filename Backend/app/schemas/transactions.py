@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 from datetime import date as Date
+from typing import Annotated, Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
 
 
 class TransactionBase(BaseModel):
@@ -34,3 +37,44 @@ class TransactionOut(TransactionBase):
     userId: str
 
     model_config = {"from_attributes": True}
+
+
+class BatchCreate(BaseModel):
+    op: Literal["create"]
+    data: TransactionBase  # always owned by the caller
+
+
+class BatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: str
+    data: TransactionUpdate
+
+
+class BatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: str
+
+
+BatchOperation = Annotated[BatchCreate | BatchUpdate | BatchDelete, Field(discriminator="op")]
+
+
+class TransactionBatchIn(BaseModel):
+    operations: list[BatchOperation] = Field(min_length=1, max_length=settings.transactions_batch_max_ops)
+    # When true, one missing id rolls back the whole batch (409) instead of being skipped.
+    atomic: bool = False
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    op: str
+    status: str  # created|updated|deleted|not_found
+    id: str | None = None
+    transaction: TransactionOut | None = None
+
+
+class TransactionBatchOut(BaseModel):
+    created: int
+    updated: int
+    deleted: int
+    failed: int
+    results: list[BatchItemResult]
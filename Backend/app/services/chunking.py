@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+_SPACES = re.compile(r"\s+")
+
+
+@dataclass
+class Chunk:
+    text: str
+    # Leading lines repeated from the previous chunk; rows found here may already be extracted.
+    overlap: str = ""
+
+
+def _is_table_row(line: str) -> bool:
+    return line.lstrip().startswith("|")
+
+
+def _is_boundary(line: str) -> bool:
+    stripped = line.strip()
+    return not stripped or stripped.startswith("#")
+
+
+def split_markdown(markdown: str, max_chars: int, overlap_lines: int) -> list[Chunk]:
+    """Split converted markdown into chunks of about `max_chars`.
+
+    Cuts prefer headings and blank lines (section/page breaks). Each chunk after the first
+    starts with the last `overlap_lines` lines of the previous one so a row cut in half is
+    seen whole by one side; when the cut falls inside a table, the table's header rows are
+    repeated too so the model still knows the columns.
+    """
+
+    lines = markdown.splitlines()
+    if len(markdown) <= max_chars:
+        return [Chunk(markdown)]
+
+    chunks: list[Chunk] = []
+    start = 0
+    prefix: list[str] = []
+    overlap: list[str] = []
+    while start < len(lines):
+        size = sum(len(line) + 1 for line in prefix)
+        end = start
+        last_boundary = None
+        while end < len(lines) and (size + len(lines[end]) + 1 <= max_chars or end == start):
+            size += len(lines[end]) + 1
+            end += 1
+            # Only worth cutting early at a boundary when the chunk is already half full.
+            if end < len(lines) and _is_boundary(lines[end]) and size >= max_chars // 2:
+                last_boundary = end
+        if end < len(lines) and last_boundary is not None:
+            end = last_boundary
+
+        chunks.append(Chunk("\n".join(prefix + lines[start:end]), overlap="\n".join(overlap)))
+        if end >= len(lines):
+            break
+
+        # Header of the table the cut falls in, if any: first two lines (names + separator).
+        table_header: list[str] = []
+        if _is_table_row(lines[end - 1]) and _is_table_row(lines[end]):
+            top = end - 1
+            while top > 0 and _is_table_row(lines[top - 1]):
+                top -= 1
+            table_header = lines[top:top + 2]
+
+        next_start = max(end - overlap_lines, start + 1)
+        overlap = lines[next_start:end]
+        prefix = [h for h in table_header if h not in overlap]
+        start = next_start
+
+    return chunks
+
+
+def _norm(text: str) -> str:
+    return _SPACES.sub(" ", text).strip().casefold()
+
+
+def _item_key(item: dict) -> tuple:
+    try:
+        amount = round(abs(float(item.get("amount") or 0)), 2)
+    except (TypeError, ValueError):
+        amount = 0.0
+    return (item.get("date"), amount, item.get("type"), _norm(item.get("description") or ""))
+
+
+def _seen_in(item: dict, text: str) -> bool:
+    """Whether the row behind `item` plausibly sits in `text` (its description or amount shows up)."""
+
+    haystack = _norm(text)
+    description = _norm(item.get("description") or "")
+    if description and description in haystack:
+        return True
+    try:
+        amount = abs(float(item.get("amount") or 0))
+    except (TypeError, ValueError):
+        return False
+    dotted = f"{amount:.2f}"
+    br = f"{amount:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+    return dotted in haystack or br in haystack
+
+
+def merge_chunk_items(chunks: list[Chunk], results: list[list[dict]]) -> list[dict]:
+    """Concatenate per-chunk items, dropping the copies produced by the overlaps.
+
+    An item is dropped only when the previous chunk returned an identical one (same date,
+    amount, type and description) and it can be traced to the shared overlap lines, so
+    genuinely repeated transactions elsewhere in the document are kept.
+    """
+
+    merged: list[dict] = []
+    previous: Counter = Counter()
+    for chunk, items in zip(chunks, results):
+        current = Counter(_item_key(i) for i in items)
+        for item in items:
+            key = _item_key(item)
+            if chunk.overlap and previous[key] > 0 and _seen_in(item, chunk.overlap):
+                previous[key] -= 1
+                continue
+            merged.append(item)
+        previous = current
+    return merged
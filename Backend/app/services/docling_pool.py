@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# One converter per pool process, built by the initializer so models load once.
+_converter = None
+
+
+def _init_worker() -> None:
+    global _converter
+    from docling.document_converter import DocumentConverter
+
+    _converter = DocumentConverter()
+
+
+def _warm() -> bool:
+    return _converter is not None
+
+
+def _convert_to_markdown(file_path: str) -> str:
+    result = _converter.convert(file_path)
+    return result.document.export_to_markdown()
+
+
+class DoclingPool:
+    """Long-lived process pool that turns documents into markdown with a warm converter.
+
+    The pool size bounds how many conversions run at once; extra jobs wait on a
+    semaphore, so the timeout only counts time spent converting. A conversion past the
+    timeout takes its executor down with it, since a stuck worker process can only be
+    reclaimed by killing it; conversions that were running beside it are retried once
+    on the fresh executor.
+    """
+
+    def __init__(self, size: int, timeout_seconds: float) -> None:
+        self.size = max(1, size)
+        self.timeout_seconds = timeout_seconds
+        self._executor: ProcessPoolExecutor | None = None
+        self._warmups: list[Future] = []
+        self._slots = asyncio.Semaphore(self.size)
+        # Executors killed over a timeout; their other conversions weren't at fault.
+        self._recycled: weakref.WeakSet[ProcessPoolExecutor] = weakref.WeakSet()
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn, not fork: the web process holds threads and DB connections.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.size,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            # One task per slot so every process starts (and loads models) ahead of the first import.
+            self._warmups = [self._executor.submit(_warm) for _ in range(self.size)]
+        return self._executor
+
+    def start(self) -> None:
+        self._ensure_executor()
+
+    def stop(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _kill(self, executor: ProcessPoolExecutor) -> None:
+        # Only the executor that failed; another call may already have replaced it.
+        if self._executor is executor:
+            self._executor = None
+        for proc in list((executor._processes or {}).values()):
+            proc.terminate()
+        executor.shutdown(wait=False)
+
+    async def convert_to_markdown(self, file_path: str) -> str:
+        async with self._slots:
+            retried = False
+            while True:
+                executor = self._ensure_executor()
+                # Process start-up and model loading don't count against the timeout either.
+                await asyncio.gather(*(asyncio.wrap_future(f) for f in self._warmups), return_exceptions=True)
+                try:
+                    future = executor.submit(_convert_to_markdown, file_path)
+                    return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout_seconds)
+                except asyncio.TimeoutError:
+                    logger.warning("Docling conversion of %s timed out; restarting pool", file_path)
+                    self._recycled.add(executor)
+                    self._kill(executor)
+                    self.start()  # warm the replacement before the next conversion needs it
+                    raise RuntimeError(f"Document conversion timed out after {self.timeout_seconds:.0f}s")
+                except BrokenProcessPool:
+                    if executor in self._recycled and not retried:
+                        retried = True
+                        continue
+                    # A worker died (OOM, crash in native code); the next call gets a fresh pool.
+                    self._kill(executor)
+                    raise
+
+
+docling_pool = DoclingPool(size=settings.docling_workers, timeout_seconds=settings.docling_timeout_seconds)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import tempfile
+from collections.abc import Iterator
+from datetime import date
+
+from openpyxl import Workbook
+from sqlalchemy import select
+
+from app.core.db import SessionLocal
+from app.models.transaction import Transaction
+
+EXPORT_BATCH_SIZE = 2000
+FILE_CHUNK_SIZE = 256 * 1024
+
+EXPORT_COLUMNS = (
+    Transaction.id,
+    Transaction.date,
+    Transaction.description,
+    Transaction.amount,
+    Transaction.type,
+    Transaction.category,
+    Transaction.tag,
+    Transaction.is_recurring,
+)
+HEADER = ["id", "date", "description", "amount", "type", "category", "tag", "isRecurring"]
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _batches(user_id: int, date_from: date | None, date_to: date | None) -> Iterator[list]:
+    """Yield row batches from a server-side cursor; the session lives as long as the stream."""
+
+    q = select(*EXPORT_COLUMNS).where(Transaction.user_id == user_id)
+    if date_from is not None:
+        q = q.where(Transaction.date >= date_from)
+    if date_to is not None:
+        q = q.where(Transaction.date <= date_to)
+    q = q.order_by(Transaction.date, Transaction.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+    with SessionLocal() as db:
+        for partition in db.execute(q).partitions():
+            yield partition
+
+
+def _csv(batches: Iterator[list]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(HEADER)
+    # BOM so Excel opens the accents correctly.
+    yield ("\ufeff" + buf.getvalue()).encode("utf-8")
+    for batch in batches:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows(
+            (r.id, r.date.isoformat(), r.description, str(r.amount), r.type, r.category, r.tag or "", int(r.is_recurring))
+            for r in batch
+        )
+        yield buf.getvalue().encode("utf-8")
+
+
+def _ndjson(batches: Iterator[list]) -> Iterator[bytes]:
+    for batch in batches:
+        yield "".join(
+            json.dumps(
+                {
+                    "id": str(r.id),
+                    "date": r.date.isoformat(),
+                    "description": r.description,
+                    "amount": float(r.amount),
+                    "type": r.type,
+                    "category": r.category,
+                    "tag": r.tag,
+                    "isRecurring": r.is_recurring,
+                },
+                ensure_ascii=False,
+            )
+            + "\n"
+            for r in batch
+        ).encode("utf-8")
+
+
+def _xlsx(batches: Iterator[list]) -> Iterator[bytes]:
+    # A zip container is only complete once saved, so rows go through a write-only workbook
+    # (flushed to disk as it grows) and the finished file is then streamed in chunks.
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Transações")
+    ws.append(HEADER)
+    for batch in batches:
+        for r in batch:
+            ws.append([r.id, r.date, r.description, float(r.amount), r.type, r.category, r.tag, r.is_recurring])
+
+    with tempfile.TemporaryFile() as tmp:
+        wb.save(tmp)
+        tmp.seek(0)
+        while chunk := tmp.read(FILE_CHUNK_SIZE):
+            yield chunk
+
+
+def export_transactions(fmt: str, *, user_id: int, date_from: date | None, date_to: date | None) -> Iterator[bytes]:
+    writer = {"csv": _csv, "ndjson": _ndjson, "xlsx": _xlsx}[fmt]
+    return writer(_batches(user_id, date_from, date_to))
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.extraction_cache import ExtractionCache
+
+
+def _key(content_sha256: str, model: str, prompt_version: str):
+    return (
+        ExtractionCache.content_sha256 == content_sha256,
+        ExtractionCache.model == model,
+        ExtractionCache.prompt_version == prompt_version,
+    )
+
+
+def get_cached_extraction(db: Session, *, content_sha256: str, model: str, prompt_version: str) -> dict | None:
+    entry = db.scalar(select(ExtractionCache).where(*_key(content_sha256, model, prompt_version)))
+    if entry is None:
+        return None
+
+    max_age = timedelta(days=settings.extraction_cache_max_age_days)
+    if entry.created_at < datetime.utcnow() - max_age:
+        # Drop it now: left in place, its unique key would make the next store_extraction a no-op.
+        db.execute(delete(ExtractionCache).where(ExtractionCache.id == entry.id))
+        db.commit()
+        return None
+
+    db.execute(
+        update(ExtractionCache)
+        .where(ExtractionCache.id == entry.id)
+        .values(hit_count=ExtractionCache.hit_count + 1, last_used_at=datetime.utcnow())
+    )
+    db.commit()
+    return json.loads(entry.result_json)
+
+
+def store_extraction(db: Session, *, content_sha256: str, model: str, prompt_version: str, args: dict) -> None:
+    payload = json.dumps(args, ensure_ascii=False)
+    db.add(
+        ExtractionCache(
+            content_sha256=content_sha256,
+            model=model,
+            prompt_version=prompt_version,
+            result_json=payload,
+            result_size=len(payload),
+        )
+    )
+    try:
+        db.commit()
+    except IntegrityError:
+        # Same file extracted concurrently by another worker; keep theirs.
+        db.rollback()
+        return
+
+    evict_extraction_cache(db)
+
+
+def evict_extraction_cache(db: Session) -> int:
+    """Drop entries older than the max age, then the least recently used above the max count."""
+
+    cutoff = datetime.utcnow() - timedelta(days=settings.extraction_cache_max_age_days)
+    removed = db.execute(delete(ExtractionCache).where(ExtractionCache.created_at < cutoff)).rowcount
+
+    overflow = (db.scalar(select(func.count(ExtractionCache.id))) or 0) - settings.extraction_cache_max_entries
+    if overflow > 0:
+        stale_ids = list(
+            db.scalars(
+                select(ExtractionCache.id).order_by(ExtractionCache.last_used_at.asc()).limit(overflow)
+            ).all()
+        )
+        removed += db.execute(delete(ExtractionCache).where(ExtractionCache.id.in_(stale_ids))).rowcount
+
+    db.commit()
+    return removed
+
+
+def purge_extraction_cache(db: Session) -> int:
+    removed = db.execute(delete(ExtractionCache)).rowcount
+    db.commit()
+    return removed
@@ -1,13 +1,27 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
-from datetime import date
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from datetime import date, datetime
 
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
+from app.core.db import run_session_call
 from app.models.transaction import Transaction
-from app.services.openrouter_client import chat_completions_with_file
+from app.services.chunking import Chunk, merge_chunk_items, split_markdown
+from app.services.extraction_cache import get_cached_extraction, store_extraction
+from app.services.docling_pool import docling_pool
+from app.services.model_payload import ModelFile, prepare_model_file
+from app.services.openrouter_client import chat_completions_with_file, guess_mime, needs_conversion
+from app.services.rollups import add_row_deltas, apply_deltas
+from app.services.stats_cache import stats_cache
+from app.services.statement_parser import parse_statement_table
 
 
 TOOLS = [
@@ -51,17 +65,63 @@ SYSTEM_PROMPT = (
     "use descrição clara e marque categoria como 'Outros'."
 )
 
+INSERT_BATCH_SIZE = 1000
 
-async def process_import_file_to_transactions(*, db: Session, user_id: int, file_path: str, filename: str) -> int:
-    prompt = SYSTEM_PROMPT
+# Cached extractions are only reused while the prompt and tool schema are unchanged.
+PROMPT_VERSION = hashlib.sha256((SYSTEM_PROMPT + json.dumps(TOOLS, sort_keys=True)).encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class ImportMetrics:
+    """Filled in while an import runs; the worker copies it onto the ImportJob (same column names).
+
+    Stage times are wall-clock milliseconds: chunks sent to the model in parallel count once in
+    model_ms. A stage that didn't run (local parser, cache hit) stays None.
+    """
+
+    sent_bytes: int | None = None
+    convert_ms: float | None = None
+    model_ms: float | None = None
+    parse_ms: float | None = None
+    insert_ms: float | None = None
+    model: str | None = None
+    model_attempts: int | None = None
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+
+    @contextmanager
+    def timed(self, stage: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = 1000 * (time.perf_counter() - started)
+            setattr(self, stage, (getattr(self, stage) or 0.0) + elapsed)
+
+    def record_attempts(self, attempts: list[dict] | None) -> None:
+        self.model_attempts = (self.model_attempts or 0) + len(attempts or [])
+
+    def record_response(self, resp: dict) -> None:
+        usage = resp.get("usage") or {}
+        self.record_attempts(resp.get("attempts"))
+        if usage.get("prompt_tokens") is not None:
+            self.prompt_tokens = (self.prompt_tokens or 0) + usage["prompt_tokens"]
+        if usage.get("completion_tokens") is not None:
+            self.completion_tokens = (self.completion_tokens or 0) + usage["completion_tokens"]
+
+    def apply_to(self, job) -> None:
+        for f in fields(self):
+            setattr(job, f.name, getattr(self, f.name))
+
+
+# Bounds concurrent model calls for the whole process, however many imports are chunking.
+_model_calls = asyncio.Semaphore(max(1, settings.extraction_parallelism))
 
-    resp = chat_completions_with_file(
-        model=settings.openrouter_model,
-        prompt=prompt,
-        file_path=file_path,
-        filename=filename,
-        tools=TOOLS,
-    )
+
+def _tool_items(resp: dict, *, required: bool = True) -> list[dict] | None:
+    """The `create_transactions` items in a response. With required=False a reply without a
+    tool call gives None instead of raising (tool_choice is "auto", so a chunk holding only
+    terms or a summary page may legitimately have nothing to report)."""
 
     # Parse tool calls
     choices = resp.get("choices") or []
@@ -71,12 +131,13 @@ async def process_import_file_to_transactions(*, db: Session, user_id: int, file
     msg = choices[0].get("message") or {}
     tool_calls = msg.get("tool_calls") or []
     if not tool_calls:
+        if not required:
+            return None
         # fallback: try to parse JSON in content
         content = msg.get("content")
         raise RuntimeError(f"Model did not call tool. content={content}")
 
-    created = 0
-
+    items = []
     for call in tool_calls:
         fn = (call.get("function") or {})
         if fn.get("name") != "create_transactions":
@@ -88,25 +149,201 @@ async def process_import_file_to_transactions(*, db: Session, user_id: int, file
         else:
             args = raw_args
 
-        txs = args.get("transactions") or []
-        for t in txs:
-            tx_date = t.get("date")
-            if not tx_date:
-                tx_date = date.today().isoformat()
-
-            tx = Transaction(
-                user_id=user_id,
-                description=t.get("description") or "(import)",
-                amount=float(t.get("amount") or 0),
-                type=t.get("type") or "EXPENSE",
-                category=t.get("category") or "Outros",
-                tag=t.get("tag"),
-                date=date.fromisoformat(tx_date),
-                is_recurring=bool(t.get("isRecurring")),
-                source="import",
+        items.extend(args.get("transactions") or [])
+    return items
+
+
+async def _call_model(
+    *,
+    model: str,
+    file_path: str,
+    filename: str,
+    metrics: ImportMetrics,
+    markdown: str | None = None,
+    model_file: ModelFile | None = None,
+) -> dict:
+    async with _model_calls:
+        try:
+            resp = await chat_completions_with_file(
+                model=model,
+                prompt=SYSTEM_PROMPT,
+                file_path=file_path,
+                filename=filename,
+                tools=TOOLS,
+                document_markdown=markdown,
+                model_file=model_file,
+            )
+        except Exception as e:
+            metrics.record_attempts(getattr(e, "attempts", None))
+            raise
+    metrics.record_response(resp)
+    return resp
+
+
+async def _call_model_chunked(
+    *, model: str, file_path: str, filename: str, chunks: list[Chunk], metrics: ImportMetrics
+) -> list[dict]:
+    """One model call per chunk, run concurrently; wall time is roughly that of the slowest chunk.
+
+    If one call fails the others are cancelled, so they stop holding `_model_calls` slots.
+    """
+
+    tasks = [
+        asyncio.create_task(
+            _call_model(
+                model=model,
+                file_path=file_path,
+                filename=f"{filename} (parte {i}/{len(chunks)})",
+                metrics=metrics,
+                markdown=chunk.text,
             )
-            db.add(tx)
-            created += 1
+        )
+        for i, chunk in enumerate(chunks, start=1)
+    ]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
 
+def _merge_chunk_responses(chunks: list[Chunk], responses: list[dict]) -> list[dict]:
+    results = [_tool_items(resp, required=False) for resp in responses]
+    if all(r is None for r in results):
+        raise RuntimeError(f"Model did not call tool for any of the {len(chunks)} chunks")
+    return merge_chunk_items(chunks, [r or [] for r in results])
+
+
+async def extract_transactions(
+    *,
+    db: Session,
+    file_path: str,
+    filename: str,
+    content_sha256: str | None = None,
+    metrics: ImportMetrics | None = None,
+) -> list[dict]:
+    """Return the raw `create_transactions` items for the file.
+
+    Recognised CSV/XLSX bank exports are parsed locally; everything else goes to the model,
+    whose output is cached by file hash so a re-upload costs nothing.
+    """
+
+    metrics = metrics or ImportMetrics()
+    with metrics.timed("parse_ms"):
+        items = await run_in_threadpool(parse_statement_table, file_path, filename)
+    if items is not None:
+        return items
+
+    model = settings.openrouter_model
+    if content_sha256:
+        cached = await run_session_call(
+            get_cached_extraction, db, content_sha256=content_sha256, model=model, prompt_version=PROMPT_VERSION
+        )
+        if cached is not None:
+            return cached.get("transactions") or []
+
+    markdown = None
+    model_file = None
+    with metrics.timed("convert_ms"):
+        if needs_conversion(file_path):
+            try:
+                markdown = await docling_pool.convert_to_markdown(file_path)
+            except Exception as e:
+                raise RuntimeError(f"Failed to process file with Docling: {e}")
+        else:
+            model_file = await run_in_threadpool(prepare_model_file, file_path, guess_mime(file_path))
+
+    metrics.model = model
+    # Only the model calls: decoding the tool calls and merging chunks is parse_ms, below.
+    chunks: list[Chunk] = []
+    with metrics.timed("model_ms"):
+        if markdown is not None:
+            chunks = split_markdown(markdown, settings.extraction_chunk_chars, settings.extraction_chunk_overlap_lines)
+            metrics.sent_bytes = sum(len(c.text.encode("utf-8")) for c in chunks)
+            if len(chunks) > 1:
+                responses = await _call_model_chunked(
+                    model=model, file_path=file_path, filename=filename, chunks=chunks, metrics=metrics
+                )
+            else:
+                responses = [
+                    await _call_model(model=model, file_path=file_path, filename=filename, metrics=metrics, markdown=markdown)
+                ]
+        else:
+            metrics.sent_bytes = len(model_file.data)
+            responses = [
+                await _call_model(model=model, file_path=file_path, filename=filename, metrics=metrics, model_file=model_file)
+            ]
+
+    with metrics.timed("parse_ms"):
+        if len(chunks) > 1:
+            items = _merge_chunk_responses(chunks, responses)
+        else:
+            items = _tool_items(responses[0])
+
+    if content_sha256:
+        await run_session_call(
+            store_extraction,
+            db,
+            content_sha256=content_sha256,
+            model=model,
+            prompt_version=PROMPT_VERSION,
+            args={"transactions": items},
+        )
+
+    return items
+
+
+def save_transactions(*, db: Session, user_id: int, items: list[dict], import_id: int | None = None) -> int:
+    """Insert the extracted items with executemany batches instead of one ORM object per row."""
+
+    today = date.today().isoformat()
+    now = datetime.utcnow()
+    rows = [
+        {
+            "user_id": user_id,
+            "description": (t.get("description") or "(import)")[:255],
+            "amount": float(t.get("amount") or 0),
+            "type": t.get("type") or "EXPENSE",
+            "category": (t.get("category") or "Outros")[:80],
+            "tag": t.get("tag"),
+            "date": date.fromisoformat(t.get("date") or today),
+            "is_recurring": bool(t.get("isRecurring")),
+            "source": "import",
+            "import_id": import_id,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for t in items
+    ]
+
+    table = Transaction.__table__
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        db.execute(table.insert(), rows[start:start + INSERT_BATCH_SIZE])
+
+    deltas: dict = {}
+    add_row_deltas(deltas, rows)
+    apply_deltas(db, deltas)
     db.commit()
-    return created
+    stats_cache.bump(user_id)
+    return len(rows)
+
+
+async def process_import_file_to_transactions(
+    *,
+    db: Session,
+    user_id: int,
+    file_path: str,
+    filename: str,
+    content_sha256: str | None = None,
+    import_id: int | None = None,
+    metrics: ImportMetrics | None = None,
+) -> int:
+    metrics = metrics or ImportMetrics()
+    items = await extract_transactions(
+        db=db, file_path=file_path, filename=filename, content_sha256=content_sha256, metrics=metrics
+    )
+    # The blocking DB work runs off the event loop, like the model call above.
+    with metrics.timed("insert_ms"):
+        return await run_session_call(save_transactions, db=db, user_id=user_id, items=items, import_id=import_id)
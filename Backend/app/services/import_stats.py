@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import math
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.import_job import ImportJob
+
+# Column -> key in the admin report; each gets p50/p95/p99 per group.
+MEASURES = {
+    "upload_ms": "uploadMs",
+    "convert_ms": "convertMs",
+    "model_ms": "modelMs",
+    "parse_ms": "parseMs",
+    "insert_ms": "insertMs",
+    "file_size": "fileSize",
+    "sent_bytes": "sentBytes",
+    "prompt_tokens": "promptTokens",
+    "completion_tokens": "completionTokens",
+    "model_attempts": "modelAttempts",
+    "created_count": "rows",
+}
+
+
+def _percentile(values: list[float], q: float) -> float:
+    # Nearest-rank on sorted input.
+    return values[max(0, math.ceil(q * len(values)) - 1)]
+
+
+def _summary(values: list[float]) -> dict | None:
+    if not values:
+        return None
+    values = sorted(values)
+    return {
+        "p50": round(_percentile(values, 0.50), 3),
+        "p95": round(_percentile(values, 0.95), 3),
+        "p99": round(_percentile(values, 0.99), 3),
+    }
+
+
+def _file_type(filename: str) -> str:
+    return os.path.splitext(filename)[1].lower().lstrip(".") or "unknown"
+
+
+def import_stats(db: Session, days: int) -> dict:
+    """Percentiles of the per-import accounting, grouped by file type and by model.
+
+    Percentiles only cover DONE jobs; failures are counted per group. A stage that didn't
+    run for a job (no conversion, cache hit) is left out of that stage's percentiles.
+    """
+
+    columns = [ImportJob.filename, ImportJob.status, ImportJob.model]
+    columns += [getattr(ImportJob, name) for name in MEASURES]
+    since = datetime.utcnow() - timedelta(days=days)
+    rows = db.execute(
+        select(*columns).where(ImportJob.created_at >= since, ImportJob.status.in_(("DONE", "FAILED")))
+    ).all()
+
+    groups: dict[str, dict[str, dict]] = {"byFileType": {}, "byModel": {}}
+    for row in rows:
+        keys = {"byFileType": _file_type(row.filename), "byModel": row.model or "(none)"}
+        for grouping, key in keys.items():
+            group = groups[grouping].setdefault(key, {"jobs": 0, "failed": 0, "values": defaultdict(list)})
+            group["jobs"] += 1
+            if row.status == "FAILED":
+                group["failed"] += 1
+                continue
+            for name, label in MEASURES.items():
+                value = getattr(row, name)
+                if value is not None:
+                    group["values"][label].append(value)
+            stages = [getattr(row, n) for n in ("upload_ms", "convert_ms", "model_ms", "parse_ms", "insert_ms")]
+            group["values"]["totalMs"].append(sum(v for v in stages if v is not None))
+
+    out: dict = {"days": days, "jobs": len(rows)}
+    for grouping, by_key in groups.items():
+        out[grouping] = {
+            key: {
+                "jobs": group["jobs"],
+                "failed": group["failed"],
+                **{label: _summary(values) for label, values in group["values"].items()},
+            }
+            for key, group in sorted(by_key.items())
+        }
+    return out
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.db import SessionLocal, run_session_call
+from app.models.import_job import ImportJob
+from app.services.import_service import ImportMetrics, process_import_file_to_transactions
+
+logger = logging.getLogger(__name__)
+
+# Lease owner written on claimed jobs; unique per process, so sibling uvicorn workers differ.
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _claim_job(db: Session, job_id: int) -> ImportJob | None:
+    # Conditional update so two workers (or two uvicorn processes) never run the same job.
+    now = datetime.utcnow()
+    res = db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id, ImportJob.status == "PENDING")
+        .values(status="PROCESSING", claimed_by=WORKER_ID, heartbeat_at=now, updated_at=now)
+    )
+    db.commit()
+    if res.rowcount != 1:
+        return None
+    return db.get(ImportJob, job_id)
+
+
+def _finish_job(
+    db: Session,
+    job: ImportJob,
+    metrics: ImportMetrics,
+    *,
+    status: str,
+    created: int = 0,
+    error: str | None = None,
+) -> None:
+    job.status = status
+    job.created_count = created
+    job.error_message = error
+    metrics.apply_to(job)
+    db.commit()
+
+
+def _pending_job_ids() -> list[int]:
+    with SessionLocal() as db:
+        return list(db.scalars(select(ImportJob.id).where(ImportJob.status == "PENDING").order_by(ImportJob.id)).all())
+
+
+def _renew_leases(job_ids: list[int]) -> None:
+    with SessionLocal() as db:
+        db.execute(
+            update(ImportJob)
+            .where(ImportJob.id.in_(job_ids), ImportJob.status == "PROCESSING", ImportJob.claimed_by == WORKER_ID)
+            .values(heartbeat_at=datetime.utcnow())
+        )
+        db.commit()
+
+
+def _requeue_expired_jobs(lease_seconds: float) -> int:
+    # Only PROCESSING jobs whose owner stopped renewing (crashed, killed, restarted); jobs a
+    # sibling process is running keep a fresh heartbeat and are left alone.
+    cutoff = datetime.utcnow() - timedelta(seconds=lease_seconds)
+    with SessionLocal() as db:
+        res = db.execute(
+            update(ImportJob)
+            .where(
+                ImportJob.status == "PROCESSING",
+                func.coalesce(ImportJob.heartbeat_at, ImportJob.updated_at) < cutoff,
+            )
+            .values(status="PENDING", claimed_by=None, heartbeat_at=None, updated_at=datetime.utcnow())
+        )
+        db.commit()
+        return res.rowcount
+
+
+async def run_import_job(job_id: int) -> None:
+    # Every Session call goes through run_session_call: if the job is cancelled, the thread
+    # using the session finishes before the rollback/close below touch it.
+    db = SessionLocal()
+    try:
+        job = await run_session_call(_claim_job, db, job_id)
+        if job is None:
+            return
+
+        metrics = ImportMetrics()
+        try:
+            created = await process_import_file_to_transactions(
+                db=db,
+                user_id=job.user_id,
+                file_path=job.file_path,
+                filename=job.filename,
+                content_sha256=job.content_sha256,
+                import_id=job.id,
+                metrics=metrics,
+            )
+        except Exception as e:
+            logger.exception("Import job %s failed", job_id)
+            await run_session_call(db.rollback)
+            await run_session_call(_finish_job, db, job, metrics, status="FAILED", error=str(e))
+            return
+
+        await run_session_call(_finish_job, db, job, metrics, status="DONE", created=created)
+    finally:
+        await run_session_call(db.close)
+
+
+class ImportWorkerPool:
+    """Fixed number of workers draining PENDING import jobs.
+
+    New jobs are pushed with `submit`; a sweeper also polls the table so jobs
+    written by other processes, or missed while the pool was down, get picked up.
+    Running jobs hold a lease renewed every lease_seconds / 4; jobs whose lease ran
+    out (their process died) are put back to PENDING by whichever process notices.
+    On shutdown, running jobs get shutdown_seconds to finish before being cancelled.
+    """
+
+    def __init__(self, size: int, poll_seconds: float, lease_seconds: float, shutdown_seconds: float) -> None:
+        self.size = max(1, size)
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.shutdown_seconds = shutdown_seconds
+        self._queue: asyncio.Queue[int] | None = None
+        self._queued: set[int] = set()
+        self._busy: dict[asyncio.Task, int] = {}  # worker task -> job it is running
+        self._workers: list[asyncio.Task] = []
+        self._background: list[asyncio.Task] = []
+        self._stopping = False
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._stopping = False
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.size)]
+        self._background = [asyncio.create_task(self._sweeper()), asyncio.create_task(self._lease_keeper())]
+
+    async def stop(self) -> None:
+        self._stopping = True
+        for task in self._workers:
+            if task not in self._busy:
+                task.cancel()
+
+        in_flight = list(self._busy)
+        if in_flight:
+            logger.info("Waiting up to %ss for %s running import job(s)", self.shutdown_seconds, len(in_flight))
+            _, unfinished = await asyncio.wait(in_flight, timeout=self.shutdown_seconds)
+            for task in unfinished:
+                # Left PROCESSING; its lease expires and another process runs it again.
+                logger.warning("Cancelling import job %s at shutdown", self._busy.get(task))
+                task.cancel()
+
+        # The lease keeper stays up until here so draining jobs keep their lease.
+        for task in self._background:
+            task.cancel()
+        await asyncio.gather(*self._workers, *self._background, return_exceptions=True)
+        self._workers = []
+        self._background = []
+        self._busy.clear()
+        self._queue = None
+        self._queued.clear()
+
+    def submit(self, job_id: int) -> None:
+        # Without a running pool the sweeper of whichever process starts next will find the job.
+        if self._queue is None or self._stopping or job_id in self._queued:
+            return
+        self._queued.add(job_id)
+        self._queue.put_nowait(job_id)
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        me = asyncio.current_task()
+        while not self._stopping:
+            job_id = await self._queue.get()
+            self._queued.discard(job_id)
+            self._busy[me] = job_id
+            try:
+                await run_import_job(job_id)
+            except Exception:
+                logger.exception("Import worker crashed on job %s", job_id)
+            finally:
+                self._busy.pop(me, None)
+                self._queue.task_done()
+
+    async def _sweeper(self) -> None:
+        while True:
+            try:
+                for job_id in await run_in_threadpool(_pending_job_ids):
+                    self.submit(job_id)
+            except Exception:
+                logger.exception("Import sweeper failed")
+            await asyncio.sleep(self.poll_seconds)
+
+    async def _lease_keeper(self) -> None:
+        while True:
+            try:
+                if self._busy:
+                    await run_in_threadpool(_renew_leases, sorted(self._busy.values()))
+                requeued = await run_in_threadpool(_requeue_expired_jobs, self.lease_seconds)
+                if requeued:
+                    logger.info("Requeued %s import job(s) with an expired lease", requeued)
+            except Exception:
+                logger.exception("Import lease keeper failed")
+            await asyncio.sleep(self.lease_seconds / 4)
+
+
+import_worker_pool = ImportWorkerPool(
+    size=settings.import_workers,
+    poll_seconds=settings.import_poll_seconds,
+    lease_seconds=settings.import_lease_seconds,
+    shutdown_seconds=settings.import_shutdown_seconds,
+)
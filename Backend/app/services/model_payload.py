@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Pages are judged on a small grayscale render.
+PAGE_THUMB_SCALE = 0.25
+# A page counts as blank when fewer than this share of its pixels is darker than near-white.
+# Kept low on purpose: a single short line of text must not read as blank.
+BLANK_INK_RATIO = 0.0002
+NEAR_WHITE = 230
+
+
+@dataclass
+class ModelFile:
+    """What actually goes to the model for a native (PDF/image) upload."""
+
+    mime: str
+    data: bytes
+    original_bytes: int
+
+
+def shrink_image(raw: bytes) -> bytes | None:
+    """Downscale to settings.model_image_max_side and recompress as JPEG; None if that doesn't help."""
+
+    with Image.open(io.BytesIO(raw)) as img:
+        img = ImageOps.exif_transpose(img)
+        if img.mode in ("RGBA", "LA", "P"):
+            img = img.convert("RGBA")
+            background = Image.new("RGB", img.size, "white")
+            background.paste(img, mask=img.getchannel("A"))
+            img = background
+        elif img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+
+        side = settings.model_image_max_side
+        img.thumbnail((side, side), Image.Resampling.LANCZOS)
+        out = io.BytesIO()
+        img.save(out, "JPEG", quality=settings.model_image_quality, optimize=True)
+
+    data = out.getvalue()
+    return data if len(data) < len(raw) else None
+
+
+def _is_blank(thumb: Image.Image) -> bool:
+    histogram = thumb.histogram()
+    ink = sum(histogram[:NEAR_WHITE])
+    return ink < BLANK_INK_RATIO * thumb.width * thumb.height
+
+
+def shrink_pdf(raw: bytes) -> bytes | None:
+    """Drop blank and repeated pages and rebuild the file from the kept pages only.
+
+    Rebuilding leaves document-level baggage behind (attachments, JavaScript, outlines,
+    metadata, page thumbnails); page content, scanned images included, is kept as is.
+    Returns None when nothing was gained.
+    """
+
+    import pypdfium2 as pdfium
+
+    src = pdfium.PdfDocument(raw)
+    page_count = len(src)
+    try:
+        keep: list[int] = []
+        seen: set[str] = set()
+        for index in range(page_count):
+            page = src[index]
+            text = page.get_textpage().get_text_bounded().strip()
+            thumb = page.render(scale=PAGE_THUMB_SCALE, grayscale=True).to_pil().convert("L")
+            if not text and _is_blank(thumb):
+                continue
+            # Text pages compare by text; scans only when their renders are identical.
+            signature = hashlib.sha1(text.encode("utf-8") if text else thumb.tobytes()).hexdigest()
+            if signature in seen:
+                continue
+            seen.add(signature)
+            keep.append(index)
+
+        if not keep:
+            return None
+
+        dst = pdfium.PdfDocument.new()
+        dst.import_pages(src, keep)
+        out = io.BytesIO()
+        dst.save(out)
+        dst.close()
+    finally:
+        src.close()
+
+    data = out.getvalue()
+    # Fewer pages means fewer tokens even if the rebuilt file isn't smaller.
+    if len(keep) < page_count or len(data) < len(raw):
+        return data
+    return None
+
+
+def prepare_model_file(path: str, mime: str) -> ModelFile:
+    """Read a native upload and shrink it for the model, falling back to the original bytes."""
+
+    raw = Path(path).read_bytes()
+    data = None
+    try:
+        if mime == "application/pdf":
+            data = shrink_pdf(raw)
+        elif mime.startswith("image/"):
+            data = shrink_image(raw)
+            if data is not None:
+                mime = "image/jpeg"
+    except Exception:
+        # A file we can't shrink may still be readable by the model; send it untouched.
+        logger.warning("Could not shrink %s; sending it unchanged", path, exc_info=True)
+        data = None
+
+    return ModelFile(mime=mime, data=data if data is not None else raw, original_bytes=len(raw))
@@ -1,80 +1,176 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+import logging
 import mimetypes
-from pathlib import Path
+import random
+import time
 
-from openai import OpenAI
-from docling.document_converter import DocumentConverter
+import httpx
+from openai import APIConnectionError, APIStatusError, AsyncOpenAI, InternalServerError, RateLimitError
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
+from app.services.model_payload import ModelFile, prepare_model_file
 
+logger = logging.getLogger(__name__)
 
-def _file_to_data_url(path: str) -> tuple[str, str]:
-    p = Path(path)
-    mime, _ = mimetypes.guess_type(str(p))
-    mime = mime or "application/octet-stream"
-    raw = p.read_bytes()
-    b64 = base64.b64encode(raw).decode("utf-8")
-    return mime, f"data:{mime};base64,{b64}"
+IMAGE_MIMES = ["image/png", "image/jpeg", "image/webp", "image/gif"]
 
 
-def _client() -> OpenAI:
+def guess_mime(path: str) -> str:
+    mime, _ = mimetypes.guess_type(path)
+    return mime or "application/octet-stream"
+
+
+def needs_conversion(path: str) -> bool:
+    """Whether the model can't read the file natively and it must go through Docling first."""
+    mime = guess_mime(path)
+    return mime != "application/pdf" and mime not in IMAGE_MIMES
+
+
+def _data_url(model_file: ModelFile) -> str:
+    b64 = base64.b64encode(model_file.data).decode("utf-8")
+    return f"data:{model_file.mime};base64,{b64}"
+
+
+_client: AsyncOpenAI | None = None
+
+
+def get_client() -> AsyncOpenAI:
+    """The process-wide client: one keep-alive connection pool (and TLS session) for every import."""
+
+    global _client
     if not settings.openrouter_api_key:
         raise RuntimeError("OPENROUTER_API_KEY not configured")
 
-    return OpenAI(
-        base_url="https://openrouter.ai/api/v1",
-        api_key=settings.openrouter_api_key,
-        default_headers={
-            # optional, helps OpenRouter analytics
-            "HTTP-Referer": "https://meubolso.local",
-            "X-Title": "MeuBolso",
-        },
+    if _client is None:
+        _client = AsyncOpenAI(
+            base_url=settings.openrouter_base_url,
+            api_key=settings.openrouter_api_key,
+            default_headers={
+                # optional, helps OpenRouter analytics
+                "HTTP-Referer": "https://meubolso.local",
+                "X-Title": "MeuBolso",
+            },
+            # Retries are ours (see _create_with_retries) so every attempt can be timed.
+            max_retries=0,
+            http_client=httpx.AsyncClient(
+                timeout=httpx.Timeout(settings.openrouter_read_timeout, connect=settings.openrouter_connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=settings.openrouter_max_connections,
+                    max_keepalive_connections=settings.openrouter_max_connections,
+                ),
+            ),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+def _retry_delay(attempt: int, error: Exception) -> float:
+    # Honour Retry-After on 429s; otherwise full jitter so parallel imports don't retry in step.
+    if isinstance(error, APIStatusError):
+        retry_after = error.response.headers.get("retry-after")
+        if retry_after and retry_after.replace(".", "", 1).isdigit():
+            return min(float(retry_after), settings.openrouter_backoff_max_seconds)
+    cap = min(settings.openrouter_backoff_max_seconds, settings.openrouter_backoff_seconds * 2**attempt)
+    return random.uniform(0, cap)
+
+
+def _is_retryable(error: Exception) -> bool:
+    # APIConnectionError includes APITimeoutError.
+    return isinstance(error, (RateLimitError, InternalServerError, APIConnectionError)) or (
+        isinstance(error, APIStatusError) and error.status_code >= 500
     )
 
 
-def chat_completions_with_file(*, model: str, prompt: str, file_path: str, filename: str, tools: list[dict] | None = None) -> dict:
-    """Call OpenRouter Chat Completions (OpenAI-compatible) sending a local file as a base64 data URL."""
-
-    mime, data_url = _file_to_data_url(file_path)
+async def _create_with_retries(kwargs: dict, attempts: list[dict]) -> dict:
+    client = get_client()
+    attempt = 0
+    while True:
+        attempt += 1
+        started = time.perf_counter()
+        try:
+            resp = await client.chat.completions.create(**kwargs)
+        except Exception as e:
+            elapsed = time.perf_counter() - started
+            status = getattr(e, "status_code", None)
+            attempts.append({"attempt": attempt, "seconds": round(elapsed, 3), "status": status, "error": type(e).__name__})
+            if not _is_retryable(e) or attempt > settings.openrouter_max_retries:
+                # A failed import still records what it tried.
+                e.attempts = attempts
+                raise
+            delay = _retry_delay(attempt - 1, e)
+            logger.warning(
+                "OpenRouter attempt %s failed after %.2fs (%s); retrying in %.2fs", attempt, elapsed, type(e).__name__, delay
+            )
+            await asyncio.sleep(delay)
+        else:
+            attempts.append({"attempt": attempt, "seconds": round(time.perf_counter() - started, 3), "status": 200})
+            # OpenAI SDK returns a Pydantic-ish object, but `.model_dump()` gives us a plain dict.
+            return resp.model_dump()
+
+
+async def chat_completions_with_file(
+    *,
+    model: str,
+    prompt: str,
+    file_path: str,
+    filename: str,
+    tools: list[dict] | None = None,
+    document_markdown: str | None = None,
+    model_file: ModelFile | None = None,
+) -> dict:
+    """Call OpenRouter Chat Completions (OpenAI-compatible) sending a local file as a base64 data URL.
+
+    Files the model can't read natively must be converted beforehand and passed as `document_markdown`.
+    Native files are shrunk first (see model_payload) unless the caller already did and passes `model_file`.
+    The response dict carries an extra `attempts` list with the timing and outcome of each try;
+    when every try fails, the same list is set as `attempts` on the exception raised.
+    """
 
     plugins = None
     content_list = [{"type": "text", "text": prompt}]
 
-    # 1. Native PDF support
-    if mime == "application/pdf":
-        # OpenRouter plugin to control PDF engine when desired
-        plugins = [
-            {
-                "id": "file-parser",
-                "pdf": {"engine": settings.openrouter_pdf_engine},
-            }
-        ]
-        content_list.append({
-            "type": "file",
-            "file": {"filename": filename, "file_data": data_url},
-        })
-
-    # 2. Native Image support
-    elif mime in ["image/png", "image/jpeg", "image/webp", "image/gif"]:
-        content_list.append({
-             "type": "image_url",
-             "image_url": {"url": data_url},
-        })
-
-    # 3. Fallback: Docling for everything else
+    # 1. Converted document (Docling runs in its own process pool, see docling_pool)
+    if document_markdown is not None:
+        content_list[0]["text"] += f"\n\n--- Document Content ({filename}) ---\n{document_markdown}"
+
+    elif needs_conversion(file_path):
+        raise RuntimeError(f"{filename} must be converted to markdown before sending")
+
     else:
-        # Convert file to markdown using Docling
-        try:
-            converter = DocumentConverter()
-            result = converter.convert(file_path)
-            markdown = result.document.export_to_markdown()
-            
-            # Add to prompt text
-            content_list[0]["text"] += f"\n\n--- Document Content ({filename}) ---\n{markdown}"
-        except Exception as e:
-            raise RuntimeError(f"Failed to process file with Docling: {e}")
+        if model_file is None:
+            model_file = await run_in_threadpool(prepare_model_file, file_path, guess_mime(file_path))
+        mime, data_url = model_file.mime, _data_url(model_file)
+
+        # 2. Native PDF support
+        if mime == "application/pdf":
+            # OpenRouter plugin to control PDF engine when desired
+            plugins = [
+                {
+                    "id": "file-parser",
+                    "pdf": {"engine": settings.openrouter_pdf_engine},
+                }
+            ]
+            content_list.append({
+                "type": "file",
+                "file": {"filename": filename, "file_data": data_url},
+            })
+
+        # 3. Native Image support
+        else:
+            content_list.append({
+                 "type": "image_url",
+                 "image_url": {"url": data_url},
+            })
 
     messages: list[dict] = [
         {
@@ -88,16 +184,15 @@ def chat_completions_with_file(*, model: str, prompt: str, file_path: str, filen
         "messages": messages,
     }
 
-    # OpenRouter supports `plugins` as an extra top-level parameter.
+    # OpenRouter supports `plugins` as an extra top-level parameter (the SDK only passes it via extra_body).
     if plugins:
-        kwargs["plugins"] = plugins
+        kwargs["extra_body"] = {"plugins": plugins}
 
     if tools:
         kwargs["tools"] = tools
         kwargs["tool_choice"] = "auto"
 
-    client = _client()
-
-    # OpenAI SDK returns a Pydantic-ish object, but `.model_dump()` gives us a plain dict.
-    resp = client.chat.completions.create(**kwargs)
-    return resp.model_dump()
+    attempts: list[dict] = []
+    resp = await _create_with_retries(kwargs, attempts)
+    resp["attempts"] = attempts
+    return resp
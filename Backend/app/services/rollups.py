@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import date
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.monthly_rollup import MonthlyRollup
+from app.models.transaction import Transaction
+
+# (user_id, year, month, type, category, tag) -> [total, count]
+RollupKey = tuple[int, int, int, str, str, str]
+Deltas = dict[RollupKey, list]
+
+BUCKET_COLUMNS = ("user_id", "year", "month", "type", "category", "tag")
+
+
+def rollup_key(*, user_id: int, tx_date: date, type: str, category: str, tag: str | None) -> RollupKey:
+    return (user_id, tx_date.year, tx_date.month, type, category, tag or "")
+
+
+def add_delta(deltas: Deltas, key: RollupKey, amount: float, count: int) -> None:
+    bucket = deltas.setdefault(key, [0.0, 0])
+    bucket[0] += amount
+    bucket[1] += count
+
+
+def add_transaction_delta(deltas: Deltas, tx: Transaction, sign: int) -> None:
+    key = rollup_key(user_id=tx.user_id, tx_date=tx.date, type=tx.type, category=tx.category, tag=tx.tag)
+    add_delta(deltas, key, sign * float(tx.amount), sign)
+
+
+def add_row_deltas(deltas: Deltas, rows: Iterable[dict], sign: int = 1) -> None:
+    for r in rows:
+        key = rollup_key(user_id=r["user_id"], tx_date=r["date"], type=r["type"], category=r["category"], tag=r["tag"])
+        add_delta(deltas, key, sign * float(r["amount"]), sign)
+
+
+def _upsert(db: Session):
+    table = MonthlyRollup.__table__
+    if db.get_bind().dialect.name == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+        stmt = mysql_insert(table)
+        return stmt.on_duplicate_key_update(
+            total=table.c.total + stmt.inserted.total,
+            tx_count=table.c.tx_count + stmt.inserted.tx_count,
+        )
+
+    from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+    stmt = sqlite_insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=list(BUCKET_COLUMNS),
+        set_={"total": table.c.total + stmt.excluded.total, "tx_count": table.c.tx_count + stmt.excluded.tx_count},
+    )
+
+
+def apply_deltas(db: Session, deltas: Deltas) -> None:
+    """Add the deltas to their buckets in the caller's transaction (no commit)."""
+
+    params = [
+        dict(zip(BUCKET_COLUMNS, key), total=round(total, 2), tx_count=count)
+        for key, (total, count) in deltas.items()
+        if count or round(total, 2)
+    ]
+    if not params:
+        return
+
+    db.execute(_upsert(db), params)
+
+    # Buckets whose last transaction moved away would otherwise linger as zero rows.
+    user_ids = {p["user_id"] for p in params if p["tx_count"] < 0}
+    if user_ids:
+        db.execute(delete(MonthlyRollup).where(MonthlyRollup.user_id.in_(user_ids), MonthlyRollup.tx_count <= 0))
+
+
+def _grouped_transactions(*criteria):
+    year = func.extract("year", Transaction.date)
+    month = func.extract("month", Transaction.date)
+    tag = func.coalesce(Transaction.tag, "")
+    return (
+        select(
+            Transaction.user_id,
+            year.label("year"),
+            month.label("month"),
+            Transaction.type,
+            Transaction.category,
+            tag.label("tag"),
+            func.sum(Transaction.amount).label("total"),
+            func.count().label("tx_count"),
+        )
+        .where(*criteria)
+        .group_by(Transaction.user_id, year, month, Transaction.type, Transaction.category, tag)
+    )
+
+
+def _user_criteria(column, user_id: int | None) -> tuple:
+    return () if user_id is None else (column == user_id,)
+
+
+def apply_import_deltas(db: Session, import_id: int, sign: int) -> None:
+    """Roll up (or back out) every row of an import with one grouped read."""
+
+    deltas: Deltas = {}
+    for row in db.execute(_grouped_transactions(Transaction.import_id == import_id)).all():
+        key = (row.user_id, int(row.year), int(row.month), row.type, row.category, row.tag)
+        add_delta(deltas, key, sign * float(row.total or 0), sign * row.tx_count)
+    apply_deltas(db, deltas)
+
+
+def rebuild_rollups(db: Session, user_id: int | None = None) -> int:
+    """Recompute buckets from `transactions` (backfill, or repair after check_rollups finds drift)."""
+
+    db.execute(delete(MonthlyRollup).where(*_user_criteria(MonthlyRollup.user_id, user_id)))
+
+    grouped = _grouped_transactions(*_user_criteria(Transaction.user_id, user_id))
+    res = db.execute(insert(MonthlyRollup).from_select([*BUCKET_COLUMNS, "total", "tx_count"], grouped))
+    db.commit()
+    return res.rowcount
+
+
+def check_rollups(db: Session, user_id: int | None = None) -> list[dict]:
+    """Return the buckets where the rollup disagrees with `transactions`."""
+
+    expected = {
+        (r.user_id, int(r.year), int(r.month), r.type, r.category, r.tag): (round(float(r.total or 0), 2), r.tx_count)
+        for r in db.execute(_grouped_transactions(*_user_criteria(Transaction.user_id, user_id))).all()
+    }
+
+    q = select(MonthlyRollup).where(*_user_criteria(MonthlyRollup.user_id, user_id))
+    actual = {
+        (r.user_id, r.year, r.month, r.type, r.category, r.tag): (round(float(r.total), 2), r.tx_count)
+        for r in db.scalars(q).all()
+    }
+
+    mismatches = []
+    for key in expected.keys() | actual.keys():
+        if expected.get(key) != actual.get(key):
+            mismatches.append(
+                {"bucket": dict(zip(BUCKET_COLUMNS, key)), "expected": expected.get(key), "actual": actual.get(key)}
+            )
+    return mismatches
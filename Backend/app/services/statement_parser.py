@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import re
+import unicodedata
+from pathlib import Path
+
+import pandas as pd
+
+TABLE_EXTENSIONS = {".csv", ".xlsx", ".xlsm"}
+
+# Normalized header aliases per column role. Checked in this order, so the
+# more specific debit/credit names win over the generic "valor".
+ROLE_ALIASES: dict[str, tuple[str, ...]] = {
+    "debit": ("debito", "debitos", "valor debito", "debit", "saida", "saidas", "withdrawal"),
+    "credit": ("credito", "creditos", "valor credito", "credit", "entrada", "entradas", "deposit"),
+    "date": ("data", "date", "dt", "data lancamento", "data movimento", "data transacao", "data da transacao"),
+    "description": (
+        "descricao", "description", "historico", "lancamento", "memo", "detalhes",
+        "estabelecimento", "title", "titulo", "identificacao",
+    ),
+    "amount": ("valor", "amount", "value", "quantia", "montante"),
+    "category": ("categoria", "category"),
+}
+
+DATE_FORMATS = ("%d/%m/%Y", "%d/%m/%y", "%Y-%m-%d", "%d-%m-%Y", "%d.%m.%Y", "%Y/%m/%d")
+
+BR_NUMBER = str.maketrans({".": None, ",": "."})
+
+HEADER_SCAN_ROWS = 30
+SAMPLE_BYTES = 64 * 1024
+MIN_DATE_HIT_RATE = 0.9
+
+
+def _normalize(name: object) -> str:
+    text = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+
+def _role_of(name: object) -> str | None:
+    norm = _normalize(name)
+    if not norm:
+        return None
+    for role, aliases in ROLE_ALIASES.items():
+        for alias in aliases:
+            if norm == alias or norm.startswith(alias + " "):
+                return role
+    return None
+
+
+def _read_raw(file_path: str, ext: str) -> pd.DataFrame:
+    if ext != ".csv":
+        return pd.read_excel(file_path, header=None, dtype=object, engine="openpyxl")
+
+    with open(file_path, "rb") as f:
+        head = f.read(SAMPLE_BYTES)
+    for encoding in ("utf-8-sig", "cp1252"):
+        try:
+            # Not final: a multibyte character cut at the end of the sample is held back, not an error.
+            sample = codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        raise ValueError("Unknown encoding")
+
+    try:
+        sep = csv.Sniffer().sniff(sample, delimiters=";,\t|").delimiter
+    except csv.Error:
+        sep = ";" if sample.count(";") > sample.count(",") else ","
+
+    # Preamble lines (account, agency...) are shorter than the table, so the
+    # width has to come from the widest line rather than the first one.
+    width = max((line.count(sep) for line in sample.splitlines()), default=0) + 1
+
+    return pd.read_csv(
+        file_path,
+        sep=sep,
+        header=None,
+        names=range(width),
+        dtype=str,
+        encoding=encoding,
+        skip_blank_lines=True,
+        on_bad_lines="skip",
+        engine="c",
+    )
+
+
+def _find_header(raw: pd.DataFrame) -> tuple[int, dict[str, int]] | None:
+    for idx in range(min(HEADER_SCAN_ROWS, len(raw))):
+        roles: dict[str, int] = {}
+        for col, value in enumerate(raw.iloc[idx].tolist()):
+            if value is None or (isinstance(value, float) and pd.isna(value)):
+                continue
+            role = _role_of(value)
+            if role and role not in roles:
+                roles[role] = col
+
+        has_amount = "amount" in roles or "debit" in roles or "credit" in roles
+        if "date" in roles and "description" in roles and has_amount:
+            return idx, roles
+    return None
+
+
+def _is_str(s: pd.Series) -> pd.Series:
+    kind = pd.api.types.infer_dtype(s, skipna=True)
+    if kind == "string":
+        return s.notna()
+    if kind in ("floating", "integer", "mixed-integer-float", "datetime", "date", "empty"):
+        return pd.Series(False, index=s.index)
+    return s.map(lambda v: isinstance(v, str))
+
+
+def _parse_amounts(s: pd.Series) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype(float)
+
+    is_str = _is_str(s)
+    numeric = pd.to_numeric(s.where(~is_str), errors="coerce").astype(float)
+    if not is_str.any():
+        return numeric
+
+    text = s.where(is_str).astype(object)
+    # Drop currency symbols and spaces first so "R$ -12,50" and "-R$ 12,50" both read as negative.
+    text = text.str.replace(r"[^\d,.()+-]", "", regex=True)
+    negative = text.str.contains(r"^[-(]|-$", regex=True).fillna(False).astype(bool)
+    text = text.str.replace(r"[^\d,.]", "", regex=True)
+
+    # Brazilian exports use "1.234,56"; anything ending in ",dd" decides the column.
+    if text.str.contains(r",\d{1,2}$", regex=True).fillna(False).astype(bool).any():
+        text = text.str.translate(BR_NUMBER)
+    else:
+        text = text.str.replace(",", "", regex=False)
+
+    parsed = pd.to_numeric(text, errors="coerce").astype(float)
+    parsed = parsed.where(~negative, -parsed)
+    return numeric.fillna(parsed)
+
+
+def _parse_dates(s: pd.Series) -> pd.Series | None:
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s
+
+    is_str = _is_str(s)
+    native = pd.to_datetime(s.where(~is_str), errors="coerce")
+    present = int(is_str.sum())
+    if not present:
+        return native
+    text = s.where(is_str).astype(object).str.strip().str.slice(0, 10)
+
+    best: pd.Series | None = None
+    best_hits = -1
+    for fmt in DATE_FORMATS:
+        parsed = pd.to_datetime(text, format=fmt, errors="coerce")
+        hits = int(parsed.notna().sum())
+        if hits > best_hits:
+            best, best_hits = parsed, hits
+
+    if best_hits < present * MIN_DATE_HIT_RATE:
+        return None
+    return native.fillna(best)
+
+
+def parse_statement_table(file_path: str, filename: str) -> list[dict] | None:
+    """Parse a bank CSV/XLSX export without the model.
+
+    Returns items shaped like the `create_transactions` tool arguments, or None
+    when the layout is not recognised and the caller should fall back to the LLM.
+    """
+
+    ext = Path(filename).suffix.lower()
+    if ext not in TABLE_EXTENSIONS:
+        return None
+
+    try:
+        raw = _read_raw(file_path, ext)
+    except Exception:
+        return None
+
+    found = _find_header(raw)
+    if found is None:
+        return None
+    header_idx, roles = found
+
+    body = raw.iloc[header_idx + 1:]
+    if body.empty:
+        return None
+
+    dates = _parse_dates(body[roles["date"]])
+    if dates is None:
+        return None
+
+    if "debit" in roles or "credit" in roles:
+        debit = _parse_amounts(body[roles["debit"]]).abs() if "debit" in roles else pd.Series(float("nan"), index=body.index)
+        credit = _parse_amounts(body[roles["credit"]]).abs() if "credit" in roles else pd.Series(float("nan"), index=body.index)
+        is_expense = debit.fillna(0) > 0
+        amounts = debit.where(is_expense, credit)
+    else:
+        signed = _parse_amounts(body[roles["amount"]])
+        # Without negatives the file is a card bill, where every line is a charge.
+        is_expense = signed < 0 if (signed < 0).any() else signed.notna()
+        amounts = signed.abs()
+
+    description = body[roles["description"]].astype(object).where(lambda d: d.notna(), "(import)").astype(str).str.strip()
+    if "category" in roles:
+        category = body[roles["category"]].astype(object).where(lambda c: c.notna(), "Outros").astype(str).str.strip()
+    else:
+        category = pd.Series("Outros", index=body.index, dtype=object)
+
+    keep = dates.notna() & amounts.notna() & (amounts > 0)
+    keep &= ~description.str.match(r"(?i)saldo")
+    if not keep.any():
+        return None
+
+    columns = {
+        "description": description[keep].str.slice(0, 255).tolist(),
+        "amount": amounts[keep].round(2).tolist(),
+        "type": is_expense[keep].map({True: "EXPENSE", False: "INCOME"}).tolist(),
+        "category": category[keep].str.slice(0, 80).tolist(),
+        "date": dates[keep].dt.strftime("%Y-%m-%d").tolist(),
+    }
+    # Plain zip over lists: DataFrame.to_dict("records") is several times slower here.
+    return [
+        {"description": d, "amount": a, "type": t, "category": c, "tag": None, "date": dt, "isRecurring": False}
+        for d, a, t, c, dt in zip(*columns.values())
+    ]
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Protocol
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+
+class CacheBackend(Protocol):
+    evictions: int
+    # Does file/network IO: the async helpers on StatsCache move its calls off the event loop.
+    blocking: bool
+
+    def get(self, key: str) -> Any | None: ...
+
+    def set(self, key: str, value: Any, ttl: float) -> None: ...
+
+    def counter(self, key: str) -> int: ...
+
+    def incr(self, key: str) -> int: ...
+
+    def size(self) -> int: ...
+
+
+class MemoryCacheBackend:
+    """LRU with per-entry TTL, private to the process."""
+
+    blocking = False
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.evictions += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = self._counters.get(key, 0) + 1
+            self._counters[key] = value
+            return value
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """Same contract backed by a local SQLite file, so every uvicorn worker on the host shares
+    entries and user versions. A stand-in for Redis/memcached on single-host deploys."""
+
+    blocking = True
+
+    def __init__(self, path: str, max_entries: int) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT, expires_at REAL, used_at REAL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_entries_used_at ON entries (used_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS counters (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Any | None:
+        conn = self._conn()
+        now = time.time()
+        row = conn.execute("SELECT value, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] < now:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self.evictions += 1
+            return None
+        conn.execute("UPDATE entries SET used_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        conn = self._conn()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (key, value, expires_at, used_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), now + ttl, now),
+        )
+        overflow = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY used_at LIMIT ?)", (overflow,)
+            )
+            self.evictions += overflow
+
+    def counter(self, key: str) -> int:
+        row = self._conn().execute("SELECT value FROM counters WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def incr(self, key: str) -> int:
+        conn = self._conn()
+        conn.execute(
+            "INSERT INTO counters (key, value) VALUES (?, 1) ON CONFLICT(key) DO UPDATE SET value = value + 1", (key,)
+        )
+        return self.counter(key)
+
+    def size(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+class StatsCache:
+    """Response cache for the stats endpoints.
+
+    Keys embed a per-user data version that every write bumps, so stale entries are never
+    read again and simply age out; nothing has to be scanned on invalidation. A miss hands
+    back its key and the caller stores the result under it: the version is read once, before
+    the query, so a write committed in between leaves the result under the old version.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl_seconds: float, enabled: bool = True) -> None:
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, name: str, user_id: int, params: dict) -> str:
+        version = self.backend.counter(f"user-version:{user_id}")
+        suffix = "&".join(f"{k}={params[k]}" for k in sorted(params))
+        return f"{name}:{user_id}:v{version}:{suffix}"
+
+    def get(self, name: str, user_id: int, **params) -> tuple[Any | None, str | None]:
+        """Return (value, key); on a miss, pass the key to `set` along with the fresh result."""
+        if not self.enabled:
+            return None, None
+        key = self._key(name, user_id, params)
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value, key
+
+    def set(self, key: str | None, value: Any) -> None:
+        if self.enabled and key is not None:
+            self.backend.set(key, value, self.ttl_seconds)
+
+    def bump(self, user_id: int) -> None:
+        """Call after committing any write to the user's transactions."""
+        self.backend.incr(f"user-version:{user_id}")
+
+    # The routes on the asyncio engine run their queries on the event loop (db.run_sync); these
+    # keep a blocking backend's IO off it.
+    async def _offload(self, fn, *args, **kwargs):
+        if self.backend.blocking:
+            return await run_in_threadpool(fn, *args, **kwargs)
+        return fn(*args, **kwargs)
+
+    async def get_async(self, name: str, user_id: int, **params) -> tuple[Any | None, str | None]:
+        if not self.enabled:
+            return None, None
+        return await self._offload(self.get, name, user_id, **params)
+
+    async def set_async(self, key: str | None, value: Any) -> None:
+        if self.enabled and key is not None:
+            await self._offload(self.set, key, value)
+
+    async def bump_async(self, user_id: int) -> None:
+        await self._offload(self.bump, user_id)
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.backend.evictions,
+            "entries": self.backend.size(),
+        }
+
+
+def _build_backend() -> CacheBackend:
+    if settings.stats_cache_backend == "sqlite":
+        return SQLiteCacheBackend(settings.stats_cache_path, settings.stats_cache_max_entries)
+    return MemoryCacheBackend(settings.stats_cache_max_entries)
+
+
+stats_cache = StatsCache(
+    _build_backend(),
+    ttl_seconds=settings.stats_cache_ttl_seconds,
+    enabled=settings.stats_cache_ttl_seconds > 0,
+)
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import uuid
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.transaction import Transaction
+from app.schemas.transactions import BatchItemResult, BatchOperation, TransactionBatchOut, TransactionOut
+from app.services.rollups import add_row_deltas, apply_deltas
+
+# Bounds IN (...) lists and executemany batches.
+CHUNK_SIZE = 1000
+
+# TransactionUpdate / TransactionBase field -> transactions column
+FIELD_COLUMNS = {
+    "description": "description",
+    "amount": "amount",
+    "type": "type",
+    "category": "category",
+    "tag": "tag",
+    "date": "date",
+    "isRecurring": "is_recurring",
+}
+ROW_COLUMNS = (
+    Transaction.id,
+    Transaction.user_id,
+    Transaction.description,
+    Transaction.amount,
+    Transaction.type,
+    Transaction.category,
+    Transaction.tag,
+    Transaction.date,
+    Transaction.is_recurring,
+)
+
+
+def _chunks(items: list) -> list[list]:
+    return [items[i:i + CHUNK_SIZE] for i in range(0, len(items), CHUNK_SIZE)]
+
+
+def _parse_id(raw: str) -> int | None:
+    try:
+        return int(raw)
+    except ValueError:
+        return None
+
+
+def _out(row: dict) -> TransactionOut:
+    return TransactionOut(
+        id=str(row["id"]),
+        userId=str(row["user_id"]),
+        description=row["description"],
+        amount=float(row["amount"]),
+        type=row["type"],
+        category=row["category"],
+        date=row["date"],
+        isRecurring=row["is_recurring"],
+        tag=row["tag"],
+    )
+
+
+def _load_rows(db: Session, user_id: int, ids: list[int]) -> dict[int, dict]:
+    # One locking read per chunk; another user's ids simply don't come back.
+    rows: dict[int, dict] = {}
+    for chunk in _chunks(ids):
+        q = select(*ROW_COLUMNS).where(Transaction.id.in_(chunk), Transaction.user_id == user_id).with_for_update()
+        for row in db.execute(q).mappings():
+            rows[row["id"]] = dict(row)
+    return rows
+
+
+def _write_updates(db: Session, changes: dict[int, dict], now: datetime) -> None:
+    """Rows getting the same new values share one UPDATE ... WHERE id IN (...); the rest go
+    out as one executemany per set of changed columns."""
+
+    by_values: dict[tuple, list[int]] = defaultdict(list)
+    for tx_id, values in changes.items():
+        by_values[tuple(sorted(values.items()))].append(tx_id)
+
+    singles: dict[tuple, list[dict]] = defaultdict(list)
+    for values, ids in by_values.items():
+        if len(ids) == 1:
+            singles[tuple(column for column, _ in values)].append({"b_id": ids[0], **{f"b_{c}": v for c, v in values}})
+            continue
+        for chunk in _chunks(ids):
+            db.execute(update(Transaction).where(Transaction.id.in_(chunk)).values({**dict(values), "updated_at": now}))
+
+    table = Transaction.__table__
+    for columns, params in singles.items():
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values({**{c: bindparam(f"b_{c}") for c in columns}, "updated_at": now})
+        )
+        for chunk in _chunks(params):
+            db.execute(stmt, chunk)
+
+
+def _insert_rows(db: Session, rows: list[dict]) -> list[int]:
+    table = Transaction.__table__
+    if db.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+        stmt = insert(table).returning(table.c.id, sort_by_parameter_order=True)
+        return [tx_id for chunk in _chunks(rows) for tx_id in db.scalars(stmt, chunk).all()]
+
+    # No RETURNING (MySQL): one multi-row INSERT per chunk, rows tagged with a token for this
+    # batch, then one read of the new ids. Auto-increment ids only grow, so they are all above
+    # the MAX(id) taken first; that bound keeps the read on the primary key, no index needed.
+    token = uuid.uuid4().hex
+    floor = db.scalar(select(func.coalesce(func.max(Transaction.id), 0)))
+    for chunk in _chunks(rows):
+        db.execute(insert(table).values([{**row, "batch_token": token} for row in chunk]))
+    q = select(Transaction.id).where(Transaction.id > floor, Transaction.batch_token == token).order_by(Transaction.id)
+    return list(db.scalars(q).all())
+
+
+def apply_batch(db: Session, user_id: int, operations: list[BatchOperation]) -> TransactionBatchOut:
+    """Apply create/update/delete operations for one user with set-based statements.
+
+    Operations are resolved in order against the rows as they were read, so an update
+    followed by a delete of the same id works as expected. Ids that don't exist or belong
+    to someone else come back as `not_found` and are skipped. Rollups are adjusted in the
+    same transaction; nothing is committed here.
+    """
+
+    referenced = sorted({i for op in operations if op.op != "create" and (i := _parse_id(op.id)) is not None})
+    current = _load_rows(db, user_id, referenced)
+    original = {tx_id: dict(row) for tx_id, row in current.items()}
+
+    now = datetime.utcnow()
+    results: list[BatchItemResult] = []
+    new_rows: list[tuple[BatchItemResult, dict]] = []
+    for index, op in enumerate(operations):
+        if op.op == "create":
+            row = {column: getattr(op.data, field) for field, column in FIELD_COLUMNS.items()}
+            row.update(user_id=user_id, source="manual", created_at=now, updated_at=now)
+            result = BatchItemResult(index=index, op=op.op, status="created")
+            new_rows.append((result, row))
+            results.append(result)
+            continue
+
+        tx_id = _parse_id(op.id)
+        row = current.get(tx_id) if tx_id is not None else None
+        if row is None:
+            results.append(BatchItemResult(index=index, op=op.op, status="not_found", id=op.id))
+            continue
+
+        if op.op == "update":
+            for field, column in FIELD_COLUMNS.items():
+                value = getattr(op.data, field)
+                if value is not None:
+                    row[column] = value
+            results.append(BatchItemResult(index=index, op=op.op, status="updated", id=str(tx_id), transaction=_out(row)))
+        else:
+            current[tx_id] = None
+            results.append(BatchItemResult(index=index, op=op.op, status="deleted", id=str(tx_id)))
+
+    deleted = [tx_id for tx_id, row in current.items() if row is None]
+    changes = {
+        tx_id: {c: row[c] for c in FIELD_COLUMNS.values() if row[c] != original[tx_id][c]}
+        for tx_id, row in current.items()
+        if row is not None
+    }
+    changes = {tx_id: values for tx_id, values in changes.items() if values}
+
+    # Every touched row leaves its old bucket; survivors and new rows enter their new one.
+    deltas: dict = {}
+    add_row_deltas(deltas, [original[tx_id] for tx_id in deleted + list(changes)], -1)
+    add_row_deltas(deltas, [current[tx_id] for tx_id in changes], +1)
+    add_row_deltas(deltas, [row for _, row in new_rows], +1)
+
+    for chunk in _chunks(deleted):
+        db.execute(delete(Transaction).where(Transaction.id.in_(chunk)))
+    if changes:
+        _write_updates(db, changes, now)
+    if new_rows:
+        ids = _insert_rows(db, [row for _, row in new_rows])
+        for (result, row), tx_id in zip(new_rows, ids):
+            result.id = str(tx_id)
+            result.transaction = _out({**row, "id": tx_id})
+    apply_deltas(db, deltas)
+
+    counts = defaultdict(int)
+    for result in results:
+        counts[result.status] += 1
+    return TransactionBatchOut(
+        created=counts["created"],
+        updated=counts["updated"],
+        deleted=counts["deleted"],
+        failed=counts["not_found"],
+        results=results,
+    )
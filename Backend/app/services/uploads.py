@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import dataclass
+from uuid import uuid4
+
+from fastapi import HTTPException, Request, status
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+# Parts of the multipart envelope that are not file content (boundaries, part headers).
+MULTIPART_OVERHEAD = 64 * 1024
+
+# Documents the multipart body for /docs, since the route reads the raw stream itself.
+UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                }
+            }
+        },
+    }
+}
+
+
+@dataclass
+class StoredUpload:
+    filename: str
+    content_type: str
+    path: str
+    size: int
+    sha256: str
+
+
+class _FilePartSink:
+    """multipart callbacks that keep only the wanted file field, hashing it as it arrives."""
+
+    def __init__(self, field_name: str, max_bytes: int) -> None:
+        self.field_name = field_name
+        self.max_bytes = max_bytes
+        self.hasher = hashlib.sha256()
+        self.size = 0
+        self.filename: str | None = None
+        self.content_type = "application/octet-stream"
+        self.pending: list[bytes] = []
+        self.too_large = False
+
+        self._headers: dict[bytes, bytes] = {}
+        self._field = b""
+        self._value = b""
+        self._capturing = False
+        self._done = False
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self) -> None:
+        self._headers = {}
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers[self._field.lower()] = self._value
+        self._field = b""
+        self._value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("latin-1")
+        self._capturing = not self._done and name == self.field_name and b"filename" in options
+        if self._capturing:
+            self.filename = options[b"filename"].decode("utf-8", errors="replace")
+            self.content_type = self._headers.get(b"content-type", b"application/octet-stream").decode("latin-1")
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if not self._capturing or self.too_large:
+            return
+        chunk = data[start:end]
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            self.too_large = True
+            return
+        self.hasher.update(chunk)
+        self.pending.append(chunk)
+
+    def on_part_end(self) -> None:
+        if self._capturing:
+            self._done = True
+        self._capturing = False
+
+
+async def save_multipart_upload(
+    request: Request,
+    *,
+    field_name: str,
+    dest_dir: str,
+    name_prefix: str,
+    max_bytes: int,
+) -> StoredUpload:
+    """Stream one multipart file field straight to disk.
+
+    The body is consumed chunk by chunk, so memory stays flat whatever the upload
+    size; the limit is enforced as bytes arrive and the hash comes out of the same pass.
+    """
+
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected multipart/form-data")
+
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_bytes + MULTIPART_OVERHEAD:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File too large")
+
+    os.makedirs(dest_dir, exist_ok=True)
+    part_path = os.path.join(dest_dir, f".{uuid4().hex}.part")
+
+    sink = _FilePartSink(field_name, max_bytes)
+    parser = MultipartParser(params[b"boundary"], sink.callbacks())
+
+    out = await run_in_threadpool(open, part_path, "wb")
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            if sink.too_large:
+                raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File too large")
+            if sink.pending:
+                data = b"".join(sink.pending)
+                sink.pending.clear()
+                await run_in_threadpool(out.write, data)
+        parser.finalize()
+    except BaseException:
+        out.close()
+        os.remove(part_path)
+        raise
+    out.close()
+
+    if sink.filename is None:
+        os.remove(part_path)
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Missing file field '{field_name}'")
+
+    safe_name = os.path.basename(sink.filename) or "upload"
+    final_path = os.path.join(dest_dir, f"{name_prefix}{uuid4().hex}-{safe_name}")
+    os.replace(part_path, final_path)
+
+    return StoredUpload(
+        filename=safe_name,
+        content_type=sink.content_type,
+        path=final_path,
+        size=sink.size,
+        sha256=sink.hasher.hexdigest(),
+    )
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """The authenticated principal: a plain snapshot of the row, safe to share across requests."""
+
+    id: int
+    name: str
+    email: str
+    role: str
+
+    @classmethod
+    def from_model(cls, user: User) -> CurrentUser:
+        return cls(id=user.id, name=user.name, email=user.email, role=user.role)
+
+
+class UserCache:
+    """Short-TTL principals keyed by user id, private to the process.
+
+    Writes through the ORM invalidate the entry right away (see the mapper events below);
+    the TTL bounds how long another worker process can keep serving a stale role.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[int, tuple[float, CurrentUser]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> CurrentUser | None:
+        item = self._entries.get(user_id)
+        if item is None:
+            return None
+        expires_at, user = item
+        if expires_at < time.monotonic():
+            self.invalidate(user_id)
+            return None
+        return user
+
+    def put(self, user: CurrentUser) -> None:
+        if self.ttl_seconds > 0:
+            with self._lock:
+                self._entries[user.id] = (time.monotonic() + self.ttl_seconds, user)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.user_cache_ttl_seconds)
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user(mapper, connection, target: User) -> None:
+    # Covers the admin create/delete routes and any role change made through a Session. Dropped
+    # now and again after commit, so a request racing the write can't re-cache the old row.
+    user_cache.invalidate(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("stale_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    for user_id in session.info.pop("stale_user_ids", ()):
+        user_cache.invalidate(user_id)
@@ -0,0 +1,123 @@
+"""Compare the threadpool (sync engine) and asyncio (async engine) routes under high concurrency.
+
+Starts uvicorn once per mode against DATABASE_URL, with the stats cache off so every
+request reaches the database, and fires the same read mix at both. Seeds and then removes
+a throwaway user, so point it at a scratch database.
+
+    DATABASE_URL=mysql+pymysql://... python scripts/bench_db_modes.py --concurrency 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import delete, insert
+
+from app.core.db import Base, SessionLocal, engine
+from app.core.security import create_access_token
+from app.models.monthly_rollup import MonthlyRollup
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services.rollups import rebuild_rollups
+import app.models  # noqa: F401
+from scripts.bench_common import client_for, run_load, start_server, stop_server, wait_ready
+
+CATEGORIES = ["Alimentação", "Moradia", "Transporte", "Lazer", "Saúde"]
+
+
+def _seed(rows: int) -> int:
+    with SessionLocal() as db:
+        user = User(name="bench", email=f"bench-{random.randrange(10**9)}@example.invalid", password_hash="!")
+        db.add(user)
+        db.commit()
+        start = date.today() - timedelta(days=365)
+        db.execute(
+            insert(Transaction),
+            [
+                {
+                    "user_id": user.id,
+                    "description": f"row {i}",
+                    "amount": round(random.uniform(1, 500), 2),
+                    "type": "INCOME" if i % 10 == 0 else "EXPENSE",
+                    "category": random.choice(CATEGORIES),
+                    "tag": random.choice([None, "fixo", "extra"]),
+                    "date": start + timedelta(days=random.randrange(365)),
+                    "is_recurring": False,
+                    "source": "manual",
+                }
+                for i in range(rows)
+            ],
+        )
+        db.commit()
+        rebuild_rollups(db, user.id)
+        return user.id
+
+
+def _cleanup(user_id: int) -> None:
+    with SessionLocal() as db:
+        db.execute(delete(Transaction).where(Transaction.user_id == user_id))
+        db.execute(delete(MonthlyRollup).where(MonthlyRollup.user_id == user_id))
+        db.execute(delete(User).where(User.id == user_id))
+        db.commit()
+
+
+async def _run(base_url: str, urls: list[str], token: str, total: int, concurrency: int) -> dict:
+    headers = {"Authorization": f"Bearer {token}"}
+    async with client_for(base_url, concurrency) as client:
+
+        async def send(i: int) -> bool:
+            return (await client.get(urls[i % len(urls)], headers=headers)).status_code == 200
+
+        return await run_load(send, total, concurrency)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=5000, help="transactions seeded for the bench user")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--mode", choices=["sync", "async"], action="append", help="repeatable; default both")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    user_id = _seed(args.rows)
+    token = create_access_token(subject=str(user_id))
+    today = date.today()
+    urls = [
+        f"/api/transactions?userId={user_id}&limit=50",
+        f"/api/stats/dashboard?userId={user_id}&month={today.month}&year={today.year}",
+        f"/api/stats/category-breakdown?userId={user_id}&category={CATEGORIES[0]}",
+    ]
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    results = {}
+    try:
+        for mode in args.mode or ["sync", "async"]:
+            server = start_server(args.port, DB_ASYNC=str(mode == "async").lower(), STATS_CACHE_TTL_SECONDS="0")
+            try:
+                asyncio.run(wait_ready(base_url))
+                # Warm the pools and caches before measuring.
+                asyncio.run(_run(base_url, urls, token, min(args.requests, 200), min(args.concurrency, 20)))
+                results[mode] = asyncio.run(_run(base_url, urls, token, args.requests, args.concurrency))
+            finally:
+                stop_server(server)
+    finally:
+        _cleanup(user_id)
+
+    print(f"{engine.dialect.name}, {args.requests} requests, concurrency {args.concurrency}")
+    print(f"{'mode':<6} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for mode, r in results.items():
+        print(f"{mode:<6} {r['rps']:>9.1f} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['errors']:>7}")
+    return 1 if any(r["errors"] for r in results.values()) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,228 @@
+"""Microbenchmarks for the hot endpoints at growing table sizes, with JSON output.
+
+For each scale, loads a synthetic dataset (scripts/synthetic_data.py) into DATABASE_URL,
+then times the route helpers in-process, without HTTP, against its heaviest user: list
+(first page, a later page, one month), dashboard (one month, all time), category
+breakdown, and the import path (local CSV parse, then the batched insert). The stats
+cache is off, so every call reaches the database. Each dataset is dropped before the next
+scale loads, so use a scratch database.
+
+    DATABASE_URL=sqlite:///./bench.db python scripts/bench_endpoints.py --scales 1k,10k,100k --output before.json
+    python scripts/bench_endpoints.py --compare before.json after.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ["STATS_CACHE_TTL_SECONDS"] = "0"
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.api.routes.stats import _category_breakdown, _dashboard
+from app.api.routes.transactions import _list
+from app.core.db import Base, SessionLocal, engine
+from app.models.import_job import ImportJob
+from app.models.transaction import Transaction
+from app.services.import_service import save_transactions
+from app.services.rollups import apply_import_deltas
+from app.services.statement_parser import parse_statement_table
+import app.models  # noqa: F401
+from scripts.bench_common import percentile
+from scripts.synthetic_data import drop_dataset, generate, parse_count
+
+PAGE = 50
+
+
+def _timed(fn: Callable[[], object], repeat: int, warmup: int, setup: Callable[[], object] | None = None) -> dict:
+    samples = []
+    for i in range(warmup + repeat):
+        arg = setup() if setup else None
+        started = time.perf_counter()
+        fn() if setup is None else fn(arg)
+        elapsed = time.perf_counter() - started
+        if i >= warmup:
+            samples.append(elapsed * 1000)
+    samples.sort()
+    return {
+        "runs": repeat,
+        "min_ms": round(samples[0], 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(percentile(samples, 0.95), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
+
+
+def _list_kwargs(**overrides) -> dict:
+    kwargs = dict(month=None, year=None, category=None, type=None, tag=None, minAmount=None, maxAmount=None, cursor=None, limit=PAGE)
+    kwargs.update(overrides)
+    return kwargs
+
+
+def _statement_csv(path: str, rows: int) -> None:
+    # A layout parse_statement_table recognises (Brazilian bank export: data;descrição;valor).
+    start = date.today() - timedelta(days=90)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(["Data", "Descrição", "Valor"])
+        for i in range(rows):
+            amount = f"{(i % 97) * 13.37 + 1:.2f}".replace(".", ",")
+            writer.writerow([(start + timedelta(days=i % 90)).strftime("%d/%m/%Y"), f"Compra {i}", f"-{amount}"])
+
+
+def _bench_scale(db: Session, user_id: int, args, csv_path: str) -> dict[str, dict]:
+    today = date.today()
+    _, cursor = _list(db, user_id, **_list_kwargs())
+    items = parse_statement_table(csv_path, "extrato.csv") or []
+
+    def insert_import(job_id: int) -> None:
+        save_transactions(db=db, user_id=user_id, items=items, import_id=job_id)
+
+    def new_job() -> int:
+        job = ImportJob(user_id=user_id, filename="bench.csv", content_type="text/csv", file_path=csv_path, file_size=0, status="DONE")
+        db.add(job)
+        db.commit()
+        return job.id
+
+    jobs: list[int] = []
+
+    def setup_insert() -> int:
+        job_id = new_job()
+        jobs.append(job_id)
+        return job_id
+
+    cases: dict[str, tuple] = {
+        "list_transactions": (lambda: _list(db, user_id, **_list_kwargs()),),
+        "list_transactions_page2": (lambda: _list(db, user_id, **_list_kwargs(cursor=cursor)),),
+        "list_transactions_month": (lambda: _list(db, user_id, **_list_kwargs(month=today.month, year=today.year)),),
+        "dashboard_month": (lambda: _dashboard(db, user_id, today.month, today.year),),
+        "dashboard_all_time": (lambda: _dashboard(db, user_id, None, None),),
+        "category_breakdown": (lambda: _category_breakdown(db, user_id, "Alimentação"),),
+        "import_parse": (lambda: parse_statement_table(csv_path, "extrato.csv"),),
+        "import_insert": (insert_import, setup_insert),
+    }
+
+    results = {}
+    try:
+        for name, (fn, *setup) in cases.items():
+            if args.only and name not in args.only:
+                continue
+            results[name] = _timed(fn, args.repeat, args.warmup, setup[0] if setup else None)
+            print(f"  {name}: median {results[name]['median_ms']} ms, p95 {results[name]['p95_ms']} ms", file=sys.stderr)
+    finally:
+        # Back the benchmark imports out the way DELETE /api/imports does.
+        for job_id in jobs:
+            apply_import_deltas(db, job_id, -1)
+            db.execute(delete(Transaction).where(Transaction.import_id == job_id))
+            db.execute(delete(ImportJob).where(ImportJob.id == job_id))
+        db.commit()
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=os.path.dirname(__file__))
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run(args) -> dict:
+    Base.metadata.create_all(engine)
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "dialect": engine.dialect.name,
+            "python": platform.python_version(),
+            "started_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "seed": args.seed,
+            "users": args.users,
+            "years": args.years,
+            "repeat": args.repeat,
+            "import_rows": args.import_rows,
+        },
+        "results": [],
+    }
+
+    with tempfile.TemporaryDirectory() as tmp, SessionLocal() as db:
+        csv_path = os.path.join(tmp, "extrato.csv")
+        _statement_csv(csv_path, args.import_rows)
+        for scale in [parse_count(s) for s in args.scales.split(",")]:
+            drop_dataset(db, args.seed)
+            print(f"scale {scale:,}: loading", file=sys.stderr)
+            started = time.perf_counter()
+            user_ids = generate(db, rows=scale, users=min(args.users, max(1, scale // 100)), years=args.years, seed=args.seed)
+            load_seconds = time.perf_counter() - started
+            user_rows = db.query(Transaction).filter(Transaction.user_id == user_ids[0]).count()
+
+            for name, stats in _bench_scale(db, user_ids[0], args, csv_path).items():
+                report["results"].append({"scale": scale, "user_rows": user_rows, "benchmark": name, **stats})
+            report["results"].append({"scale": scale, "user_rows": user_rows, "benchmark": "load_dataset", "seconds": round(load_seconds, 2)})
+
+        if not args.keep:
+            drop_dataset(db, args.seed)
+    return report
+
+
+def compare(before_path: str, after_path: str) -> int:
+    """Print median changes between two reports; exit 1 if anything got >20% slower."""
+
+    def index(path: str) -> dict:
+        with open(path, encoding="utf-8") as f:
+            return {(r["scale"], r["benchmark"]): r for r in json.load(f)["results"] if "median_ms" in r}
+
+    before, after = index(before_path), index(after_path)
+    regressions = 0
+    for key in sorted(before.keys() & after.keys()):
+        old, new = before[key]["median_ms"], after[key]["median_ms"]
+        change = (new - old) / old * 100 if old else 0.0
+        flag = "  SLOWER" if change > 20 else ""
+        regressions += bool(flag)
+        print(f"{key[0]:>10,} {key[1]:<26} {old:>10.3f} -> {new:>10.3f} ms ({change:+.1f}%){flag}")
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="1k,10k,100k", help="comma-separated total row counts, up to 10m")
+    parser.add_argument("--users", type=int, default=20, help="users per dataset (fewer at tiny scales)")
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=424242)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--import-rows", type=int, default=500, help="rows in the statement used by import_*")
+    parser.add_argument("--only", action="append", help="run just this benchmark (repeatable)")
+    parser.add_argument("--keep", action="store_true", help="leave the last dataset in the database")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="diff two reports and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        return compare(*args.compare)
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+"""Login throughput, and what a login burst does to a cheap endpoint served alongside it.
+
+Starts uvicorn against DATABASE_URL with a fixed bcrypt cost, seeds throwaway users, then
+fires concurrent logins while a second client keeps requesting /api/transactions. Logins
+rejected with 503 (hashing queue full) are reported apart from real errors.
+
+    DATABASE_URL=sqlite:///./bench.db python scripts/bench_login.py --concurrency 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import delete, insert, select
+
+from app.core.db import Base, SessionLocal, engine
+from app.core.security import calibrate_bcrypt_rounds, create_access_token, pwd_context
+from app.models.user import User
+import app.models  # noqa: F401
+from scripts.bench_common import client_for, run_load, start_server, stop_server, wait_ready
+
+PASSWORD = "bench-password"
+
+
+def _seed(users: int, rounds: int) -> tuple[str, list[str]]:
+    # One hash reused for every user: seeding stays fast and every login costs the same.
+    password_hash = pwd_context.handler("bcrypt").using(rounds=rounds).hash(PASSWORD)
+    prefix = f"bench-login-{random.randrange(10**9)}"
+    emails = [f"{prefix}-{i}@example.com" for i in range(users)]
+    with SessionLocal() as db:
+        db.execute(insert(User), [{"name": "bench", "email": e, "password_hash": password_hash} for e in emails])
+        db.commit()
+    return prefix, emails
+
+
+def _cleanup(prefix: str) -> None:
+    with SessionLocal() as db:
+        db.execute(delete(User).where(User.email.like(f"{prefix}-%")))
+        db.commit()
+
+
+async def _measure(base_url: str, emails: list[str], token: str, args) -> dict:
+    rejected = 0
+
+    async with client_for(base_url, args.concurrency) as logins, client_for(base_url, 4) as probes:
+
+        async def login(i: int) -> bool:
+            nonlocal rejected
+            resp = await logins.post("/api/auth/login", json={"email": emails[i % len(emails)], "password": PASSWORD})
+            rejected += resp.status_code == 503
+            return resp.status_code == 200
+
+        async def probe(i: int) -> bool:
+            resp = await probes.get("/api/transactions?limit=20", headers={"Authorization": f"Bearer {token}"})
+            return resp.status_code == 200
+
+        async def probe_while(task: asyncio.Task) -> dict:
+            results = []
+            while not task.done():
+                results.append(await run_load(probe, 20, 4))
+            return results[-1] if results else {}
+
+        login_task = asyncio.create_task(run_load(login, args.logins, args.concurrency))
+        probe_result = await probe_while(login_task)
+        login_result = await login_task
+
+    login_result["rejected_503"] = rejected
+    login_result["errors"] -= rejected
+    return {"login": login_result, "transactions_during_burst": probe_result}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=0, help="bcrypt cost; 0 calibrates like the server does")
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--workers", type=int, default=2, help="BCRYPT_WORKERS for the server")
+    parser.add_argument("--max-pending", type=int, default=16, help="BCRYPT_MAX_PENDING for the server")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    rounds = args.rounds or calibrate_bcrypt_rounds(args.target_ms)
+    Base.metadata.create_all(engine)
+    prefix, emails = _seed(args.users, rounds)
+    with SessionLocal() as db:
+        token = create_access_token(subject=str(db.scalar(select(User.id).where(User.email == emails[0]))))
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = start_server(
+        args.port,
+        BCRYPT_ROUNDS=str(rounds),
+        BCRYPT_WORKERS=str(args.workers),
+        BCRYPT_MAX_PENDING=str(args.max_pending),
+    )
+    try:
+        asyncio.run(wait_ready(base_url))
+        result = asyncio.run(_measure(base_url, emails, token, args))
+    finally:
+        stop_server(server)
+        _cleanup(prefix)
+
+    login, probe = result["login"], result["transactions_during_burst"]
+    print(f"bcrypt cost {rounds}, {args.workers} hashing workers, max pending {args.max_pending}")
+    print(
+        f"login: {login['rps']} req/s, p50 {login['p50_ms']} ms, p99 {login['p99_ms']} ms, "
+        f"503 {login['rejected_503']}, errors {login['errors']}"
+    )
+    if probe:
+        print(f"/api/transactions during the burst: p50 {probe['p50_ms']} ms, p99 {probe['p99_ms']} ms")
+    return 1 if login["errors"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
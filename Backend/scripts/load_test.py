@@ -0,0 +1,355 @@
+"""Replay the frontend's traffic mix against a running app and find where it saturates.
+
+Virtual users behave like the React app: log in, load /me, then move between pages with
+think time in between — dashboard (sometimes drilling into a category), the transactions
+page (every page of the cursor, like api.transactions.list), one month, and now and then a
+create/update/delete or a file import polled until it finishes. Sessions end after a few
+dozen actions and log in again.
+
+Users come from scripts/synthetic_data.py (--seed, --users); pass --dataset-rows to load
+them first. Unless --url is given, the script starts uvicorn (--workers, --env) and a local
+OpenRouter stub (scripts/stub_openrouter.py, --model-latency-ms) itself.
+
+Each --concurrency step runs for --duration seconds. Per endpoint it reports req/s,
+p50/p95/p99 and the error rate; the saturation point is the first step where throughput
+stops growing while latency climbs, or errors pass 1%.
+
+    DATABASE_URL=mysql+pymysql://... python scripts/load_test.py --dataset-rows 1m \\
+        --concurrency 10,50,100,200 --workers 2 --env DB_POOL_SIZE=20 --output run.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import date
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import httpx
+
+from scripts.bench_common import BACKEND_DIR, client_for, percentile, start_server, stop_server, wait_ready
+from scripts.synthetic_data import CATEGORIES, PASSWORD, user_email
+
+# Relative frequency of each page visit / action inside a session.
+DEFAULT_MIX = {
+    "dashboard": 30,
+    "category_drilldown": 12,
+    "transactions": 25,
+    "transactions_month": 15,
+    "create": 8,
+    "update": 4,
+    "delete": 4,
+    "import": 2,
+}
+# Time-to-DONE of an import, from upload to the poll that sees it finished.
+IMPORT_FLOW = "IMPORT upload->DONE"
+
+
+class Recorder:
+    """Latencies and outcomes per endpoint label for one concurrency step."""
+
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.statuses: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def add(self, label: str, seconds: float, status: int | str, ok: bool) -> None:
+        self.latencies[label].append(seconds)
+        self.statuses[label][str(status)] += 1
+        self.errors[label] += not ok
+
+    def summary(self, seconds: float) -> dict:
+        endpoints = {}
+        for label in sorted(self.latencies):
+            values = sorted(self.latencies[label])
+            endpoints[label] = {
+                "requests": len(values),
+                "rps": round(len(values) / seconds, 2),
+                "error_rate": round(self.errors[label] / len(values), 4),
+                "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+                "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+                "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+                "statuses": dict(self.statuses[label]),
+            }
+        http = [x for label, values in self.latencies.items() if label != IMPORT_FLOW for x in values]
+        errors = sum(n for k, n in self.errors.items() if k != IMPORT_FLOW)
+        http.sort()
+        total = {
+            "requests": len(http),
+            "rps": round(len(http) / seconds, 2),
+            "error_rate": round(errors / len(http), 4) if http else 0.0,
+            "p50_ms": round(percentile(http, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(http, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(http, 0.99) * 1000, 2),
+        }
+        return {"seconds": round(seconds, 2), "total": total, "endpoints": endpoints}
+
+
+def _receipt_png() -> bytes:
+    from PIL import Image, ImageDraw
+
+    img = Image.new("RGB", (600, 400), "white")
+    draw = ImageDraw.Draw(img)
+    for i in range(10):
+        draw.text((20, 20 + 35 * i), f"{date.today():%d/%m/%Y}  Compra {i}  R$ {12.5 * (i + 1):.2f}", fill="black")
+    out = io.BytesIO()
+    img.save(out, "PNG")
+    return out.getvalue()
+
+
+class VirtualUser:
+    def __init__(self, n: int, client: httpx.AsyncClient, recorder: Recorder, args, receipt: bytes) -> None:
+        self.rnd = random.Random(f"{args.seed}:{n}")
+        self.client = client
+        self.recorder = recorder
+        self.args = args
+        self.receipt = receipt
+        self.headers: dict[str, str] = {}
+        self.user_id = ""
+        self.created: list[str] = []
+
+    async def call(self, label: str, method: str, url: str, expect: tuple[int, ...] = (200,), **kwargs) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            resp = await self.client.request(method, url, headers=self.headers, **kwargs)
+        except httpx.HTTPError as e:
+            self.recorder.add(label, time.perf_counter() - started, type(e).__name__, ok=False)
+            return None
+        self.recorder.add(label, time.perf_counter() - started, resp.status_code, ok=resp.status_code in expect)
+        return resp if resp.status_code in expect else None
+
+    async def think(self) -> None:
+        if self.args.think_ms > 0:
+            await asyncio.sleep(self.rnd.expovariate(1000 / self.args.think_ms))
+
+    async def login(self) -> bool:
+        self.headers = {}
+        email = user_email(self.args.seed, self.rnd.randrange(self.args.users))
+        resp = await self.call("POST /api/auth/login", "POST", "/api/auth/login", json={"email": email, "password": PASSWORD})
+        if resp is None:
+            return False
+        body = resp.json()
+        self.headers = {"Authorization": f"Bearer {body['token']}"}
+        self.user_id = body["id"]
+        self.created = []
+        await self.call("GET /api/auth/me", "GET", "/api/auth/me")
+        return True
+
+    async def dashboard(self) -> None:
+        await self.call("GET /api/stats/dashboard", "GET", "/api/stats/dashboard", params={"userId": self.user_id})
+
+    async def category_drilldown(self) -> None:
+        await self.dashboard()
+        await self.think()
+        params = {"userId": self.user_id, "category": self.rnd.choice(list(CATEGORIES))}
+        await self.call("GET /api/stats/category-breakdown", "GET", "/api/stats/category-breakdown", params=params)
+
+    async def transactions(self) -> None:
+        # Follows X-Next-Cursor to the end, like api.transactions.list (capped by --max-pages).
+        params = {"userId": self.user_id}
+        pages = 0
+        while True:
+            resp = await self.call("GET /api/transactions", "GET", "/api/transactions", params=params)
+            pages += 1
+            cursor = resp.headers.get("X-Next-Cursor") if resp is not None else None
+            if not cursor or (self.args.max_pages and pages >= self.args.max_pages):
+                return
+            params = {"userId": self.user_id, "cursor": cursor}
+
+    async def transactions_month(self) -> None:
+        today = date.today()
+        params = {"userId": self.user_id, "month": today.month, "year": today.year}
+        await self.call("GET /api/transactions?month", "GET", "/api/transactions", params=params)
+
+    async def create(self) -> None:
+        category = self.rnd.choice(list(CATEGORIES))
+        payload = {
+            "userId": self.user_id,
+            "description": "Load test",
+            "amount": round(self.rnd.uniform(5, 300), 2),
+            "type": CATEGORIES[category][0],
+            "category": category,
+            "date": date.today().isoformat(),
+            "isRecurring": False,
+        }
+        resp = await self.call("POST /api/transactions", "POST", "/api/transactions", json=payload)
+        if resp is not None:
+            self.created.append(resp.json()["id"])
+
+    async def update(self) -> None:
+        if not self.created:
+            return await self.create()
+        tx_id = self.rnd.choice(self.created)
+        payload = {"category": self.rnd.choice(list(CATEGORIES)), "tag": "load-test"}
+        await self.call("PUT /api/transactions/{id}", "PUT", f"/api/transactions/{tx_id}", json=payload)
+
+    async def delete(self) -> None:
+        # Only rows this session created, so the dataset stays the same size.
+        if not self.created:
+            return await self.create()
+        tx_id = self.created.pop()
+        await self.call("DELETE /api/transactions/{id}", "DELETE", f"/api/transactions/{tx_id}")
+
+    async def import_(self) -> None:
+        started = time.perf_counter()
+        files = {"file": ("recibo.png", self.receipt, "image/png")}
+        resp = await self.call(
+            "POST /api/transactions/import", "POST", "/api/transactions/import",
+            expect=(202,), params={"userId": self.user_id}, files=files,
+        )
+        if resp is None:
+            return
+        job_id = resp.json()["id"]
+        while time.perf_counter() - started < self.args.import_timeout:
+            await asyncio.sleep(self.args.poll_ms / 1000)
+            job = await self.call("GET /api/imports/{id}", "GET", f"/api/imports/{job_id}")
+            status = job.json()["status"] if job is not None else "FAILED"
+            if status in ("DONE", "FAILED"):
+                self.recorder.add(IMPORT_FLOW, time.perf_counter() - started, status, ok=status == "DONE")
+                return
+        self.recorder.add(IMPORT_FLOW, time.perf_counter() - started, "timeout", ok=False)
+
+    async def run(self, deadline: float, mix: dict[str, int]) -> None:
+        actions = {name: getattr(self, "import_" if name == "import" else name) for name in mix}
+        names, weights = list(mix), list(mix.values())
+        while time.monotonic() < deadline:
+            if not await self.login():
+                await self.think()
+                continue
+            for _ in range(self.rnd.randint(self.args.session_actions // 2, self.args.session_actions * 3 // 2)):
+                if time.monotonic() >= deadline:
+                    return
+                await self.think()
+                await actions[self.rnd.choices(names, weights)[0]]()
+
+
+async def run_step(base_url: str, concurrency: int, mix: dict[str, int], args, receipt: bytes) -> dict:
+    recorder = Recorder()
+    async with client_for(base_url, concurrency, timeout=args.timeout) as client:
+        started = time.monotonic()
+        deadline = started + args.duration
+        users = [VirtualUser(n, client, recorder, args, receipt) for n in range(concurrency)]
+        await asyncio.gather(*(u.run(deadline, mix) for u in users))
+        return recorder.summary(time.monotonic() - started)
+
+
+def find_saturation(steps: list[dict]) -> int | None:
+    """First concurrency where req/s grew <10% over the previous step while p95 rose, or errors >1%."""
+
+    for prev, step in zip([None] + steps, steps):
+        total = step["result"]["total"]
+        if total["error_rate"] > 0.01:
+            return step["concurrency"]
+        if prev is not None:
+            before = prev["result"]["total"]
+            if total["rps"] < before["rps"] * 1.10 and total["p95_ms"] > before["p95_ms"] * 1.25:
+                return step["concurrency"]
+    return None
+
+
+def _parse_mix(text: str | None) -> dict[str, int]:
+    mix = dict(DEFAULT_MIX)
+    for part in filter(None, (text or "").split(",")):
+        name, _, weight = part.partition("=")
+        if name not in mix:
+            raise SystemExit(f"unknown action {name!r}; known: {', '.join(mix)}")
+        mix[name] = int(weight)
+    return {k: v for k, v in mix.items() if v > 0}
+
+
+def _print_step(step: dict) -> None:
+    result = step["result"]
+    print(f"\nconcurrency {step['concurrency']}: {result['total']['rps']} req/s, "
+          f"p95 {result['total']['p95_ms']} ms, errors {result['total']['error_rate']:.2%}")
+    print(f"  {'endpoint':<36} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for label, r in result["endpoints"].items():
+        print(f"  {label:<36} {r['rps']:>8.2f} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['error_rate']:>7.2%}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="target an already running app instead of starting one")
+    parser.add_argument("--concurrency", default="10,25,50", help="virtual users per step, comma-separated")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per step")
+    parser.add_argument("--think-ms", type=float, default=1000.0, help="mean pause between actions (exponential)")
+    parser.add_argument("--session-actions", type=int, default=20, help="average actions before logging in again")
+    parser.add_argument("--mix", help="override action weights, e.g. import=0,dashboard=50")
+    parser.add_argument("--max-pages", type=int, default=0, help="cap on cursor pages per transactions visit; 0 = all")
+    parser.add_argument("--poll-ms", type=float, default=1500.0, help="import status polling interval (frontend: 1500)")
+    parser.add_argument("--import-timeout", type=float, default=120.0)
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request client timeout")
+    parser.add_argument("--seed", type=int, default=1, help="synthetic dataset to log in as")
+    parser.add_argument("--users", type=int, default=10, help="users in that dataset")
+    parser.add_argument("--dataset-rows", default="", help="load the dataset first, e.g. 100k (drops an existing one)")
+    parser.add_argument("--port", type=int, default=8770)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--env", action="append", default=[], help="extra server setting, KEY=VALUE (repeatable)")
+    parser.add_argument("--stub-port", type=int, default=8899)
+    parser.add_argument("--model-latency-ms", type=float, default=1500.0, help="stub OpenRouter response delay")
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args()
+
+    mix = _parse_mix(args.mix)
+    if args.dataset_rows:
+        from app.core.db import Base, SessionLocal, engine
+        from scripts.synthetic_data import drop_dataset, generate, parse_count
+
+        Base.metadata.create_all(engine)
+        with SessionLocal() as db:
+            drop_dataset(db, args.seed)
+            generate(db, rows=parse_count(args.dataset_rows), users=args.users, years=3, seed=args.seed)
+
+    server = stub = None
+    base_url = args.url
+    if base_url is None:
+        stub = subprocess.Popen(
+            [sys.executable, "scripts/stub_openrouter.py", "--port", str(args.stub_port), "--latency-ms", str(args.model_latency_ms)],
+            cwd=BACKEND_DIR,
+        )
+        env = {
+            "OPENROUTER_BASE_URL": f"http://127.0.0.1:{args.stub_port}",
+            "OPENROUTER_API_KEY": "stub",
+            "OPENROUTER_MODEL": "stub/model",
+        }
+        env.update(item.split("=", 1) for item in args.env)
+        base_url = f"http://127.0.0.1:{args.port}"
+        server = start_server(args.port, workers=args.workers, **env)
+
+    steps = []
+    try:
+        asyncio.run(wait_ready(base_url))
+        receipt = _receipt_png()
+        for concurrency in [int(c) for c in args.concurrency.split(",")]:
+            result = asyncio.run(run_step(base_url, concurrency, mix, args, receipt))
+            steps.append({"concurrency": concurrency, "result": result})
+            _print_step(steps[-1])
+    finally:
+        if server is not None:
+            stop_server(server)
+        if stub is not None:
+            stop_server(stub)
+
+    saturation = find_saturation(steps)
+    print(f"\nsaturation: {'around concurrency ' + str(saturation) if saturation else 'not reached'}")
+    if args.output:
+        report = {
+            "config": {k: v for k, v in vars(args).items() if k != "output"} | {"mix": mix},
+            "steps": steps,
+            "saturation_concurrency": saturation,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,41 @@
+"""Rebuild or verify the monthly_rollups table from transactions.
+
+    python scripts/rebuild_rollups.py                # rebuild every user
+    python scripts/rebuild_rollups.py --user-id 3    # rebuild one user
+    python scripts/rebuild_rollups.py --check        # report drift only, exit 1 if any
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.db import SessionLocal
+from app.services.rollups import check_rollups, rebuild_rollups
+import app.models  # noqa: F401
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", type=int, default=None)
+    parser.add_argument("--check", action="store_true", help="compare rollups with transactions without writing")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        if args.check:
+            mismatches = check_rollups(db, args.user_id)
+            for m in mismatches:
+                print(f"{m['bucket']}: expected={m['expected']} actual={m['actual']}")
+            print(f"{len(mismatches)} bucket(s) out of sync")
+            return 1 if mismatches else 0
+
+        buckets = rebuild_rollups(db, args.user_id)
+        print(f"rebuilt {buckets} bucket(s)")
+        return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
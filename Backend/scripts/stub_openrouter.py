@@ -0,0 +1,135 @@
+"""Local stand-in for OpenRouter's chat-completions API, for exercising imports without the real service.
+
+Answers POST /chat/completions with a `create_transactions` tool call and a `usage` block,
+after an optional delay, and can inject 429/5xx failures to exercise the client's retries.
+GET /stats returns what it has seen so far.
+
+    python scripts/stub_openrouter.py --port 8899 --latency-ms 300 --fail-first 2
+    OPENROUTER_BASE_URL=http://127.0.0.1:8899 OPENROUTER_API_KEY=stub uvicorn app.main:app
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import date
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def _transactions(count: int, seed: str) -> list[dict]:
+    rnd = random.Random(seed)
+    today = date.today()
+    return [
+        {
+            "description": f"Stub purchase {i + 1}",
+            "amount": round(rnd.uniform(5, 500), 2),
+            "type": "INCOME" if i % 7 == 0 else "EXPENSE",
+            "category": rnd.choice(["Alimentação", "Moradia", "Transporte", "Lazer"]),
+            "tag": None,
+            "date": today.replace(day=1 + i % 28).isoformat(),
+            "isRecurring": False,
+        }
+        for i in range(count)
+    ]
+
+
+def _prompt_chars(messages: list[dict]) -> int:
+    total = 0
+    for m in messages:
+        content = m.get("content")
+        parts = content if isinstance(content, list) else [{"text": content or ""}]
+        for p in parts:
+            total += len(p.get("text") or "") + len(json.dumps(p.get("file") or p.get("image_url") or ""))
+    return total
+
+
+def create_stub_app(
+    *,
+    latency_ms: float = 0.0,
+    fail_rate: float = 0.0,
+    fail_first: int = 0,
+    fail_status: int = 429,
+    transactions: int = 5,
+) -> FastAPI:
+    app = FastAPI(title="OpenRouter stub")
+    seen = {"requests": 0, "failures": 0, "started_at": time.time()}
+
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        seen["requests"] += 1
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+
+        if seen["requests"] <= fail_first or random.random() < fail_rate:
+            seen["failures"] += 1
+            headers = {"Retry-After": "0"} if fail_status == 429 else {}
+            return JSONResponse({"error": {"message": "stub failure", "code": fail_status}}, fail_status, headers=headers)
+
+        prompt_tokens = _prompt_chars(body.get("messages") or []) // 4
+        args = {"transactions": _transactions(transactions, seed=str(prompt_tokens))}
+        arguments = json.dumps(args, ensure_ascii=False)
+        return {
+            "id": f"stub-{seen['requests']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model") or "stub/model",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "tool_calls",
+                    "message": {
+                        "role": "assistant",
+                        "content": None,
+                        "tool_calls": [
+                            {
+                                "id": "call_0",
+                                "type": "function",
+                                "function": {"name": "create_transactions", "arguments": arguments},
+                            }
+                        ],
+                    },
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(arguments) // 4,
+                "total_tokens": prompt_tokens + len(arguments) // 4,
+            },
+        }
+
+    @app.get("/stats")
+    def stats():
+        return seen
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered with --fail-status")
+    parser.add_argument("--fail-first", type=int, default=0, help="fail this many requests before answering")
+    parser.add_argument("--fail-status", type=int, default=429)
+    parser.add_argument("--transactions", type=int, default=5, help="rows per response")
+    args = parser.parse_args()
+
+    app = create_stub_app(
+        latency_ms=args.latency_ms,
+        fail_rate=args.fail_rate,
+        fail_first=args.fail_first,
+        fail_status=args.fail_status,
+        transactions=args.transactions,
+    )
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
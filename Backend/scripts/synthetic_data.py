@@ -0,0 +1,190 @@
+"""Fill DATABASE_URL with realistic, reproducible users and years of transactions.
+
+The same --seed always yields the same rows. Users are named after the seed
+(synthetic-<seed>-<n>@example.com, password "synthetic"), so several datasets can live in
+one database and --drop removes exactly one of them. Rows are streamed in batches, so
+10M rows never sit in memory; monthly rollups are rebuilt at the end.
+
+    python scripts/synthetic_data.py --rows 1m --users 100 --years 5 --seed 7
+    python scripts/synthetic_data.py --seed 7 --drop
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.db import Base, SessionLocal, engine
+from app.core.security import get_password_hash
+from app.models.import_job import ImportJob
+from app.models.monthly_rollup import MonthlyRollup
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services.rollups import rebuild_rollups
+import app.models  # noqa: F401
+
+PASSWORD = "synthetic"
+BATCH_ROWS = 10_000
+
+# category -> (type, weight, median amount, merchants, recurring)
+CATEGORIES: dict[str, tuple[str, float, float, tuple[str, ...], bool]] = {
+    "Alimentação": ("EXPENSE", 30, 45.0, ("Mercado Extra", "Padaria Pão Quente", "iFood", "Restaurante Sabor", "Açougue Boi Bom"), False),
+    "Transporte": ("EXPENSE", 16, 28.0, ("Uber", "99", "Posto Shell", "Metrô SP", "Estacionamento Centro"), False),
+    "Lazer": ("EXPENSE", 10, 70.0, ("Cinemark", "Spotify", "Netflix", "Steam", "Bar do Zé"), False),
+    "Saúde": ("EXPENSE", 6, 120.0, ("Drogasil", "Droga Raia", "Unimed", "Laboratório Fleury"), False),
+    "Moradia": ("EXPENSE", 5, 900.0, ("Aluguel", "Condomínio", "Enel", "Sabesp", "Vivo Fibra"), True),
+    "Educação": ("EXPENSE", 3, 250.0, ("Udemy", "Escola Aprender", "Livraria Cultura"), True),
+    "Compras": ("EXPENSE", 12, 150.0, ("Amazon", "Mercado Livre", "Magazine Luiza", "Renner", "Shopee"), False),
+    "Outros": ("EXPENSE", 8, 60.0, ("PIX enviado", "Tarifa bancária", "Saque 24h"), False),
+    "Salário": ("INCOME", 6, 5200.0, ("Salário ACME Ltda",), True),
+    "Rendimentos": ("INCOME", 2, 80.0, ("Rendimento CDB", "Dividendos ITSA4"), False),
+    "Transferências": ("INCOME", 2, 300.0, ("PIX recebido", "TED recebida"), False),
+}
+TAGS = (None, None, None, "fixo", "extra", "cartão", "pix", "viagem")
+
+
+def parse_count(value: str) -> int:
+    """'10k', '1m', '2500' -> int."""
+
+    value = value.strip().lower().replace("_", "")
+    factor = {"k": 1_000, "m": 1_000_000}.get(value[-1:], 1)
+    return int(float(value[:-1] if factor > 1 else value) * factor)
+
+
+def user_email(seed: int, index: int) -> str:
+    return f"synthetic-{seed}-{index}@example.com"
+
+
+def _rows_for_user(rnd: random.Random, user_id: int, count: int, years: int, now: datetime) -> Iterator[dict]:
+    names = list(CATEGORIES)
+    weights = [CATEGORIES[n][1] for n in names]
+    days = max(1, 365 * years)
+    today = now.date()
+    for _ in range(count):
+        category = rnd.choices(names, weights)[0]
+        type_, _, median, merchants, recurring = CATEGORIES[category]
+        # Log-normal around the category median: mostly small, some large outliers.
+        amount = round(median * rnd.lognormvariate(0, 0.6), 2)
+        yield {
+            "user_id": user_id,
+            "description": rnd.choice(merchants),
+            "amount": max(amount, 0.01),
+            "type": type_,
+            "category": category,
+            "tag": rnd.choice(TAGS),
+            "date": today - timedelta(days=rnd.randrange(days)),
+            "is_recurring": recurring and rnd.random() < 0.8,
+            "source": "manual" if rnd.random() < 0.7 else "import",
+            "created_at": now,
+            "updated_at": now,
+        }
+
+
+def _create_users(db: Session, seed: int, users: int) -> list[int]:
+    # One hash for everyone: seeding stays fast and load tests can log any of them in.
+    password_hash = get_password_hash(PASSWORD)
+    emails = [user_email(seed, i) for i in range(users)]
+    db.execute(
+        insert(User),
+        [{"name": f"Synthetic {i}", "email": e, "role": "MEMBER", "password_hash": password_hash} for i, e in enumerate(emails)],
+    )
+    db.commit()
+    by_email = dict(db.execute(select(User.email, User.id).where(User.email.in_(emails))).all())
+    return [by_email[e] for e in emails]
+
+
+def dataset_user_ids(db: Session, seed: int) -> list[int]:
+    """Ids of the dataset's users, in creation order (index 0 first)."""
+
+    return list(db.scalars(select(User.id).where(User.email.like(f"synthetic-{seed}-%")).order_by(User.id)).all())
+
+
+def drop_dataset(db: Session, seed: int) -> int:
+    ids = dataset_user_ids(db, seed)
+    if ids:
+        db.execute(delete(Transaction).where(Transaction.user_id.in_(ids)))
+        db.execute(delete(MonthlyRollup).where(MonthlyRollup.user_id.in_(ids)))
+        db.execute(delete(ImportJob).where(ImportJob.user_id.in_(ids)))
+        db.execute(delete(User).where(User.id.in_(ids)))
+        db.commit()
+    return len(ids)
+
+
+def generate(db: Session, *, rows: int, users: int, years: int, seed: int, progress: bool = False) -> list[int]:
+    """Create `users` users sharing `rows` transactions over the last `years` years.
+
+    Users get unequal shares (a few heavy users, many light ones), like real accounts.
+    Returns the user ids; index 0 is always the heaviest user.
+    """
+
+    if dataset_user_ids(db, seed):
+        raise RuntimeError(f"Dataset {seed} already exists; drop it first (--drop)")
+
+    rnd = random.Random(seed)
+    user_ids = _create_users(db, seed, users)
+    shares = sorted((rnd.paretovariate(1.5) for _ in user_ids), reverse=True)
+    counts = [int(rows * s / sum(shares)) for s in shares]
+    counts[0] += rows - sum(counts)
+
+    table = Transaction.__table__
+    now = datetime.utcnow()
+    batch: list[dict] = []
+    written = 0
+    started = time.perf_counter()
+    for index, (user_id, count) in enumerate(zip(user_ids, counts)):
+        user_rnd = random.Random(f"{seed}:{index}")
+        for row in _rows_for_user(user_rnd, user_id, count, years, now):
+            batch.append(row)
+            if len(batch) >= BATCH_ROWS:
+                db.execute(table.insert(), batch)
+                db.commit()
+                written += len(batch)
+                batch = []
+                if progress:
+                    print(f"  {written:,}/{rows:,} rows, {written / (time.perf_counter() - started):,.0f} rows/s", file=sys.stderr)
+    if batch:
+        db.execute(table.insert(), batch)
+        db.commit()
+
+    for user_id in user_ids:
+        rebuild_rollups(db, user_id)
+    return user_ids
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="10k", help="total transactions, e.g. 1k, 250k, 10m")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--drop", action="store_true", help="remove the dataset for --seed and exit")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        if args.drop:
+            print(f"removed {drop_dataset(db, args.seed)} user(s) of dataset {args.seed}")
+            return 0
+
+        rows = parse_count(args.rows)
+        started = time.perf_counter()
+        user_ids = generate(db, rows=rows, users=args.users, years=args.years, seed=args.seed, progress=True)
+        print(
+            f"dataset {args.seed}: {len(user_ids)} users, {rows:,} transactions over {args.years} year(s) "
+            f"in {time.perf_counter() - started:.1f}s; login as {user_email(args.seed, 0)} / {PASSWORD}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
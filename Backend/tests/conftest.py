@@ -0,0 +1,75 @@
+"""Shared fixtures: the app against a scratch database and a recorder for the SQL it runs.
+
+Settings are read when `app` is first imported, so the environment is set up here, before
+that. DATABASE_URL defaults to a throwaway SQLite file; export DATABASE_URL (and DB_ASYNC)
+to run the same tests against MySQL. Caches are off so every request reaches the database.
+
+    cd Backend && python -m pytest
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+_scratch = tempfile.mkdtemp(prefix="meubolso-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_scratch, 'test.db')}")
+os.environ.setdefault("JWT_SECRET", "test-secret")
+os.environ.setdefault("UPLOAD_DIR", os.path.join(_scratch, "uploads"))
+os.environ.setdefault("STATS_CACHE_PATH", os.path.join(_scratch, "stats_cache.sqlite3"))
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("QUERY_BUDGET_MODE", "off")
+os.environ["USER_CACHE_TTL_SECONDS"] = "0"
+os.environ["STATS_CACHE_TTL_SECONDS"] = "0"
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.db import Base, async_engine, engine
+import app.models  # noqa: F401
+
+
+@pytest.fixture(scope="session")
+def app() -> FastAPI:
+    Base.metadata.create_all(engine)
+    from app.main import app as fastapi_app
+
+    return fastapi_app
+
+
+@pytest.fixture(scope="session")
+def client(app: FastAPI) -> TestClient:
+    # Not entered as a context manager: the lifespan (import workers, docling pool) stays off.
+    return TestClient(app)
+
+
+@pytest.fixture
+def record_sql():
+    """`with record_sql() as statements:` collects (statement, parameters) for everything run
+    on the app's engines, or on the engines passed in."""
+
+    @contextmanager
+    def record(*engines: Engine) -> Iterator[list[tuple[str, object]]]:
+        watched = engines or (engine, *([async_engine.sync_engine] if async_engine is not None else []))
+        statements: list[tuple[str, object]] = []
+
+        def _capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        for e in watched:
+            event.listen(e, "before_cursor_execute", _capture)
+        try:
+            yield statements
+        finally:
+            for e in watched:
+                event.remove(e, "before_cursor_execute", _capture)
+
+    return record
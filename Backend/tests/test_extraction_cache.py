@@ -0,0 +1,52 @@
+"""Model extraction cache: hits, expiry, and re-uploads after an entry expired."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, select, update
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.models.extraction_cache import ExtractionCache
+from app.services.extraction_cache import get_cached_extraction, store_extraction
+
+KEY = {"content_sha256": "ab" * 32, "model": "test/model", "prompt_version": "v1"}
+
+
+@pytest.fixture
+def db(app):
+    session = SessionLocal()
+    session.execute(delete(ExtractionCache))
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _age(db, days: int) -> None:
+    db.execute(update(ExtractionCache).values(created_at=datetime.utcnow() - timedelta(days=days)))
+    db.commit()
+
+
+def test_hit_returns_stored_payload(db):
+    store_extraction(db, **KEY, args={"transactions": [{"description": "Mercado"}]})
+
+    assert get_cached_extraction(db, **KEY) == {"transactions": [{"description": "Mercado"}]}
+    assert db.scalar(select(ExtractionCache.hit_count)) == 1
+
+
+def test_reupload_after_expiry_refreshes_entry(db):
+    store_extraction(db, **KEY, args={"transactions": [{"description": "antigo"}]})
+    _age(db, settings.extraction_cache_max_age_days + 1)
+
+    assert get_cached_extraction(db, **KEY) is None
+
+    # The import then pays for one model call and stores the fresh result...
+    store_extraction(db, **KEY, args={"transactions": [{"description": "novo"}]})
+
+    # ...which the next re-upload reuses.
+    assert get_cached_extraction(db, **KEY) == {"transactions": [{"description": "novo"}]}
+    assert db.scalar(select(ExtractionCache.created_at)) > datetime.utcnow() - timedelta(minutes=1)
@@ -0,0 +1,111 @@
+"""Chunked model extraction: chunks with nothing to report, and failures mid-way.
+
+The model and the document conversion are replaced, so nothing leaves the process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from app.services import import_service
+from app.services.chunking import Chunk
+from app.services.import_service import ImportMetrics
+
+
+def _tool_reply(*transactions: dict) -> dict:
+    call = {"function": {"name": "create_transactions", "arguments": json.dumps({"transactions": list(transactions)})}}
+    return {"choices": [{"message": {"tool_calls": [call]}}], "attempts": [{"status": 200}]}
+
+
+def _text_reply(content: str) -> dict:
+    return {"choices": [{"message": {"content": content}}], "attempts": [{"status": 200}]}
+
+
+def _item(description: str, amount: float) -> dict:
+    return {"description": description, "amount": amount, "type": "EXPENSE", "date": "2025-01-10"}
+
+
+CHUNKS = ["| Data | Descrição | Valor |\n| 10/01 | Mercado | 50,00 |", "Termos e condições do cartão", "| 11/01 | Farmácia | 20,00 |"]
+
+
+@pytest.fixture
+def chunked_model(monkeypatch):
+    """Every upload converts to CHUNKS; `replies` maps chunk text to the reply (or exception)."""
+
+    replies: dict[str, object] = {}
+    calls: list[str] = []
+
+    async def fake_convert(file_path: str) -> str:
+        return "\n\n".join(CHUNKS)
+
+    async def fake_model(*, document_markdown: str, **kwargs) -> dict:
+        calls.append(document_markdown)
+        reply = replies[document_markdown]
+        if isinstance(reply, BaseException):
+            raise reply
+        if callable(reply):
+            return await reply()
+        return reply
+
+    monkeypatch.setattr(import_service, "parse_statement_table", lambda *a: None)
+    monkeypatch.setattr(import_service, "needs_conversion", lambda path: True)
+    monkeypatch.setattr(import_service.docling_pool, "convert_to_markdown", fake_convert)
+    monkeypatch.setattr(import_service, "split_markdown", lambda markdown, *a: [Chunk(t) for t in CHUNKS])
+    monkeypatch.setattr(import_service, "chat_completions_with_file", fake_model)
+    return replies, calls
+
+
+def _extract(metrics: ImportMetrics | None = None) -> list[dict]:
+    return asyncio.run(
+        import_service.extract_transactions(db=None, file_path="fatura.pdf", filename="fatura.pdf", metrics=metrics)
+    )
+
+
+def test_chunk_without_tool_call_counts_as_empty(chunked_model):
+    replies, _ = chunked_model
+    replies[CHUNKS[0]] = _tool_reply(_item("Mercado", 50.0))
+    replies[CHUNKS[1]] = _text_reply("Nenhuma transação nesta parte.")
+    replies[CHUNKS[2]] = _tool_reply(_item("Farmácia", 20.0))
+
+    metrics = ImportMetrics()
+    items = _extract(metrics)
+
+    assert [i["description"] for i in items] == ["Mercado", "Farmácia"]
+    assert metrics.model_attempts == 3
+
+
+def test_no_tool_call_in_any_chunk_fails(chunked_model):
+    replies, _ = chunked_model
+    for text in CHUNKS:
+        replies[text] = _text_reply("Não encontrei transações.")
+
+    with pytest.raises(RuntimeError, match="any of the 3 chunks"):
+        _extract()
+
+
+def test_failed_chunk_cancels_the_others(chunked_model):
+    replies, _ = chunked_model
+    cancelled: list[str] = []
+
+    async def slow() -> dict:
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+        return _tool_reply()
+
+    replies[CHUNKS[0]] = slow
+    replies[CHUNKS[1]] = RuntimeError("OpenRouter error 500")
+    replies[CHUNKS[2]] = slow
+
+    async def run() -> None:
+        with pytest.raises(RuntimeError, match="OpenRouter error 500"):
+            await import_service.extract_transactions(db=None, file_path="fatura.pdf", filename="fatura.pdf")
+        # Checked before asyncio.run tears the loop down (which would cancel leftovers anyway).
+        assert cancelled == ["slow", "slow"]
+
+    asyncio.run(run())
@@ -0,0 +1,97 @@
+"""Retries against OpenRouter: Retry-After on 429, and attempts kept when every try fails.
+
+The HTTP layer is an httpx.MockTransport, so nothing leaves the process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+from openai import AsyncOpenAI, RateLimitError
+
+from app.core.config import settings
+from app.services import openrouter_client
+from app.services.import_service import ImportMetrics, _call_model
+
+COMPLETION = {
+    "id": "gen-1",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "test/model",
+    "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "ok"}}],
+    "usage": {"prompt_tokens": 11, "completion_tokens": 3, "total_tokens": 14},
+}
+
+
+@pytest.fixture
+def openrouter(monkeypatch):
+    """Queue of (status, headers) answers for the next requests; 200 answers with COMPLETION."""
+
+    answers: list[tuple[int, dict]] = []
+    sleeps: list[float] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status, headers = answers.pop(0)
+        if status == 200:
+            return httpx.Response(200, json=COMPLETION, headers=headers)
+        return httpx.Response(status, json={"error": {"message": "slow down"}}, headers=headers)
+
+    async def fake_sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    client = AsyncOpenAI(
+        base_url="http://openrouter.test/api/v1",
+        api_key="test",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    monkeypatch.setattr(settings, "openrouter_api_key", "test")
+    monkeypatch.setattr(openrouter_client, "_client", client)
+    monkeypatch.setattr(openrouter_client.asyncio, "sleep", fake_sleep)
+    return answers, sleeps
+
+
+def _call(metrics: ImportMetrics) -> dict:
+    return asyncio.run(
+        _call_model(model="test/model", file_path="extrato.txt", filename="extrato.txt", metrics=metrics, markdown="x")
+    )
+
+
+def test_429_then_success_honours_retry_after(openrouter):
+    answers, sleeps = openrouter
+    answers += [(429, {"Retry-After": "2"}), (200, {})]
+
+    metrics = ImportMetrics()
+    resp = _call(metrics)
+
+    assert [a["status"] for a in resp["attempts"]] == [429, 200]
+    assert sleeps == [2.0]
+    assert metrics.model_attempts == 2
+    assert metrics.prompt_tokens == 11
+
+
+def test_backoff_without_retry_after_is_jittered_and_capped(openrouter, monkeypatch):
+    answers, sleeps = openrouter
+    answers += [(503, {}), (503, {}), (200, {})]
+    monkeypatch.setattr(settings, "openrouter_backoff_seconds", 1.0)
+    monkeypatch.setattr(settings, "openrouter_backoff_max_seconds", 1.5)
+
+    _call(ImportMetrics())
+
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 1.0 and 0 <= sleeps[1] <= 1.5
+
+
+def test_failed_call_keeps_its_attempts(openrouter, monkeypatch):
+    answers, _ = openrouter
+    monkeypatch.setattr(settings, "openrouter_max_retries", 2)
+    answers += [(429, {"Retry-After": "0"})] * 3
+
+    metrics = ImportMetrics()
+    with pytest.raises(RateLimitError) as raised:
+        _call(metrics)
+
+    assert [a["status"] for a in raised.value.attempts] == [429, 429, 429]
+    assert metrics.model_attempts == 3
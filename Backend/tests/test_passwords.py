@@ -0,0 +1,42 @@
+"""bcrypt cost handling and the bounded hashing pool."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.core.security import configure_bcrypt_rounds, password_hasher, pwd_context
+
+
+@pytest.fixture
+def rounds():
+    yield configure_bcrypt_rounds
+    configure_bcrypt_rounds(settings.bcrypt_rounds)
+
+
+def _hash_at(cost: int, password: str) -> str:
+    return pwd_context.handler("bcrypt").using(rounds=cost).hash(password)
+
+
+def test_login_rehashes_only_upward(rounds):
+    rounds(5)
+
+    valid, new_hash = asyncio.run(password_hasher.verify_and_update("segredo", _hash_at(4, "segredo")))
+    assert valid and new_hash is not None and pwd_context.handler("bcrypt").from_string(new_hash).rounds == 5
+
+    # A process that calibrated lower must not downgrade hashes made by a faster one.
+    valid, new_hash = asyncio.run(password_hasher.verify_and_update("segredo", _hash_at(6, "segredo")))
+    assert valid and new_hash is None
+
+
+def test_saturated_pool_answers_503(client, monkeypatch):
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+
+    resp = client.post(
+        "/api/auth/register", json={"name": "Ocupado", "email": "busy@example.com", "password": "segredo"}
+    )
+
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
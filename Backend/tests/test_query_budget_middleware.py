@@ -0,0 +1,59 @@
+"""QueryBudgetMiddleware in "log" and "raise" modes, on a small app of its own.
+
+main.py only installs the middleware when QUERY_BUDGET_MODE is set at import time, so these
+tests wrap throwaway routes instead of the real ones.
+"""
+
+from __future__ import annotations
+
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.db import engine
+from app.core.query_budget import QueryBudgetExceeded, QueryBudgetMiddleware, query_budget
+
+
+def _budget_app(mode: str) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(QueryBudgetMiddleware, mode=mode)
+
+    def run_queries(count: int) -> dict:
+        with engine.connect() as conn:
+            for _ in range(count):
+                conn.exec_driver_sql("SELECT 1")
+        return {"queries": count}
+
+    @app.get("/within")
+    @query_budget(2)
+    def within():
+        return run_queries(2)
+
+    @app.get("/over")
+    @query_budget(1)
+    def over():
+        return run_queries(3)
+
+    return app
+
+
+def test_log_mode_warns_and_still_answers(caplog):
+    client = TestClient(_budget_app("log"))
+
+    with caplog.at_level(logging.WARNING, logger="app.core.query_budget"):
+        within = client.get("/within")
+        over = client.get("/over")
+
+    assert within.status_code == 200 and over.status_code == 200
+    assert [r.getMessage() for r in caplog.records] == ["GET /over ran 3 queries, budget is 1"]
+
+
+def test_raise_mode_fails_the_request():
+    app = _budget_app("raise")
+
+    assert TestClient(app).get("/within").status_code == 200
+    with pytest.raises(QueryBudgetExceeded, match="GET /over ran 3 queries, budget is 1"):
+        TestClient(app).get("/over")
+    assert TestClient(app, raise_server_exceptions=False).get("/over").status_code == 500
@@ -0,0 +1,169 @@
+"""Every /api route declares a SQL statement budget (@query_budget) and stays within it.
+
+Routes are called in-process with the user and stats caches off, so the counts are the
+cold-path worst case. Calls run in order: later ones use ids the earlier ones created.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+from collections.abc import Callable
+from datetime import date, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy import delete, insert
+
+from app.core.db import SessionLocal
+from app.core.query_budget import route_budget
+from app.core.security import create_access_token, get_password_hash
+from app.models.import_job import ImportJob
+from app.models.monthly_rollup import MonthlyRollup
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services.rollups import rebuild_rollups
+
+SEED_ROWS = 500
+PASSWORD = "budget-check"
+CATEGORIES = ["Alimentação", "Moradia", "Transporte", "Lazer", "Saúde"]
+TODAY = date.today()
+
+
+def _tx(env: dict) -> dict:
+    return {
+        "description": "budget",
+        "amount": 12.5,
+        "type": "EXPENSE",
+        "category": CATEGORIES[0],
+        "date": TODAY.isoformat(),
+        "userId": str(env["user_id"]),
+    }
+
+
+# (method, url, request kwargs); urls are formatted with the `budget_env` dict.
+CALLS: list[tuple[str, str, Callable[[dict], dict]]] = [
+    ("POST", "/api/auth/login", lambda env: {"json": {"email": f"{env['prefix']}-admin@example.com", "password": PASSWORD}}),
+    ("POST", "/api/auth/register", lambda env: {"json": {"name": "b", "email": f"{env['prefix']}-member@example.com", "password": PASSWORD}}),
+    ("GET", "/api/auth/me", lambda env: {}),
+    ("GET", "/api/transactions?userId={user_id}", lambda env: {}),
+    ("GET", f"/api/transactions?userId={{user_id}}&month={TODAY.month}&year={TODAY.year}", lambda env: {}),
+    ("POST", "/api/transactions", lambda env: {"json": _tx(env)}),
+    ("PUT", "/api/transactions/{tx_id}", lambda env: {"json": {"category": CATEGORIES[1]}}),
+    ("DELETE", "/api/transactions/{tx_id}", lambda env: {}),
+    (
+        "POST",
+        "/api/transactions/batch",
+        lambda env: {
+            "json": {
+                "operations": [{"op": "create", "data": _tx(env)}] * 3
+                + [{"op": "update", "id": "0", "data": {"tag": "x"}}, {"op": "delete", "id": "0"}]
+            }
+        },
+    ),
+    ("GET", "/api/transactions/export?userId={user_id}&format=csv", lambda env: {}),
+    ("POST", "/api/transactions/import?userId={user_id}", lambda env: {"files": {"file": ("budget.csv", b"a;b\n1;2\n", "text/csv")}}),
+    ("GET", f"/api/stats/dashboard?userId={{user_id}}&month={TODAY.month}&year={TODAY.year}", lambda env: {}),
+    ("GET", f"/api/stats/category-breakdown?userId={{user_id}}&category={CATEGORIES[0]}", lambda env: {}),
+    ("GET", "/api/imports/{import_id}", lambda env: {}),
+    ("DELETE", "/api/imports/{import_id}", lambda env: {}),
+    ("GET", "/api/admin/users", lambda env: {}),
+    ("POST", "/api/admin/users", lambda env: {"json": {"name": "c", "email": f"{env['prefix']}-created@example.com", "password": PASSWORD}}),
+    ("DELETE", "/api/admin/users/{created_user_id}", lambda env: {}),
+    ("DELETE", "/api/admin/import-cache", lambda env: {}),
+    ("GET", "/api/admin/stats-cache", lambda env: {}),
+    ("GET", "/api/admin/db-pool", lambda env: {}),
+    ("GET", "/api/admin/import-stats", lambda env: {}),
+]
+
+
+def _api_routes(app: FastAPI) -> dict[tuple[str, str], APIRoute]:
+    return {(m, r.path): r for r in app.routes if isinstance(r, APIRoute) and r.path.startswith("/api") for m in r.methods}
+
+
+def _route_for(app: FastAPI, method: str, url: str) -> APIRoute:
+    path = url.split("?")[0]
+    for (m, _), route in _api_routes(app).items():
+        if m == method and route.path_regex.match(path):
+            return route
+    raise LookupError(f"No route for {method} {url}")
+
+
+@pytest.fixture(scope="module")
+def budget_env(app: FastAPI):
+    """An admin with SEED_ROWS transactions and a finished import; removed afterwards."""
+
+    prefix = f"budget-check-{random.randrange(10**9)}"
+    with SessionLocal() as db:
+        admin = User(name="budget-check", email=f"{prefix}-admin@example.com", role="ADMIN", password_hash=get_password_hash(PASSWORD))
+        db.add(admin)
+        db.commit()
+        start = TODAY - timedelta(days=365)
+        db.execute(
+            insert(Transaction),
+            [
+                {
+                    "user_id": admin.id,
+                    "description": f"row {i}",
+                    "amount": round(random.uniform(1, 500), 2),
+                    "type": "INCOME" if i % 10 == 0 else "EXPENSE",
+                    "category": random.choice(CATEGORIES),
+                    "date": start + timedelta(days=random.randrange(365)),
+                    "source": "manual",
+                }
+                for i in range(SEED_ROWS)
+            ],
+        )
+        job = ImportJob(
+            user_id=admin.id,
+            filename="budget.pdf",
+            content_type="application/pdf",
+            file_path=os.path.join(os.path.dirname(__file__), "__missing__.pdf"),
+            file_size=1,
+            status="DONE",
+        )
+        db.add(job)
+        db.commit()
+        rebuild_rollups(db, admin.id)
+        env = {"prefix": prefix, "user_id": admin.id, "import_id": job.id}
+
+    env["headers"] = {"Authorization": f"Bearer {create_access_token(subject=str(env['user_id']))}"}
+    yield env
+
+    with SessionLocal() as db:
+        ids = [u.id for u in db.query(User).filter(User.email.like(f"{prefix}-%"))]
+        db.execute(delete(Transaction).where(Transaction.user_id.in_(ids)))
+        db.execute(delete(MonthlyRollup).where(MonthlyRollup.user_id.in_(ids)))
+        db.execute(delete(ImportJob).where(ImportJob.user_id.in_(ids)))
+        db.execute(delete(User).where(User.id.in_(ids)))
+        db.commit()
+
+
+@pytest.mark.parametrize(("method", "url", "kwargs"), CALLS, ids=[f"{m} {u.split('?')[0]}" for m, u, _ in CALLS])
+def test_route_within_budget(app, client, budget_env, record_sql, method, url, kwargs):
+    route = _route_for(app, method, url)
+    budget = route_budget(route)
+    assert budget is not None, f"{method} {route.path} has no @query_budget"
+
+    with record_sql() as statements:
+        resp = client.request(method, url.format(**budget_env), headers=budget_env["headers"], **kwargs(budget_env))
+        resp.read()
+    assert resp.status_code < 400, resp.text[:200]
+
+    if method == "POST" and url == "/api/transactions":
+        budget_env["tx_id"] = int(resp.json()["id"])
+    if method == "POST" and url == "/api/admin/users":
+        budget_env["created_user_id"] = int(resp.json()["id"])
+
+    assert len(statements) <= budget, f"{method} {route.path}: {len(statements)} statements, budget {budget}"
+
+
+def test_every_route_has_a_budget(app):
+    missing = sorted(f"{m} {path}" for (m, path), route in _api_routes(app).items() if route_budget(route) is None)
+    assert not missing
+
+
+def test_every_route_is_exercised(app):
+    exercised = {(m, _route_for(app, m, url).path) for m, url, _ in CALLS}
+    assert not sorted(set(_api_routes(app)) - exercised)
@@ -0,0 +1,117 @@
+"""Local CSV parsing of bank exports (no model involved)."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.services.statement_parser import SAMPLE_BYTES, parse_statement_table
+
+
+@pytest.fixture
+def write_csv(tmp_path):
+    def write(text: str, encoding: str = "utf-8", name: str = "extrato.csv") -> str:
+        path = tmp_path / name
+        path.write_bytes(text.encode(encoding))
+        return str(path)
+
+    return write
+
+
+def test_utf8_file_with_multibyte_char_at_sample_boundary(write_csv):
+    row = "05/01/2025;Padaria São João;-12,50\n"
+    rows = [row] * (SAMPLE_BYTES // len(row.encode("utf-8")) + 10)
+    a_tilde = "ã".encode("utf-8")
+    # Pad the first row until the encoding sample ends in the middle of an "ã".
+    for pad in range(len(row) + 1):
+        text = "Data;Descrição;Valor\n" + f"01/01/2025;Ajuste{'x' * pad};1,00\n" + "".join(rows)
+        if text.encode("utf-8")[SAMPLE_BYTES - 1:SAMPLE_BYTES + 1] == a_tilde:
+            break
+    else:
+        pytest.fail("no padding puts a multibyte character on the boundary")
+
+    items = parse_statement_table(write_csv(text), "extrato.csv")
+
+    assert items is not None
+    assert len(items) == len(rows) + 1
+    assert items[-1]["description"] == "Padaria São João"
+
+
+def _summary(items: list[dict]) -> list[tuple[str, str, float, str]]:
+    return [(i["date"], i["description"], i["amount"], i["type"]) for i in items]
+
+
+def test_semicolon_br_numbers(write_csv):
+    path = write_csv(
+        "Data;Histórico;Valor\n"
+        "02/01/2025;Salário;3.500,00\n"
+        "03/01/2025;Mercado;-1.234,56\n"
+        "04/01/2025;Saldo do dia;2.265,44\n",
+        encoding="cp1252",
+    )
+
+    assert _summary(parse_statement_table(path, "extrato.csv")) == [
+        ("2025-01-02", "Salário", 3500.0, "INCOME"),
+        ("2025-01-03", "Mercado", 1234.56, "EXPENSE"),
+    ]
+
+
+def test_currency_prefixed_negatives(write_csv):
+    path = write_csv(
+        "Data;Descrição;Valor\n"
+        "05/01/2025;Salário;R$ 3.500,00\n"
+        "06/01/2025;Padaria;R$ -12,50\n"
+        "07/01/2025;Farmácia;-R$ 40,00\n"
+        "08/01/2025;Estorno;(R$ 9,90)\n"
+    )
+
+    assert _summary(parse_statement_table(path, "extrato.csv")) == [
+        ("2025-01-05", "Salário", 3500.0, "INCOME"),
+        ("2025-01-06", "Padaria", 12.5, "EXPENSE"),
+        ("2025-01-07", "Farmácia", 40.0, "EXPENSE"),
+        ("2025-01-08", "Estorno", 9.9, "EXPENSE"),
+    ]
+
+
+def test_card_bill_without_negatives_is_all_expense(write_csv):
+    path = write_csv('date,title,amount\n2025-01-10,Uber,23.90\n2025-01-11,iFood,"1,250.00"\n')
+
+    assert _summary(parse_statement_table(path, "fatura.csv")) == [
+        ("2025-01-10", "Uber", 23.9, "EXPENSE"),
+        ("2025-01-11", "iFood", 1250.0, "EXPENSE"),
+    ]
+
+
+def test_split_debit_credit_columns(write_csv):
+    path = write_csv(
+        "Data;Lançamento;Débito;Crédito\n"
+        "10/02/2025;PIX recebido;;150,00\n"
+        "11/02/2025;Conta de luz;230,15;\n"
+    )
+
+    assert _summary(parse_statement_table(path, "extrato.csv")) == [
+        ("2025-02-10", "PIX recebido", 150.0, "INCOME"),
+        ("2025-02-11", "Conta de luz", 230.15, "EXPENSE"),
+    ]
+
+
+def test_preamble_before_header(write_csv):
+    path = write_csv(
+        "Banco Exemplo S.A.\n"
+        "Agência: 0001;Conta: 12345-6\n"
+        "Período: 01/03/2025 a 31/03/2025\n"
+        "\n"
+        "Data;Descrição;Documento;Valor\n"
+        "01/03/2025;Aluguel;000123;-1.800,00\n"
+        "02/03/2025;Rendimento;;4,32\n"
+    )
+
+    assert _summary(parse_statement_table(path, "extrato.csv")) == [
+        ("2025-03-01", "Aluguel", 1800.0, "EXPENSE"),
+        ("2025-03-02", "Rendimento", 4.32, "INCOME"),
+    ]
+
+
+def test_unrecognised_layout_falls_back_to_model(write_csv):
+    path = write_csv("nome,idade\nAna,30\n")
+
+    assert parse_statement_table(path, "pessoas.csv") is None
@@ -0,0 +1,47 @@
+"""Stats cache invalidation across processes, and the async helpers."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from app.services.stats_cache import MemoryCacheBackend, SQLiteCacheBackend, StatsCache
+
+
+def test_sqlite_backend_bump_invalidates_other_workers(tmp_path):
+    path = str(tmp_path / "stats.sqlite3")
+    # Two workers on the same host, each with its own StatsCache over the shared file.
+    worker_a = StatsCache(SQLiteCacheBackend(path, max_entries=100), ttl_seconds=300)
+    worker_b = StatsCache(SQLiteCacheBackend(path, max_entries=100), ttl_seconds=300)
+
+    _, key = worker_a.get("dashboard", 1, month=1, year=2025)
+    worker_a.set(key, {"balance": 10.0})
+    assert worker_b.get("dashboard", 1, month=1, year=2025)[0] == {"balance": 10.0}
+
+    worker_b.bump(1)
+
+    assert worker_a.get("dashboard", 1, month=1, year=2025)[0] is None
+
+
+def test_async_helpers_keep_blocking_backends_off_the_loop(tmp_path):
+    threads: list[str] = []
+
+    def track(backend):
+        original = backend.counter
+
+        def counter(key: str) -> int:
+            threads.append(threading.current_thread().name)
+            return original(key)
+
+        backend.counter = counter
+        return backend
+
+    async def lookup(cache: StatsCache) -> str:
+        await cache.get_async("dashboard", 1, month=1, year=2025)
+        return threading.current_thread().name
+
+    sqlite_loop = asyncio.run(lookup(StatsCache(track(SQLiteCacheBackend(str(tmp_path / "s.sqlite3"), 100)), 300)))
+    memory_loop = asyncio.run(lookup(StatsCache(track(MemoryCacheBackend(100)), 300)))
+
+    assert threads[0] != sqlite_loop
+    assert threads[1] == memory_loop
@@ -19,6 +19,8 @@ export const Transactions: React.FC = () => {
   const [transactions, setTransactions] = useState<Transaction[]>([]);
   const [filtered, setFiltered] = useState<Transaction[]>([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [searchTerm, setSearchTerm] = useState('');
   const [filterType, setFilterType] = useState<'ALL' | 'INCOME' | 'EXPENSE'>('ALL');
   
@@ -31,6 +33,7 @@ export const Transactions: React.FC = () => {
   });
   
   const fileInputRef = useRef<HTMLInputElement>(null);
+  const loadMoreRef = useRef<HTMLButtonElement>(null);
 
   useEffect(() => {
     if (user) loadTransactions();
@@ -55,11 +58,35 @@ export const Transactions: React.FC = () => {
   const loadTransactions = async () => {
     if (!user) return;
     setLoading(true);
-    const data = await api.transactions.list(user.id);
-    setTransactions(data);
+    const page = await api.transactions.list(user.id);
+    setTransactions(page.items);
+    setNextCursor(page.nextCursor);
     setLoading(false);
   };
 
+  const loadMore = async () => {
+    if (!user || !nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const page = await api.transactions.list(user.id, nextCursor);
+      setTransactions(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Next page only when the end of the list scrolls into view.
+  useEffect(() => {
+    const el = loadMoreRef.current;
+    if (!el || !nextCursor) return;
+    const observer = new IntersectionObserver(entries => {
+      if (entries[0].isIntersecting) loadMore();
+    });
+    observer.observe(el);
+    return () => observer.disconnect();
+  }, [nextCursor, loadingMore]);
+
   const handleDelete = async (id: string) => {
     if (confirm('Tem certeza que deseja excluir?')) {
       await api.transactions.delete(id);
@@ -67,16 +94,16 @@ export const Transactions: React.FC = () => {
     }
   };
 
-  const handleExport = () => {
-    const csvContent = "data:text/csv;charset=utf-8," 
-      + "Data,Descrição,Categoria,Valor,Tipo\n"
-      + transactions.map(t => `${t.date},${t.description},${t.category},${t.amount},${t.type}`).join("\n");
-    const encodedUri = encodeURI(csvContent);
+  const handleExport = async () => {
+    if (!user) return;
+    const url = URL.createObjectURL(await api.transactions.exportCsv(user.id));
     const link = document.createElement("a");
-    link.setAttribute("href", encodedUri);
+    link.setAttribute("href", url);
     link.setAttribute("download", "transacoes_family_finance.csv");
     document.body.appendChild(link);
     link.click();
+    link.remove();
+    URL.revokeObjectURL(url);
   };
 
   const handleImport = async (e: React.ChangeEvent<HTMLInputElement>) => {
@@ -227,6 +254,18 @@ export const Transactions: React.FC = () => {
                 ))}
               </tbody>
             </table>
+            {nextCursor && (
+              <div className="p-4 flex justify-center border-t border-gray-100 dark:border-gray-700">
+                <button
+                  ref={loadMoreRef}
+                  onClick={loadMore}
+                  disabled={loadingMore}
+                  className="px-4 py-2 text-sm font-medium text-primary-600 dark:text-primary-400 hover:bg-primary-50 dark:hover:bg-primary-900/20 rounded-lg transition-colors disabled:opacity-50"
+                >
+                  {loadingMore ? 'Carregando...' : 'Carregar mais'}
+                </button>
+              </div>
+            )}
           </div>
         )}
       </div>
@@ -27,7 +27,7 @@ const authHeaders = () => {
   return token ? { Authorization: `Bearer ${token}` } : {};
 };
 
-async function request<T>(path: string, init: RequestInit = {}): Promise<T> {
+async function requestWithHeaders<T>(path: string, init: RequestInit = {}): Promise<{ body: T; headers: Headers }> {
   const res = await fetch(`${BASE_URL}${path}`, {
     ...init,
     headers: {
@@ -45,7 +45,11 @@ async function request<T>(path: string, init: RequestInit = {}): Promise<T> {
     throw new ApiError(msg, res.status, body);
   }
 
-  return body as T;
+  return { body: body as T, headers: res.headers };
+}
+
+async function request<T>(path: string, init: RequestInit = {}): Promise<T> {
+  return (await requestWithHeaders<T>(path, init)).body;
 }
 
 export const api = {
@@ -85,9 +89,18 @@ export const api = {
   },
 
   transactions: {
-    list: async (userId: string): Promise<Transaction[]> => {
+    list: async (userId: string, cursor?: string | null): Promise<{ items: Transaction[]; nextCursor: string | null }> => {
+      // One page per call; the backend hands back the next page's opaque cursor in X-Next-Cursor.
       const qs = new URLSearchParams({ userId });
-      return request<Transaction[]>(`/api/transactions?${qs.toString()}`, { method: 'GET' });
+      if (cursor) qs.set('cursor', cursor);
+      const page = await requestWithHeaders<Transaction[]>(`/api/transactions?${qs.toString()}`, { method: 'GET' });
+      return { items: page.body, nextCursor: page.headers.get('X-Next-Cursor') };
+    },
+    exportCsv: async (userId: string): Promise<Blob> => {
+      // Built server-side so it covers every row, not just the pages loaded so far.
+      const qs = new URLSearchParams({ userId, format: 'csv' });
+      const csv = await request<string>(`/api/transactions/export?${qs.toString()}`, { method: 'GET' });
+      return new Blob([csv], { type: 'text/csv;charset=utf-8' });
     },
     create: async (data: Omit<Transaction, 'id'>): Promise<Transaction> => {
       return request<Transaction>(`/api/transactions`, {
@@ -104,11 +117,18 @@ export const api = {
       form.append('file', file);
 
       const qs = new URLSearchParams({ userId });
-      const res = await request<{ created: number }>(`/api/transactions/import?${qs.toString()}`, {
+      const job = await request<{ id: string }>(`/api/transactions/import?${qs.toString()}`, {
         method: 'POST',
         body: form,
       });
-      return res.created;
+
+      // The import runs in a background worker; poll until it settles.
+      while (true) {
+        const res = await request<{ status: string; createdCount: number; errorMessage?: string }>(`/api/imports/${job.id}`, { method: 'GET' });
+        if (res.status === 'DONE') return res.createdCount;
+        if (res.status === 'FAILED') throw new ApiError(res.errorMessage || 'Import failed', 500, res);
+        await new Promise((resolve) => setTimeout(resolve, 1500));
+      }
     },
   },
 